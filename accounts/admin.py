@@ -16,7 +16,7 @@ class CustomUserAdmin(UserAdmin):
         ('Permissions', {
             'fields': ('is_active', 'is_staff', 'is_superuser', 'groups', 'user_permissions'),
         }),
-        ('Account Status', {'fields': ('is_verified', 'otp', 'otp_created_at')}),
+        ('Account Status', {'fields': ('is_verified',)}),
         ('Important dates', {'fields': ('last_login', 'date_joined')}),
     )
     
@@ -27,7 +27,7 @@ class CustomUserAdmin(UserAdmin):
         }),
     )
     
-    readonly_fields = ('date_joined', 'last_login', 'otp_created_at')
+    readonly_fields = ('date_joined', 'last_login')
 
     def user_actions(self, obj):
         actions = []
@@ -2,7 +2,4 @@ from django.apps import AppConfig
 
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'accounts'
-
-    def ready(self):
-        import accounts.signals 
\ No newline at end of file
+    name = 'accounts'
\ No newline at end of file
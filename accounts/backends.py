@@ -1,18 +1,39 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
+from django.db.models import Q
 
 class EmailOrUsernameModelBackend(ModelBackend):
+    def get_login_user(self, login):
+        """Return the user whose username or email is ``login``, using one query."""
+        UserModel = get_user_model()
+        matches = list(UserModel.objects.filter(Q(username=login) | Q(email=login))[:2])
+        # A username match wins over someone else's email, as it did before.
+        for user in matches:
+            if user.username == login:
+                return user
+        return matches[0] if matches else None
+
+    def check_credentials(self, login, password):
+        """
+        Return the user if ``password`` is correct, whether or not the account
+        is active. Exactly one password hash is computed per call: unknown
+        logins hash against a throwaway user so they take as long as real ones.
+        """
+        user = self.get_login_user(login)
+        if user is None:
+            get_user_model()().set_password(password)
+            return None
+        if user.check_password(password):
+            return user
+        return None
+
     def authenticate(self, request, username=None, password=None, **kwargs):
         UserModel = get_user_model()
         if username is None:
             username = kwargs.get(UserModel.USERNAME_FIELD)
-        try:
-            user = UserModel.objects.get(username=username)
-        except UserModel.DoesNotExist:
-            try:
-                user = UserModel.objects.get(email=username)
-            except UserModel.DoesNotExist:
-                return None
-        if user.check_password(password) and self.user_can_authenticate(user):
+        if username is None or password is None:
+            return None
+        user = self.check_credentials(username, password)
+        if user is not None and self.user_can_authenticate(user):
             return user
-        return None 
\ No newline at end of file
+        return None
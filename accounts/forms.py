@@ -1,5 +1,6 @@
 from django import forms
-from django.contrib.auth.forms import UserCreationForm, SetPasswordForm
+from django.contrib.auth.forms import AuthenticationForm, UserCreationForm, SetPasswordForm
+from .backends import EmailOrUsernameModelBackend
 from .models import User
 
 class UserRegistrationForm(UserCreationForm):
@@ -132,6 +133,22 @@ class UserRegistrationForm(UserCreationForm):
         
         return cleaned_data
 
+class LoginForm(AuthenticationForm):
+    """
+    Username-or-email login that hashes the password exactly once.
+
+    Inactive (unverified) accounts with the right password are accepted here;
+    CombinedAuthView sends those through OTP verification instead of logging in.
+    """
+    def clean(self):
+        username = self.cleaned_data.get('username')
+        password = self.cleaned_data.get('password')
+        if username is not None and password:
+            self.user_cache = EmailOrUsernameModelBackend().check_credentials(username, password)
+            if self.user_cache is None:
+                raise self.get_invalid_login_error()
+        return self.cleaned_data
+
 class PasswordResetEmailForm(forms.Form):
     email = forms.EmailField(
         label='Email', 
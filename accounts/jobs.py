@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from conference.scheduler import periodic
+from .models import User
+
+UNVERIFIED_USER_MAX_AGE = timedelta(days=7)
+DELETE_BATCH_SIZE = 200
+
+
+@periodic('cleanup_unverified_users', every=timedelta(hours=1))
+def cleanup_unverified_users():
+    """Delete unverified accounts older than a week, a batch at a time to keep each delete short."""
+    cutoff = timezone.now() - UNVERIFIED_USER_MAX_AGE
+    stale = User.objects.filter(is_verified=False, date_joined__lt=cutoff)
+    deleted = 0
+    while True:
+        ids = list(stale.values_list('id', flat=True)[:DELETE_BATCH_SIZE])
+        if not ids:
+            break
+        User.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+    return f"deleted {deleted} unverified users"
@@ -0,0 +1,63 @@
+import os
+import time
+from unittest import mock
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+
+PASSWORD = 'bench-Passw0rd!'
+CASES = [
+    ('valid username', 'bench_login_user', PASSWORD),
+    ('valid email', 'bench_login@example.com', PASSWORD),
+    ('wrong password', 'bench_login_user', 'not-the-password'),
+    ('unknown user', 'nobody@example.com', PASSWORD),
+]
+
+
+class Command(BaseCommand):
+    help = 'Measure login attempts per second on one core and password hashes per attempt'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attempts', type=int, default=20, help='Attempts per case')
+
+    def handle(self, *args, **options):
+        attempts = options['attempts']
+        hasher = get_hasher()
+        self.stdout.write(f'Hasher: {hasher.algorithm}; {attempts} attempts per case; {os.cpu_count()} CPUs\n')
+        self.stdout.write(f"{'path':<16}{'case':<18}{'attempts/s/core':>16}{'ms/attempt':>12}{'hashes/attempt':>16}")
+
+        # The bench user only exists inside this rolled-back transaction, and
+        # rate limiting is off so every attempt reaches the password check.
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=['*'], RATE_LIMIT_ENABLED=False):
+            User.objects.create_user(
+                username='bench_login_user', email='bench_login@example.com', password=PASSWORD,
+                is_active=True, is_verified=True,
+            )
+            client = Client()
+            url = reverse('accounts:login')
+            for label, username, password in CASES:
+                self.run_case('authenticate()', label, attempts, hasher,
+                              lambda: authenticate(None, username=username, password=password))
+                self.run_case('login view', label, attempts, hasher,
+                              lambda: client.post(url, {'username': username, 'password': password}))
+                client.logout()
+            transaction.set_rollback(True)
+
+    def run_case(self, path, label, attempts, hasher, attempt):
+        # Count every hash computed, whether verifying or hashing the dummy.
+        with mock.patch.object(type(hasher), 'encode', autospec=True, side_effect=type(hasher).encode) as encode:
+            start = time.process_time()
+            for _ in range(attempts):
+                attempt()
+            elapsed = time.process_time() - start
+        per_second = attempts / elapsed if elapsed else float('inf')
+        self.stdout.write(
+            f'{path:<16}{label:<18}{per_second:>16.1f}{elapsed * 1000 / attempts:>12.1f}'
+            f'{encode.call_count / attempts:>16.1f}'
+        )
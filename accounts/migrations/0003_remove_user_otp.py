@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-18 22:37
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_alter_user_email'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='user',
+            name='otp',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='otp_created_at',
+        ),
+    ]
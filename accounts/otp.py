@@ -0,0 +1,79 @@
+"""
+One-time passwords for email verification and password reset.
+
+Codes live only in the ``otp`` cache: an HMAC of the code, an expiry time and
+a count of wrong guesses, keyed by purpose and user id. Issuing, resending
+and checking a code never writes the user row, so signup and login bursts do
+not contend on ``accounts_user``; the caller saves the user once, after a
+successful check.
+"""
+import hashlib
+import hmac
+import secrets
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+VERIFY = 'verify'
+RESET = 'reset'
+
+OK = 'ok'
+INVALID = 'invalid'
+EXPIRED = 'expired'
+LOCKED = 'locked'
+
+
+def _cache():
+    return caches[settings.OTP_CACHE_ALIAS]
+
+
+def _key(purpose, user_id):
+    return f"otp:{purpose}:{user_id}"
+
+
+def _digest(purpose, user_id, code):
+    message = f"{purpose}:{user_id}:{code}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def issue_otp(purpose, user_id):
+    """Create a fresh 6-digit code for ``user_id``, replacing any earlier one, and return it."""
+    code = f"{secrets.randbelow(1000000):06d}"
+    entry = {
+        'digest': _digest(purpose, user_id, code),
+        'expires_at': time.time() + settings.OTP_TTL,
+        'attempts': 0,
+    }
+    _cache().set(_key(purpose, user_id), entry, settings.OTP_TTL)
+    return code
+
+
+def has_otp(purpose, user_id):
+    return _cache().get(_key(purpose, user_id)) is not None
+
+
+def discard_otp(purpose, user_id):
+    _cache().delete(_key(purpose, user_id))
+
+
+def check_otp(purpose, user_id, code):
+    """
+    Check ``code`` and return OK, INVALID, EXPIRED or LOCKED. A correct code
+    is used up; after OTP_MAX_ATTEMPTS wrong guesses the code is dropped.
+    """
+    cache = _cache()
+    key = _key(purpose, user_id)
+    entry = cache.get(key)
+    remaining = entry['expires_at'] - time.time() if entry else 0
+    if remaining <= 0:
+        return EXPIRED
+    if hmac.compare_digest(entry['digest'], _digest(purpose, user_id, code)):
+        cache.delete(key)
+        return OK
+    entry['attempts'] += 1
+    if entry['attempts'] >= settings.OTP_MAX_ATTEMPTS:
+        cache.delete(key)
+        return LOCKED
+    cache.set(key, entry, remaining)
+    return INVALID
@@ -0,0 +1,104 @@
+"""
+Token-bucket rate limiting for the authentication endpoints.
+
+Each endpoint in ``settings.RATE_LIMITS`` has up to two buckets: one keyed on
+the client IP and one on the account being targeted (login name, email or
+pending user id). A bucket holds ``burst`` tokens and refills the whole
+burst over ``period`` seconds; every attempt takes one token from each
+bucket. When a bucket is empty the view is not called at all and the client
+gets a plain 429 with ``Retry-After``, before any password hashing or mail.
+
+Buckets are stored in the shared cache (SHARED_CACHE_ALIAS) as
+``(tokens, updated_at)``, so all worker processes draw from the same bucket.
+The read-modify-write is not atomic, so concurrent requests can occasionally
+overdraw a bucket by a token; that is fine for throttling.
+"""
+import hashlib
+import logging
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+
+def client_ip(request):
+    """
+    The address the outermost trusted proxy saw: RATE_LIMIT_PROXY_COUNT
+    entries from the right of X-Forwarded-For. The client can prepend any
+    entries it likes, so those on the left are never used.
+    """
+    hops = settings.RATE_LIMIT_PROXY_COUNT
+    if hops:
+        forwarded = [part.strip() for part in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if part.strip()]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def bucket_key(endpoint, scope, identifier):
+    digest = hashlib.sha256(str(identifier).strip().lower().encode()).hexdigest()[:32]
+    return f"ratelimit:{endpoint}:{scope}:{digest}"
+
+
+def take_token(key, burst, period, now=None):
+    """
+    Take one token from the bucket at ``key``. Return 0 if it was available,
+    otherwise the number of seconds until the next token.
+    """
+    now = time.time() if now is None else now
+    rate = burst / period
+    cache = caches[settings.SHARED_CACHE_ALIAS]
+    tokens, updated_at = cache.get(key) or (burst, now)
+    tokens = min(burst, tokens + (now - updated_at) * rate)
+    if tokens < 1:
+        return math.ceil((1 - tokens) / rate)
+    cache.set(key, (tokens - 1, now), period)
+    return 0
+
+
+def check_rate_limit(endpoint, request, account=None):
+    """Return seconds to wait if ``request`` is over the limit for ``endpoint``, else 0."""
+    if not settings.RATE_LIMIT_ENABLED:
+        return 0
+    limits = settings.RATE_LIMITS.get(endpoint, {})
+    identifiers = {'ip': client_ip(request), 'account': account}
+    retry_after = 0
+    for scope, (burst, period) in limits.items():
+        if not identifiers.get(scope):
+            continue
+        wait = take_token(bucket_key(endpoint, scope, identifiers[scope]), burst, period)
+        if wait:
+            logger.warning('Rate limit hit: %s %s bucket (ip %s)', endpoint, scope, identifiers['ip'])
+        retry_after = max(retry_after, wait)
+    return retry_after
+
+
+def too_many_requests(retry_after):
+    response = HttpResponse(
+        'Too many attempts. Please wait a few minutes and try again.',
+        status=429, content_type='text/plain; charset=utf-8',
+    )
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def rate_limit(endpoint, account=None, methods=('POST',)):
+    """
+    View decorator applying the ``endpoint`` limits to ``methods`` requests.
+    ``account(request)`` returns the account identifier, if any.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if request.method in methods:
+                retry_after = check_rate_limit(endpoint, request, account(request) if account else None)
+                if retry_after:
+                    return too_many_requests(retry_after)
+            return view_func(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
@@ -24,18 +24,24 @@ def safe_auth_login(request, user):
                 raise e3
 from django.utils import timezone
 from django.core.mail import send_mail
-from .forms import UserRegistrationForm, PasswordResetEmailForm, PasswordResetOTPForm, SetNewPasswordForm
+from .forms import LoginForm, UserRegistrationForm, PasswordResetEmailForm, PasswordResetOTPForm, SetNewPasswordForm
 from .models import User
-import random
 from django.contrib.auth.views import LoginView, PasswordResetView, PasswordResetDoneView, PasswordResetConfirmView, PasswordResetCompleteView
 from django.core.exceptions import ObjectDoesNotExist
 from django.contrib.auth.hashers import make_password
-import string
 from django.views import View
+from django.utils.decorators import method_decorator
+from .ratelimit import rate_limit
+from . import otp as otp_store
+
+def _login_account(request):
+    return request.POST.get('email') if 'signup' in request.POST else request.POST.get('username')
 
 class CombinedAuthView(LoginView):
     template_name = 'accounts/login.html'
+    authentication_form = LoginForm
 
+    @method_decorator(rate_limit('login', account=_login_account))
     def post(self, request, *args, **kwargs):
         if 'signup' in request.POST:
             # Handle sign up
@@ -68,11 +74,9 @@ class CombinedAuthView(LoginView):
                 user = form.save(commit=False)
                 user.is_active = False
                 user.is_verified = False  # Explicitly set to False
-                otp = str(random.randint(100000, 999999))
-                user.otp = otp
-                user.otp_created_at = timezone.now()
                 user.set_password(form.cleaned_data['password1'])
                 user.save()
+                otp = otp_store.issue_otp(otp_store.VERIFY, user.id)
                 
                 # Link PC invites to the newly created user
                 self.link_pc_invites(user, form)
@@ -106,84 +110,62 @@ class CombinedAuthView(LoginView):
                     'show_signup': True
                 })
         else:
-            # Handle login - use default Django authentication
-            username = request.POST.get('username')
-            password = request.POST.get('password')
-            
-            if username and password:
+            # Handle login: LoginForm looks the user up by username or email
+            # and checks the password once; nothing below hashes it again.
+            form = self.get_form()
+            if not form.is_valid():
+                return render(request, self.template_name, {
+                    'form': form,
+                    'signup_form': UserRegistrationForm(),
+                    'show_signup': False
+                })
+            user_obj = form.get_user()
+
+            # Check if user is verified
+            if not user_obj.is_verified:
+                # User exists but is not verified - redirect to OTP verification
+                # Generate new OTP and send email
+                otp = otp_store.issue_otp(otp_store.VERIFY, user_obj.id)
+
                 try:
-                    # Try to find user by username or email
-                    try:
-                        user_obj = User.objects.get(username=username)
-                    except User.DoesNotExist:
-                        try:
-                            user_obj = User.objects.get(email=username)
-                        except User.DoesNotExist:
-                            user_obj = None
-                    
-                    if user_obj and user_obj.check_password(password):
-                        # Check if user is verified
-                        if not user_obj.is_verified:
-                            # User exists but is not verified - redirect to OTP verification
-                            # Generate new OTP and send email
-                            otp = str(random.randint(100000, 999999))
-                            user_obj.otp = otp
-                            user_obj.otp_created_at = timezone.now()
-                            user_obj.save()
-                            
-                            try:
-                                send_mail(
-                                    'Your OTP for PaperSetu Registration',
-                                    f'Your OTP is: {otp}',
-                                    'noreply@papersetu.com',
-                                    [user_obj.email],
-                                    fail_silently=False,
-                                )
-                                request.session['pending_user_id'] = user_obj.id
-                                request.session['login_verification'] = True  # Flag for login verification
-                                messages.warning(request, 'Please verify your email with the OTP sent to your email address.')
-                                return redirect('accounts:verify_otp')
-                            except Exception as e:
-                                messages.error(request, 'Failed to send OTP. Please try again later.')
-                                return render(request, self.template_name, {
-                                    'form': self.get_form(self.get_form_class()),
-                                    'signup_form': UserRegistrationForm(),
-                                    'show_signup': False
-                                })
-                        
-                        # User is verified, proceed with normal login
-                        if not user_obj.is_active:
-                            user_obj.is_active = True
-                            user_obj.save()
-                        
-                        # Ensure user is verified before login
-                        if not user_obj.is_verified:
-                            user_obj.is_verified = True
-                            user_obj.save()
-                        
-                        safe_auth_login(request, user_obj)
-                        
-                        # Check if there's a next parameter to redirect to
-                        next_url = request.GET.get('next')
-                        if next_url:
-                            return redirect(next_url)
-                        else:
-                            return redirect('homepage')
-                    else:
-                        # Invalid credentials - use default Django error handling
-                        pass
-                        
+                    send_mail(
+                        'Your OTP for PaperSetu Registration',
+                        f'Your OTP is: {otp}',
+                        'noreply@papersetu.com',
+                        [user_obj.email],
+                        fail_silently=False,
+                    )
+                    request.session['pending_user_id'] = user_obj.id
+                    request.session['login_verification'] = True  # Flag for login verification
+                    messages.warning(request, 'Please verify your email with the OTP sent to your email address.')
+                    return redirect('accounts:verify_otp')
                 except Exception as e:
-                    # If there's an error, fall back to default Django behavior
-                    pass
-            
-            # Use default LoginView behavior for all other cases
-            return super().post(request, *args, **kwargs)
+                    messages.error(request, 'Failed to send OTP. Please try again later.')
+                    return render(request, self.template_name, {
+                        'form': self.get_form(self.get_form_class()),
+                        'signup_form': UserRegistrationForm(),
+                        'show_signup': False
+                    })
+
+            # User is verified, proceed with normal login
+            if not user_obj.is_active:
+                user_obj.is_active = True
+                user_obj.save()
+
+            safe_auth_login(request, user_obj)
+
+            # Check if there's a next parameter to redirect to
+            next_url = request.GET.get('next')
+            if next_url:
+                return redirect(next_url)
+            else:
+                return redirect('homepage')
 
     def link_pc_invites(self, user, form):
         """Link PC invites to the newly created user"""
         try:
-            from conference.models import PCInvite, UserConferenceRole
+            from conference.models import PCInvite, UserConferenceRole, Notification
+            from conference.notifications import send_notifications
             from django.utils import timezone
             
             # Get PC invites from form if available
@@ -193,6 +175,7 @@ class CombinedAuthView(LoginView):
                 # Fallback: find PC invites for this email
                 pc_invites = PCInvite.objects.filter(email=user.email)
             
+            chair_notifications = []
             for invite in pc_invites:
                 if invite.status == 'pending':
                     # Scenario 2: User registers first, then accepts invite
@@ -209,18 +192,14 @@ class CombinedAuthView(LoginView):
                         track=invite.track
                     )
                     
-                    # Send notification to chair
-                    try:
-                        from conference.models import Notification
-                        Notification.objects.create(
-                            recipient=invite.invited_by,
-                            notification_type='reviewer_response',
-                            title=f'PC Member Accepted Invitation',
-                            message=f'{user.get_full_name()} ({user.email}) has accepted the PC member invitation for {invite.conference.name}.',
-                            related_conference=invite.conference
-                        )
-                    except:
-                        pass  # Don't fail if notification creation fails
+                    # Notify the chair (sent in one batch below)
+                    chair_notifications.append(Notification(
+                        recipient=invite.invited_by,
+                        notification_type='reviewer_response',
+                        title=f'PC Member Accepted Invitation',
+                        message=f'{user.get_full_name()} ({user.email}) has accepted the PC member invitation for {invite.conference.name}.',
+                        related_conference=invite.conference
+                    ))
                 
                 elif invite.status == 'accepted':
                     # Scenario 1: User accepted invite first, then registers
@@ -231,6 +210,11 @@ class CombinedAuthView(LoginView):
                         role='pc_member',
                         track=invite.track
                     )
+            
+            try:
+                send_notifications(chair_notifications)
+            except Exception:
+                pass  # Don't fail if notification creation fails
                     
         except ImportError:
             pass  # Don't fail if conference app is not available
@@ -245,6 +229,7 @@ class CombinedAuthView(LoginView):
             'show_signup': show_signup
         })
 
+@rate_limit('verify_otp', account=lambda request: request.session.get('pending_user_id'))
 def verify_otp(request):
     user_id = request.session.get('pending_user_id')
     if not user_id:
@@ -272,10 +257,7 @@ def verify_otp(request):
         # Handle resend OTP
         if 'resend_otp' in request.POST:
             # Generate new OTP
-            otp = str(random.randint(100000, 999999))
-            user.otp = otp
-            user.otp_created_at = timezone.now()
-            user.save()
+            otp = otp_store.issue_otp(otp_store.VERIFY, user.id)
             
             # Send new OTP email
             try:
@@ -289,9 +271,7 @@ def verify_otp(request):
                 messages.success(request, 'New OTP has been sent to your email.')
             except Exception as e:
                 messages.error(request, 'Failed to send OTP. Please try again later.')
-                user.otp = ''
-                user.otp_created_at = None
-                user.save()
+                otp_store.discard_otp(otp_store.VERIFY, user.id)
             
             return render(request, 'accounts/verify_otp.html')
         
@@ -308,25 +288,20 @@ def verify_otp(request):
             messages.error(request, 'Please enter a valid 6-digit OTP.')
             return render(request, 'accounts/verify_otp.html')
         
-        # Check if user has an OTP stored
-        if not user.otp:
-            messages.error(request, 'No OTP found. Please request a new OTP.')
-            return render(request, 'accounts/verify_otp.html')
-        
-        # Check if OTP has expired (10 minutes)
-        if user.otp_created_at and (timezone.now() - user.otp_created_at).total_seconds() > 600:
+        # Verify OTP (codes expire after 10 minutes or too many wrong guesses)
+        result = otp_store.check_otp(otp_store.VERIFY, user.id, otp_input)
+        if result == otp_store.EXPIRED:
             messages.error(request, 'OTP has expired. Please request a new OTP.')
-            user.otp = ''
-            user.save()
             return render(request, 'accounts/verify_otp.html')
-        
-        # Verify OTP
-        if otp_input == user.otp:
+        if result == otp_store.LOCKED:
+            messages.error(request, 'Too many incorrect attempts. Please request a new OTP.')
+            return render(request, 'accounts/verify_otp.html')
+
+        if result == otp_store.OK:
+            # The only write to the user row in the whole OTP flow
             user.is_active = True
             user.is_verified = True
-            user.otp = ''
-            user.otp_created_at = None
-            user.save()
+            user.save(update_fields=['is_active', 'is_verified'])
             
             # Send welcome email only for new registrations (not for login verification)
             if not request.session.get('login_verification'):
@@ -367,11 +342,6 @@ The PaperSetu Team
                 del request.session['login_verification']
             
             # Auto-login the user after successful verification
-            # Ensure user is active and verified before login
-            if not user.is_active:
-                user.is_active = True
-                user.save()
-            
             safe_auth_login(request, user)
             
             # Check if there's a next parameter to redirect to
@@ -391,6 +361,7 @@ def custom_logout(request):
     logout(request)
     return redirect('/')
 
+@rate_limit('password_reset_request', account=lambda request: request.POST.get('email'))
 def password_reset_request(request):
     if request.method == 'POST':
         form = PasswordResetEmailForm(request.POST)
@@ -410,10 +381,7 @@ def password_reset_request(request):
                         messages.error(request, 'This email is registered but not verified. Please complete your registration first by verifying your email with the OTP sent during registration.')
                         return render(request, 'accounts/password_reset_email.html', {'form': form})
                 
-                otp = ''.join(random.choices(string.digits, k=6))
-                user.otp = otp
-                user.otp_created_at = timezone.now()
-                user.save()
+                otp = otp_store.issue_otp(otp_store.RESET, user.id)
                 
                 # Send email with better formatting
                 subject = 'Password Reset OTP - PaperSetu'
@@ -444,9 +412,7 @@ PaperSetu Team
                 except Exception as e:
                     messages.error(request, 'Failed to send OTP. Please try again later.')
                     # Clear the OTP if email fails
-                    user.otp = ''
-                    user.otp_created_at = None
-                    user.save()
+                    otp_store.discard_otp(otp_store.RESET, user.id)
                     
             except ObjectDoesNotExist:
                 messages.error(request, 'No user found with that email address.')
@@ -454,6 +420,7 @@ PaperSetu Team
         form = PasswordResetEmailForm()
     return render(request, 'accounts/password_reset_email.html', {'form': form})
 
+@rate_limit('password_reset_otp', account=lambda request: request.session.get('reset_user_id'))
 def password_reset_otp(request):
     user_id = request.session.get('reset_user_id')
     if not user_id:
@@ -471,15 +438,17 @@ def password_reset_otp(request):
         if form.is_valid():
             otp_input = form.cleaned_data['otp']
             # OTP valid for 10 minutes
-            if user.otp == otp_input and user.otp_created_at and (timezone.now() - user.otp_created_at).total_seconds() < 600:
+            result = otp_store.check_otp(otp_store.RESET, user.id, otp_input)
+            if result == otp_store.OK:
                 request.session['otp_verified'] = True
                 messages.success(request, 'OTP verified successfully. Please set your new password.')
                 return redirect('accounts:password_reset_new')
+            elif result == otp_store.INVALID:
+                messages.error(request, 'Invalid OTP. Please check and try again.')
+            elif result == otp_store.LOCKED:
+                messages.error(request, 'Too many incorrect attempts. Please request a new OTP.')
             else:
-                if not user.otp or user.otp != otp_input:
-                    messages.error(request, 'Invalid OTP. Please check and try again.')
-                else:
-                    messages.error(request, 'OTP has expired. Please request a new one.')
+                messages.error(request, 'OTP has expired. Please request a new one.')
     else:
         form = PasswordResetOTPForm()
     return render(request, 'accounts/password_reset_otp.html', {'form': form})
@@ -501,8 +470,6 @@ def password_reset_new(request):
         form = SetNewPasswordForm(user, request.POST)
         if form.is_valid():
             user.set_password(form.cleaned_data['new_password1'])
-            user.otp = ''
-            user.otp_created_at = None
             user.is_active = True
             
             # If user was invited (has PC invites or conference roles), mark as verified
@@ -90,6 +90,10 @@ python manage.py migrate --no-input --verbosity=2 || {
     }
 }
 
+# Database cache tables (one-time passwords and shared values when no shared cache is configured)
+echo "🗄️  Creating cache table..."
+python manage.py createcachetable || echo "⚠️  Could not create cache table"
+
 # Verify migrations were applied
 echo "✅ Verifying migrations..."
 python manage.py showmigrations --list || echo "⚠️  Could not verify migrations"
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Conference, ReviewerPool, ReviewInvite, UserConferenceRole, Paper, Review, Track
+from .models import Conference, ReviewerPool, ReviewInvite, UserConferenceRole, Paper, Review, Track, UploadSession, PaperDocumentInfo, ScheduledJob, ChairEmailEvent
 from django.core.mail import send_mail
 from django.urls import reverse
 from django.utils.html import format_html
@@ -61,6 +61,10 @@ class ConferenceAdmin(admin.ModelAdmin):
             'fields': ('paper_submission_deadline', 'paper_format', 'abstract_required', 'max_paper_length'),
             'classes': ('wide',)
         }),
+        ('Chair Emails', {
+            'fields': ('chair_email_digest',),
+            'classes': ('wide',)
+        }),
         ('Contact Information', {
             'fields': ('contact_email', 'contact_phone', 'web_page'),
             'classes': ('wide',)
@@ -306,4 +310,27 @@ admin.site.register(ReviewInvite)
 admin.site.register(UserConferenceRole)
 admin.site.register(Paper)
 admin.site.register(Review)
-admin.site.register(Track) 
\ No newline at end of file
+admin.site.register(Track)
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'conference', 'filename', 'received_bytes', 'total_size', 'status', 'updated_at')
+    list_filter = ('status',)
+    readonly_fields = ('created_at', 'updated_at')
+
+@admin.register(PaperDocumentInfo)
+class PaperDocumentInfoAdmin(admin.ModelAdmin):
+    list_display = ('paper', 'status', 'file_format', 'page_count', 'word_count', 'exceeds_page_limit', 'format_mismatch', 'processed_at')
+    list_filter = ('status', 'exceeds_page_limit', 'format_mismatch')
+    search_fields = ('paper__title', 'paper__paper_id')
+
+@admin.register(ScheduledJob)
+class ScheduledJobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'next_run_at', 'last_status', 'last_duration', 'max_duration', 'run_count', 'failure_count', 'locked_by')
+    list_filter = ('last_status',)
+    readonly_fields = ('last_started_at', 'last_finished_at', 'last_duration', 'last_status', 'last_result', 'run_count', 'failure_count', 'total_duration', 'max_duration')
+
+@admin.register(ChairEmailEvent)
+class ChairEmailEventAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'conference', 'event_type', 'summary', 'created_at', 'sent_at')
+    list_filter = ('event_type', 'sent_at')
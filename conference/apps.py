@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class ConferenceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'conference' 
\ No newline at end of file
+    name = 'conference'
+
+    def ready(self):
+        import conference.signals
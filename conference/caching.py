@@ -0,0 +1,81 @@
+"""
+Per-conference versioned cache keys.
+
+Every conference has a version number in the cache. Keys built with
+``conference_cache_key`` embed it, and signals (conference.signals) bump it
+whenever a Paper, Review, UserConferenceRole, Track or Conference of that
+conference is saved or deleted. Cached data is therefore never served after
+a write; the old entries simply expire.
+
+Versions are kept in the "shared" cache (SHARED_CACHE_ALIAS), which every
+process sees, so a bump in one worker or in the scheduler invalidates the
+entries of all of them; the entries themselves stay in the default cache.
+A bump sets a new version from the current time in nanoseconds rather than
+incrementing, so it is safe on caches without an atomic incr (the database
+cache), and a version evicted from the cache never comes back as a number
+that was already used.
+
+A miss is computed on the primary, even inside a ``use_replica`` view: the
+value is stored under the current version, and a lagging replica could
+return data from before the write that set it.
+
+Writes through ``QuerySet.update()`` / ``bulk_create`` do not send signals;
+call ``bump_conference_version`` after them.
+
+    stats = cached_for_conference(conference.id, 'statistics', compute_stats)
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+
+from conference_mgmt.db_routing import reading_from_replica
+
+VERSION_TIMEOUT = None  # versions never expire on their own
+DEFAULT_TIMEOUT = 60 * 60
+
+
+def _version_key(conference_id):
+    return f"conf:{conference_id}:version"
+
+
+def _versions():
+    return caches[settings.SHARED_CACHE_ALIAS]
+
+
+def conference_cache_version(conference_id):
+    key = _version_key(conference_id)
+    versions = _versions()
+    version = versions.get(key)
+    if version is None:
+        versions.add(key, time.time_ns(), VERSION_TIMEOUT)
+        version = versions.get(key)
+    return version
+
+
+def bump_conference_version(conference_id):
+    """Invalidate every versioned key of a conference once the transaction commits."""
+    if conference_id:
+        transaction.on_commit(lambda: _bump(conference_id))
+
+
+def _bump(conference_id):
+    _versions().set(_version_key(conference_id), time.time_ns(), VERSION_TIMEOUT)
+
+
+def conference_cache_key(conference_id, name, *parts):
+    version = conference_cache_version(conference_id)
+    suffix = ':'.join(str(part) for part in parts)
+    return f"conf:{conference_id}:v{version}:{name}" + (f":{suffix}" if suffix else '')
+
+
+def cached_for_conference(conference_id, name, compute, *parts, timeout=DEFAULT_TIMEOUT):
+    """Return the cached value for ``name``/``parts``, computing it on the primary on a miss."""
+    def compute_on_primary():
+        token = reading_from_replica.set(False)
+        try:
+            return compute()
+        finally:
+            reading_from_replica.reset(token)
+    return cache.get_or_set(conference_cache_key(conference_id, name, *parts), compute_on_primary, timeout)
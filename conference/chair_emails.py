@@ -0,0 +1,100 @@
+"""
+Event emails to conference chairs, optionally batched into digests.
+
+``send_chair_email`` is used for submissions, subreviewer responses and
+reviews, and PC invitation acceptances. With the conference's
+``chair_email_digest`` set to 'immediate' it sends the email as before;
+with 'hourly' or 'daily' it only records a ChairEmailEvent, and the
+``send_chair_digests`` job (hourly, see conference/jobs.py) later sends
+each recipient one summary of everything buffered for them. Daily digests
+go out at CHAIR_DIGEST_DAILY_HOUR, or as soon as an event is a day old.
+"""
+import logging
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import ChairEmailEvent
+
+logger = logging.getLogger(__name__)
+
+SENT_EVENT_RETENTION = timedelta(days=30)
+
+
+def send_chair_email(conference, recipient, event_type, subject, body, summary, fail_silently=False):
+    """Email ``recipient`` now, or buffer a one-line ``summary`` for the conference's digest."""
+    if recipient is None or not recipient.email:
+        return
+    if conference.chair_email_digest == 'immediate':
+        send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [recipient.email], fail_silently=fail_silently)
+        return
+    ChairEmailEvent.objects.create(
+        conference=conference, recipient=recipient, event_type=event_type, summary=summary[:500],
+    )
+
+
+def due_events(now):
+    """Unsent events whose digest window has closed."""
+    daily = Q(conference__chair_email_digest='daily')
+    due = ~daily | Q(daily, created_at__lte=now - timedelta(days=1))
+    if timezone.localtime(now).hour == settings.CHAIR_DIGEST_DAILY_HOUR:
+        due |= daily
+    return ChairEmailEvent.objects.filter(due, sent_at__isnull=True).select_related(
+        'conference', 'recipient'
+    ).order_by('recipient_id', 'conference_id', 'created_at')
+
+
+def build_digest(recipient, events):
+    by_conference = defaultdict(list)
+    for event in events:
+        by_conference[event.conference].append(event)
+    sections = []
+    for conference, items in by_conference.items():
+        counts = Counter(event.get_event_type_display() for event in items)
+        totals = ', '.join(f"{count} x {label}" for label, count in counts.items())
+        lines = '\n'.join(f"  - {timezone.localtime(event.created_at):%b %d %H:%M}  {event.summary}" for event in items)
+        sections.append(f"{conference.name} ({totals}):\n{lines}")
+    count = len(events)
+    body = f"""Dear {recipient.get_full_name() or recipient.username},
+
+Here is what happened in your conferences since the last summary:
+
+{chr(10).join(sections)}
+
+Details are on your dashboard: {settings.SITE_URL}{reverse('dashboard:dashboard')}
+
+Best regards,
+PaperSetu Team"""
+    subject = f"PaperSetu summary: {count} update{'s' if count != 1 else ''}"
+    return EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [recipient.email])
+
+
+def send_chair_digests(now=None):
+    """Send one digest per recipient with due events. Returns (emails, events)."""
+    now = now or timezone.now()
+    per_recipient = defaultdict(list)
+    for event in due_events(now):
+        per_recipient[event.recipient].append(event)
+    emails = events_sent = 0
+    if per_recipient:
+        with get_connection() as connection:
+            for recipient, events in per_recipient.items():
+                message = build_digest(recipient, events)
+                message.connection = connection
+                try:
+                    message.send()
+                except Exception:
+                    logger.exception('Chair digest to %s failed', recipient.email)
+                    continue
+                ChairEmailEvent.objects.filter(id__in=[event.id for event in events]).update(sent_at=now)
+                emails += 1
+                events_sent += len(events)
+    ChairEmailEvent.objects.filter(sent_at__lt=now - SENT_EVENT_RETENTION).delete()
+    if emails:
+        logger.info('Sent %s chair digests covering %s events', emails, events_sent)
+    return emails, events_sent
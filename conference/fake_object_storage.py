@@ -0,0 +1,176 @@
+"""
+Filesystem-backed stand-in for an S3-compatible object store.
+
+Implements the subset S3Storage uses (PUT, server-side copy, GET, HEAD and
+DELETE on objects, path-style URLs) and verifies Signature V4 on both header-signed requests
+and presigned URLs, so development and tests exercise the same code path
+as production. Objects are stored as ``<root>/<bucket>/<key>``.
+
+Start it with ``python manage.py run_fake_object_storage``.
+"""
+import datetime
+import hashlib
+import hmac
+import os
+import shutil
+import tempfile
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from .object_storage import ALGORITHM, UNSIGNED_PAYLOAD, canonical_request, sign
+
+
+class FakeObjectStorageServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, root, access_key, secret_key, region='us-east-1'):
+        super().__init__(address, FakeObjectStorageHandler)
+        self.root = os.path.abspath(root)
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        os.makedirs(self.root, exist_ok=True)
+
+
+class FakeObjectStorageHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    # Request plumbing
+
+    def _parse(self):
+        url = urlsplit(self.path)
+        self.raw_path = url.path
+        self.query = dict(parse_qsl(url.query, keep_blank_values=True))
+        bucket, _, key = unquote(url.path).lstrip('/').partition('/')
+        if not bucket or not key or '..' in key.split('/'):
+            return None
+        return os.path.join(self.server.root, bucket, *key.split('/'))
+
+    def _error(self, status, code, message=''):
+        body = (
+            f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<Error><Code>{code}</Code><Message>{message}</Message></Error>'
+        ).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _authorised(self):
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        params = dict(self.query)
+        if 'X-Amz-Signature' in params:
+            signature = params.pop('X-Amz-Signature')
+            credential = params.get('X-Amz-Credential', '')
+            amz_date = params.get('X-Amz-Date', '')
+            signed_headers = params.get('X-Amz-SignedHeaders', 'host').split(';')
+            try:
+                issued = datetime.datetime.strptime(amz_date, '%Y%m%dT%H%M%SZ').replace(tzinfo=datetime.timezone.utc)
+                expires = int(params.get('X-Amz-Expires', '0'))
+            except ValueError:
+                return False
+            if datetime.datetime.now(datetime.timezone.utc) > issued + datetime.timedelta(seconds=expires):
+                return False
+            payload_hash = UNSIGNED_PAYLOAD
+        elif headers.get('authorization', '').startswith(ALGORITHM):
+            fields = dict(
+                part.strip().split('=', 1)
+                for part in headers['authorization'][len(ALGORITHM):].split(',')
+            )
+            signature = fields.get('Signature', '')
+            credential = fields.get('Credential', '')
+            signed_headers = fields.get('SignedHeaders', '').split(';')
+            amz_date = headers.get('x-amz-date', '')
+            payload_hash = headers.get('x-amz-content-sha256', UNSIGNED_PAYLOAD)
+            params = {}
+        else:
+            return False
+        if credential.split('/')[0] != self.server.access_key:
+            return False
+        if any(h not in headers for h in signed_headers):
+            return False
+        canonical = canonical_request(self.command, self.raw_path, params, headers, signed_headers, payload_hash)
+        expected = sign(self.server.secret_key, self.server.region, amz_date, canonical)
+        return hmac.compare_digest(expected, signature)
+
+    def _handle(self):
+        path = self._parse()
+        if path is None:
+            return self._error(400, 'InvalidRequest')
+        if not self._authorised():
+            return self._error(403, 'SignatureDoesNotMatch')
+        getattr(self, 'handle_' + self.command.lower())(path)
+
+    do_GET = do_HEAD = do_PUT = do_DELETE = _handle
+
+    # Operations
+
+    def handle_put(self, path):
+        if 'x-amz-copy-source' in self.headers:
+            return self.handle_copy(path)
+        length = int(self.headers.get('Content-Length', 0))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        digest = hashlib.md5()
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as out:
+            remaining = length
+            while remaining:
+                chunk = self.rfile.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                remaining -= len(chunk)
+        os.replace(tmp_path, path)
+        self.send_response(200)
+        self.send_header('ETag', f'"{digest.hexdigest()}"')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def handle_copy(self, path):
+        bucket, _, key = unquote(self.headers['x-amz-copy-source']).lstrip('/').partition('/')
+        source = os.path.join(self.server.root, bucket, *key.split('/'))
+        if not key or '..' in key.split('/') or not os.path.isfile(source):
+            return self._error(404, 'NoSuchKey')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as out, open(source, 'rb') as src:
+            shutil.copyfileobj(src, out)
+        os.replace(tmp_path, path)
+        body = b'<?xml version="1.0" encoding="UTF-8"?>\n<CopyObjectResult></CopyObjectResult>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_get(self, path):
+        if not os.path.isfile(path):
+            return self._error(404, 'NoSuchKey')
+        stat = os.stat(path)
+        self.send_response(200)
+        self.send_header('Content-Type', self.query.get('response-content-type', 'application/octet-stream'))
+        if 'response-content-disposition' in self.query:
+            self.send_header('Content-Disposition', self.query['response-content-disposition'])
+        self.send_header('Content-Length', str(stat.st_size))
+        self.send_header('Last-Modified', formatdate(stat.st_mtime, usegmt=True))
+        self.end_headers()
+        if self.command == 'GET':
+            with open(path, 'rb') as fh:
+                shutil.copyfileobj(fh, self.wfile)
+
+    handle_head = handle_get
+
+    def handle_delete(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        self.send_response(204)
+        self.end_headers()
@@ -134,6 +134,8 @@ class AuthorForm(forms.ModelForm):
 class PaperSubmissionForm(forms.ModelForm):
     keywords = forms.CharField(required=True, help_text='Comma-separated keywords')
     track = forms.ModelChoiceField(queryset=None, required=False, help_text='Select a track (if applicable)')
+    upload_session = forms.UUIDField(required=False, widget=forms.HiddenInput(), help_text='Completed chunked upload to attach instead of a file')
+    direct_upload = forms.CharField(required=False, max_length=255, widget=forms.HiddenInput(), help_text='Object uploaded straight to storage')
 
     class Meta:
         model = Paper
@@ -144,6 +146,8 @@ class PaperSubmissionForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         conference = kwargs.pop('conference', None)
+        self.user = kwargs.pop('user', None)
+        self.conference = conference
         super().__init__(*args, **kwargs)
         if conference:
             self.fields['track'].queryset = conference.tracks.all()
@@ -151,6 +155,35 @@ class PaperSubmissionForm(forms.ModelForm):
                 self.fields['track'].widget = forms.HiddenInput()
         else:
             self.fields['track'].queryset = Track.objects.none()
+        # The file may arrive through a chunked upload session instead
+        self.fields['file'].required = False
+
+    def clean_upload_session(self):
+        session_id = self.cleaned_data.get('upload_session')
+        if not session_id:
+            return None
+        from .uploads import UploadError, get_finalizable_session
+        try:
+            return get_finalizable_session(session_id, self.user, self.conference)
+        except UploadError as e:
+            raise forms.ValidationError(str(e))
+
+    def clean_direct_upload(self):
+        name = self.cleaned_data.get('direct_upload')
+        if not name:
+            return ''
+        from .uploads import UploadError, get_direct_upload
+        try:
+            return get_direct_upload(name, self.user, self.conference)
+        except UploadError as e:
+            raise forms.ValidationError(str(e))
+
+    def clean(self):
+        cleaned_data = super().clean()
+        uploaded = cleaned_data.get('file') or cleaned_data.get('upload_session') or cleaned_data.get('direct_upload')
+        if not uploaded and 'upload_session' not in self.errors and 'direct_upload' not in self.errors:
+            self.add_error('file', 'This field is required.')
+        return cleaned_data
 
 class ConferenceInfoForm(forms.ModelForm):
     """Form for basic conference information settings."""
@@ -0,0 +1,57 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from .caching import bump_conference_version
+from .chair_emails import send_chair_digests
+from .models import Conference
+from .reminders import send_review_reminders
+from .scheduler import periodic
+from .uploads import cleanup_upload_sessions
+
+
+@periodic('update_conference_statuses', cron='*/15 * * * *')
+def update_conference_statuses():
+    """Store upcoming/live/completed from the conference dates so listings can filter on it."""
+    today = timezone.localdate()
+    targets = {
+        'upcoming': Conference.objects.filter(start_date__gt=today),
+        'live': Conference.objects.filter(start_date__lte=today, end_date__gte=today),
+        'completed': Conference.objects.filter(end_date__lt=today),
+    }
+    changed = {}
+    for status, conferences in targets.items():
+        ids = list(conferences.exclude(status=status).values_list('id', flat=True))
+        if ids:
+            Conference.objects.filter(id__in=ids).update(status=status)
+            for conference_id in ids:
+                bump_conference_version(conference_id)
+            changed[status] = len(ids)
+    return ', '.join(f"{count} now {status}" for status, count in changed.items()) or 'no changes'
+
+
+@periodic('cleanup_upload_sessions', every=timedelta(hours=1))
+def cleanup_stale_upload_sessions():
+    return f"removed {cleanup_upload_sessions()} upload sessions"
+
+
+@periodic('process_documents', every=timedelta(minutes=10), timeout=timedelta(hours=2))
+def process_pending_documents():
+    """Catch papers whose background processing was lost, e.g. in a worker restart."""
+    out = StringIO()
+    call_command('process_documents', stdout=out)
+    return out.getvalue().strip()
+
+
+@periodic('send_review_reminders', cron='0 8 * * *')
+def review_reminders():
+    emails, reviews = send_review_reminders()
+    return f"sent {emails} digests covering {reviews} reviews"
+
+
+@periodic('send_chair_digests', cron='0 * * * *')
+def chair_digests():
+    emails, events = send_chair_digests()
+    return f"sent {emails} digests covering {events} events"
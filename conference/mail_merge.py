@@ -0,0 +1,172 @@
+"""
+Placeholder engine for personalised emails.
+
+One compiler handles every placeholder style used in the app:
+``{*NAME*}`` / ``{*paperid*}`` (send to authors, PC email) and ``{{name}}``
+(PC email). EmailTemplates also accept the single-brace ``{author_name}``
+style of their defaults; it is compiled only with ``legacy=True``, so
+ordinary text such as ``{title}`` in a chair's free-text email is left
+alone. Names are case-insensitive and aliases map to one canonical field,
+so ``{*NAME*}``, ``{{name}}`` and, in templates, ``{author_name}`` all
+render the recipient's name. Unknown placeholders are left as written.
+
+A text is compiled once into a ``Plan`` (literal chunks and field names);
+rendering is a single join, so a mail merge over thousands of recipients
+does no parsing or repeated ``str.replace`` passes:
+
+    plan = compile_message(subject, body)       # or compile_email_template(t)
+    for recipient, (subject, body) in zip(recipients, plan.render_many(contexts)):
+        ...
+
+``send_mail_merge`` does that and sends the results over one connection.
+
+Compiled EmailTemplates are cached per process by (id, updated_at), so an
+edited template is recompiled on next use; ad-hoc texts are cached by
+content.
+"""
+import logging
+import re
+from functools import lru_cache
+
+from django.core.mail import EmailMessage, get_connection
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_RE = re.compile(r'\{\*\s*(\w+)\s*\*\}|\{\{\s*(\w+)\s*\}\}')
+# EmailTemplate text only: adds the {author_name} style of the defaults
+LEGACY_PLACEHOLDER_RE = re.compile(PLACEHOLDER_RE.pattern + r'|\{(\w+)\}')
+
+ALIASES = {
+    'author_name': 'name',
+    'reviewer_name': 'name',
+    'full_name': 'name',
+    'paperid': 'paper_id',
+    'submission_id': 'paper_id',
+    'title': 'paper_title',
+    'submission_title': 'paper_title',
+    'conference': 'conference_name',
+    'acronym': 'conference_acronym',
+    'submission_deadline': 'deadline',
+}
+
+TEMPLATE_CACHE_SIZE = 256
+
+
+class Plan:
+    """A compiled text: alternating literal chunks and field names."""
+    __slots__ = ('chunks', 'fields')
+
+    def __init__(self, text, legacy=False):
+        self.chunks, self.fields = [], []
+        position = 0
+        for match in (LEGACY_PLACEHOLDER_RE if legacy else PLACEHOLDER_RE).finditer(text):
+            name = next(group for group in match.groups() if group is not None).lower()
+            self.chunks.append(text[position:match.start()])
+            self.fields.append((ALIASES.get(name, name), match.group(0)))
+            position = match.end()
+        self.chunks.append(text[position:])
+
+    def render(self, context):
+        parts = [self.chunks[0]]
+        for (field, original), chunk in zip(self.fields, self.chunks[1:]):
+            value = context.get(field)
+            parts.append(original if value is None else str(value))
+            parts.append(chunk)
+        return ''.join(parts)
+
+
+class MessagePlan:
+    """Compiled subject and body of one email."""
+    __slots__ = ('subject', 'body')
+
+    def __init__(self, subject, body, legacy=False):
+        self.subject = compile_text(subject, legacy)
+        self.body = compile_text(body, legacy)
+
+    def render(self, context):
+        return self.subject.render(context), self.body.render(context)
+
+    def render_many(self, contexts):
+        """Yield (subject, body) for each context."""
+        subject, body = self.subject, self.body
+        for context in contexts:
+            yield subject.render(context), body.render(context)
+
+
+@lru_cache(maxsize=1024)
+def compile_text(text, legacy=False):
+    return Plan(text or '', legacy)
+
+
+def compile_message(subject, body, legacy=False):
+    """Compile a subject and body; ``legacy`` also accepts ``{name}`` placeholders (EmailTemplate text)."""
+    return MessagePlan(subject, body, legacy)
+
+
+def compile_email_template(template):
+    """Return the MessagePlan of an EmailTemplate, compiling it only when it changed."""
+    return _compile_template(template.pk, template.updated_at, template.subject, template.body)
+
+
+# lru_cache is safe to share between the threads of a gthread worker
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile_template(pk, updated_at, subject, body):
+    return MessagePlan(subject, body, legacy=True)
+
+
+def placeholder_context(user=None, paper=None, conference=None, **extra):
+    """
+    Field values for one recipient. Pass objects that are already loaded
+    (select_related / prefetched); nothing here queries the database.
+    """
+    context = {}
+    if conference is not None:
+        context.update({
+            'conference_name': conference.name,
+            'conference_acronym': conference.acronym,
+            'conference_description': conference.description,
+            'deadline': conference.paper_submission_deadline or '',
+            'review_deadline': conference.review_deadline or '',
+            'camera_ready_deadline': conference.camera_ready_deadline or '',
+        })
+    if paper is not None:
+        context.update({
+            'paper_title': paper.title,
+            'paper_id': paper.paper_id or paper.id,
+            'submission_date': paper.submitted_at.strftime('%Y-%m-%d') if paper.submitted_at else '',
+        })
+    if user is not None:
+        context.update({
+            'name': user.get_full_name() or user.username,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'email': user.email,
+        })
+    context.update(extra)
+    return context
+
+
+def send_mail_merge(plan, recipients, attachment=None, from_email=None):
+    """
+    Render and send ``plan`` to each (email, context) in ``recipients`` over
+    one SMTP connection. The attachment is read once and added to every
+    message. Returns (sent, errors): sent is a list of (email, subject, body)
+    and errors a list of "Failed to send to ..." strings.
+    """
+    recipients = list(recipients)
+    attachment_data = (attachment.name, attachment.read(), attachment.content_type) if attachment else None
+    sent, errors = [], []
+    with get_connection() as connection:
+        rendered = plan.render_many(context for _, context in recipients)
+        for (email, _), (subject, body) in zip(recipients, rendered):
+            message = EmailMessage(subject, body, from_email, [email], connection=connection)
+            if attachment_data:
+                message.attach(*attachment_data)
+            try:
+                message.send()
+            except Exception as exc:
+                logger.exception('Mail merge message to %s failed', email)
+                errors.append(f"Failed to send to {email}: {exc}")
+                continue
+            sent.append((email, subject, body))
+    return sent, errors
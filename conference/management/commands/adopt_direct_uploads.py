@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from conference.models import Paper
+from conference.object_storage import ObjectStorageError
+from conference.storage import ContentAddressedMixin, paper_storage
+
+
+class Command(BaseCommand):
+    help = 'Move papers still stored under incoming/ (direct uploads submitted before adoption) into content-addressed blobs'
+
+    def handle(self, *args, **options):
+        storage = paper_storage()
+        if not isinstance(storage, ContentAddressedMixin):
+            raise CommandError('The paper storage is not content-addressed.')
+        moved = failed = 0
+        for paper in Paper.objects.filter(file__startswith='incoming/').only('id', 'file').iterator():
+            try:
+                with transaction.atomic():
+                    name = storage.adopt(paper.file.name)
+                    Paper.objects.filter(pk=paper.pk).update(file=name)
+            except (FileNotFoundError, ObjectStorageError) as exc:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f'  ✗ Paper {paper.pk} ({paper.file.name}): {exc}'))
+                continue
+            moved += 1
+        self.stdout.write(self.style.SUCCESS(f'Moved {moved} papers out of incoming/ ({failed} failed)'))
@@ -0,0 +1,57 @@
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from conference.management.commands.migrate_paper_files import Command as MigratePaperFiles
+from conference.models import Paper, PaperDocumentInfo, StoredBlob
+from conference.storage import paper_storage
+from conference.synthetic import SCALES, seed_conference
+
+PREVIEW_PNG = b'\x89PNG\r\n\x1a\nscratch preview'
+
+
+class Command(BaseCommand):
+    help = 'Show on a scratch media directory that rebuilding blob reference counts keeps paper files and previews'
+
+    def handle(self, *args, **options):
+        storage = paper_storage()
+        if not isinstance(storage, FileSystemStorage):
+            raise CommandError('This check needs the filesystem paper storage (MEDIA_STORAGE_BACKEND=filesystem).')
+        self.failures = 0
+        # Files go to a scratch MEDIA_ROOT and the rows are rolled back. The
+        # rebuild removes orphaned files on commit; those callbacks are run
+        # right away, against the scratch directory.
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root), transaction.atomic():
+            seeded = seed_conference(SCALES['small'], label='blobs')
+            paper = Paper.objects.filter(conference=seeded.conference).order_by('id').first()
+            doc = PaperDocumentInfo.objects.create(paper=paper, status='done', file_name=paper.file.name)
+            doc.preview.save(f'paper_{paper.pk}.png', ContentFile(PREVIEW_PNG))
+            papers = Paper.objects.filter(file=seeded.paper_file).count()
+
+            with TestCase.captureOnCommitCallbacks(execute=True):
+                MigratePaperFiles(stdout=self.stdout).rebuild_ref_counts(storage)
+
+            preview = StoredBlob.objects.filter(name=doc.preview.name).first()
+            self.expect('the preview is stored as a content-addressed blob', storage.is_blob_name(doc.preview.name))
+            self.expect('the preview blob keeps one reference', preview is not None and preview.ref_count == 1)
+            self.expect('the preview file is still on disk', storage.exists(doc.preview.name))
+            blob = StoredBlob.objects.filter(name=seeded.paper_file).first()
+            self.expect(
+                f'the shared paper file counts its {papers} papers',
+                blob is not None and blob.ref_count == papers,
+            )
+            transaction.set_rollback(True)
+        if self.failures:
+            raise CommandError(f'{self.failures} blob reference checks failed.')
+        self.stdout.write(self.style.SUCCESS('\nAll blob reference checks passed.'))
+
+    def expect(self, label, ok):
+        if ok:
+            self.stdout.write(f"  ok    {label}")
+        else:
+            self.failures += 1
+            self.stdout.write(self.style.ERROR(f"  FAIL  {label}"))
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from conference.scheduler import Cron
+
+# (expression, after, expected next run), in the project time zone
+CASES = [
+    ('5 0 * * *', (2026, 3, 2, 10, 0), (2026, 3, 3, 0, 5)),
+    ('*/15 9-17 * * 1-5', (2026, 3, 6, 17, 50), (2026, 3, 9, 9, 0)),  # Friday evening -> Monday
+    ('0 9 1 * *', (2026, 3, 2, 10, 0), (2026, 4, 1, 9, 0)),
+    ('0 9 * * 1', (2026, 3, 2, 10, 0), (2026, 3, 9, 9, 0)),
+    # Day and weekday both restricted: the 1st OR any Monday
+    ('0 9 1 * 1', (2026, 3, 2, 10, 0), (2026, 3, 9, 9, 0)),
+    ('0 9 1 * 1', (2026, 3, 30, 10, 0), (2026, 4, 1, 9, 0)),
+    # A stepped day counts as unrestricted, as in cron: odd days AND Mondays
+    ('0 9 */2 * 1', (2026, 3, 2, 10, 0), (2026, 3, 9, 9, 0)),
+    ('0 9 */2 * 1', (2026, 3, 9, 10, 0), (2026, 3, 23, 9, 0)),
+]
+
+
+class Command(BaseCommand):
+    help = "Check the scheduler's cron parser against known next-run times"
+
+    def handle(self, *args, **options):
+        failures = 0
+        for expression, after, expected in CASES:
+            after, expected = (timezone.make_aware(datetime(*value)) for value in (after, expected))
+            actual = Cron(expression).next_after(after)
+            line = f"{expression:<20} after {after:%a %Y-%m-%d %H:%M} -> {actual:%a %Y-%m-%d %H:%M}"
+            if actual == expected:
+                self.stdout.write(f"  ok    {line}")
+            else:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"  FAIL  {line} (expected {expected:%a %Y-%m-%d %H:%M})"))
+        if failures:
+            raise CommandError(f'{failures} cron checks failed.')
+        self.stdout.write(self.style.SUCCESS('\nAll cron checks passed.'))
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from conference.mail_merge import compile_message
+from conference.models import EmailTemplate
+
+CONTEXT = {
+    'name': 'Ada Lovelace', 'paper_title': 'On Engines', 'paper_id': 'CONF0001', 'conference_name': 'ICX 2026',
+    'camera_ready_deadline': '2026-12-01',
+}
+
+
+class Command(BaseCommand):
+    help = 'Check which placeholder styles the mail merge fills in free-text emails and in EmailTemplates'
+
+    def handle(self, *args, **options):
+        self.failures = 0
+        subject, body = compile_message('Note on {title}', 'Dear {{name}}, see {*PAPERID*}: use {conference} braces.').render(CONTEXT)
+        self.expect('free text fills {{name}} and {*PAPERID*}', 'Dear Ada Lovelace, see CONF0001' in body)
+        self.expect(
+            'free text leaves {word} alone',
+            subject == 'Note on {title}' and 'use {conference} braces.' in body,
+        )
+
+        default = EmailTemplate.get_default_templates()['decision_accept']
+        subject, body = EmailTemplate(subject=default['subject'], body=default['body']).render(CONTEXT)
+        self.expect(
+            'EmailTemplate defaults fill {author_name} and {conference_name}',
+            subject == 'Paper Acceptance - ICX 2026' and body.startswith('Dear Ada Lovelace,') and '{' not in body,
+        )
+        _, body = compile_message('', 'Dear {author_name},', legacy=True).render(CONTEXT)
+        self.expect('an edited template keeps {author_name}', body == 'Dear Ada Lovelace,')
+
+        if self.failures:
+            raise CommandError(f'{self.failures} mail merge checks failed.')
+        self.stdout.write(self.style.SUCCESS('\nAll mail merge checks passed.'))
+
+    def expect(self, label, ok):
+        if ok:
+            self.stdout.write(f"  ok    {label}")
+        else:
+            self.failures += 1
+            self.stdout.write(self.style.ERROR(f"  FAIL  {label}"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from conference.uploads import cleanup_upload_sessions
+
+class Command(BaseCommand):
+    help = 'Remove abandoned chunked upload sessions and their temp files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-age',
+            type=int,
+            default=None,
+            help='Remove sessions untouched for this many seconds (default: PAPER_UPLOAD_SESSION_TTL)'
+        )
+
+    def handle(self, *args, **options):
+        removed = cleanup_upload_sessions(max_age=options['max_age'])
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} upload sessions.'))
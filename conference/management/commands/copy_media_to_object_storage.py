@@ -0,0 +1,76 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from conference.object_storage import S3Storage
+
+SKIP_DIRS = {'tmp'}
+
+
+class Command(BaseCommand):
+    help = 'Copy every file under MEDIA_ROOT to the configured object storage bucket, in parallel'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Number of parallel uploads')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List how many files and bytes would be copied'
+        )
+
+    def handle(self, *args, **options):
+        storage = S3Storage(**settings.OBJECT_STORAGE)
+        files = list(self.media_files())
+        total_bytes = sum(size for _, _, size in files)
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'DRY RUN: Would copy {len(files)} files ({total_bytes} bytes)'))
+            return
+
+        copied = skipped = failed = 0
+        copied_bytes = 0
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            futures = {pool.submit(self.copy_file, storage, *item): item for item in files}
+            for future in as_completed(futures):
+                name, _, size = futures[future]
+                try:
+                    uploaded = future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f'  - {name}: {e}'))
+                    continue
+                if uploaded:
+                    copied += 1
+                    copied_bytes += size
+                else:
+                    skipped += 1
+        elapsed = time.monotonic() - started
+        rate = copied_bytes / elapsed / (1024 * 1024) if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Copied {copied} files ({copied_bytes} bytes, {rate:.1f} MB/s), '
+            f'{skipped} already present, {failed} failed in {elapsed:.1f}s.'
+        ))
+
+    def media_files(self):
+        """Yield ``(name, path, size)`` for every file under MEDIA_ROOT."""
+        root = settings.MEDIA_ROOT
+        for dirpath, dirnames, filenames in os.walk(root):
+            if dirpath == root:
+                dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, root).replace(os.sep, '/')
+                yield name, path, os.path.getsize(path)
+
+    def copy_file(self, storage, name, path, size):
+        """Upload one file unless an object of the same size already exists."""
+        try:
+            if storage.size(name) == size:
+                return False
+        except FileNotFoundError:
+            pass
+        storage.save_path(name, path)
+        return True
@@ -0,0 +1,95 @@
+import hashlib
+import os
+from collections import Counter
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from conference.models import Paper, PaperDocumentInfo, StoredBlob
+from conference.storage import paper_storage
+
+# Every (model, field) whose files live in the content-addressed paper storage
+BLOB_FIELDS = [(Paper, 'file'), (PaperDocumentInfo, 'preview')]
+
+class Command(BaseCommand):
+    help = 'Move existing paper files into content-addressed storage and rebuild blob reference counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report how many files would be moved and how much space de-duplication saves'
+        )
+        parser.add_argument(
+            '--keep-originals',
+            action='store_true',
+            help='Leave the original files in place after copying them'
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        storage = paper_storage()
+        legacy = FileSystemStorage()
+        moved = missing = 0
+        seen = {}
+        saved_bytes = 0
+
+        papers = Paper.objects.exclude(file='').only('id', 'file', 'original_filename').order_by('id')
+        for paper in papers.iterator():
+            name = paper.file.name
+            if storage.is_blob_name(name):
+                continue
+            if not legacy.exists(name):
+                missing += 1
+                self.stdout.write(self.style.WARNING(f'  - Paper {paper.id}: {name} not found'))
+                continue
+            if dry_run:
+                digest = hashlib.sha256()
+                with legacy.open(name, 'rb') as fh:
+                    for chunk in iter(lambda: fh.read(1024 * 1024), b''):
+                        digest.update(chunk)
+                digest = digest.hexdigest()
+                if digest in seen:
+                    saved_bytes += legacy.size(name)
+                seen[digest] = True
+                moved += 1
+                continue
+            with legacy.open(name, 'rb') as fh:
+                blob_name = storage.save(name, File(fh))
+            Paper.objects.filter(pk=paper.pk).update(
+                file=blob_name,
+                original_filename=paper.original_filename or os.path.basename(name),
+            )
+            if not options['keep_originals']:
+                legacy.delete(name)
+            moved += 1
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(
+                f'DRY RUN: Would move {moved} files; de-duplication would save {saved_bytes} bytes'
+            ))
+        else:
+            self.rebuild_ref_counts(storage)
+            self.stdout.write(self.style.SUCCESS(f'Moved {moved} files into content-addressed storage.'))
+        if missing:
+            self.stdout.write(self.style.WARNING(f'{missing} paper files were missing on disk.'))
+
+    def rebuild_ref_counts(self, storage):
+        """Recompute every StoredBlob.ref_count from the rows (BLOB_FIELDS) that use it."""
+        counts = Counter()
+        for model, field in BLOB_FIELDS:
+            counts.update(dict(
+                model.objects.exclude(**{field: ''}).values(field).annotate(n=Count('pk')).values_list(field, 'n')
+            ))
+        to_update = []
+        for blob in StoredBlob.objects.all():
+            ref_count = counts.get(blob.name, 0)
+            if blob.ref_count != ref_count:
+                blob.ref_count = ref_count
+                to_update.append(blob)
+        StoredBlob.objects.bulk_update(to_update, ['ref_count'], batch_size=500)
+        orphaned = StoredBlob.objects.filter(ref_count=0)
+        for blob in orphaned:
+            storage.delete(blob.name)
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from conference.models import Paper, PaperDocumentInfo
+from conference.processing import process_paper
+
+class Command(BaseCommand):
+    help = 'Extract page counts, metadata and previews for papers that are pending or were never processed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Reprocess every paper, not only pending and unprocessed ones'
+        )
+        parser.add_argument(
+            '--conference',
+            type=int,
+            help='Only process papers of this conference id'
+        )
+
+    def handle(self, *args, **options):
+        papers = Paper.objects.exclude(file='')
+        if options['conference']:
+            papers = papers.filter(conference_id=options['conference'])
+        if not options['all']:
+            papers = papers.filter(
+                document_info__isnull=True
+            ) | papers.filter(document_info__status='pending')
+        done = failed = 0
+        for paper_id in papers.values_list('id', flat=True).distinct():
+            doc = process_paper(paper_id)
+            if doc.status == 'done':
+                done += 1
+            else:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f'  - Paper {paper_id}: {doc.error}'))
+        self.stdout.write(self.style.SUCCESS(f'Processed {done} papers ({failed} failed).'))
+        flagged = PaperDocumentInfo.objects.filter(exceeds_page_limit=True).count()
+        if flagged:
+            self.stdout.write(self.style.WARNING(f'{flagged} papers exceed their conference page limit.'))
@@ -0,0 +1,35 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from conference.fake_object_storage import FakeObjectStorageServer
+
+
+class Command(BaseCommand):
+    help = 'Serve a filesystem-backed S3-compatible object store for development and tests'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=9000)
+        parser.add_argument(
+            '--root',
+            default=os.path.join(settings.BASE_DIR, 'tmp', 'object-storage'),
+            help='Directory holding one sub-directory per bucket'
+        )
+
+    def handle(self, *args, **options):
+        config = settings.OBJECT_STORAGE
+        server = FakeObjectStorageServer(
+            (options['host'], options['port']), options['root'],
+            config['access_key'], config['secret_key'], config['region'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Fake object storage on http://{options['host']}:{options['port']}/ (root {server.root})"
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
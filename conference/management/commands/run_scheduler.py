@@ -0,0 +1,73 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from conference.models import ScheduledJob
+from conference.scheduler import ensure_job_rows, load_jobs, node_name, run_due_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = 'Run periodic jobs (housekeeping, conference statuses, document processing) on their schedules'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run the jobs that are due now and exit (for cron)')
+        parser.add_argument('--job', help='Run this job now, whether or not it is due, and exit')
+        parser.add_argument('--list', action='store_true', help='Show every job with its schedule and runtime metrics')
+        parser.add_argument('--tick', type=int, default=30, help='Seconds between checks for due jobs (default: 30)')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not settings.IS_PRODUCTION:
+            # DATABASE_URL missing: the jobs would run against a throwaway SQLite file
+            raise CommandError('DEBUG is off but DATABASE_URL is not set; give the scheduler the same database as the web service.')
+        jobs = load_jobs()
+        ensure_job_rows(jobs)
+        node = node_name()
+
+        if options['list']:
+            return self.list_jobs(jobs)
+        if options['job']:
+            job = jobs.get(options['job'])
+            if job is None:
+                raise CommandError(f"Unknown job '{options['job']}'. Known jobs: {', '.join(sorted(jobs))}")
+            row = run_job(job, node, force=True)
+            if row is None:
+                raise CommandError(f"'{job.name}' is running on {ScheduledJob.objects.get(name=job.name).locked_by}")
+            return self.report(row)
+        if options['once']:
+            for row in run_due_jobs(jobs, node):
+                self.report(row)
+            return
+
+        self.stdout.write(f"Scheduler {node} running {len(jobs)} jobs: {', '.join(sorted(jobs))}")
+        stopping = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stopping.append(True))
+        while not stopping:
+            close_old_connections()
+            for row in run_due_jobs(jobs, node):
+                self.report(row)
+            for _ in range(options['tick']):
+                if stopping:
+                    break
+                time.sleep(1)
+        self.stdout.write('Scheduler stopped.')
+
+    def report(self, row):
+        line = f"{row.name}: {row.last_status} in {row.last_duration:.2f}s - {row.last_result}"
+        self.stdout.write(self.style.SUCCESS(line) if row.last_status == 'ok' else self.style.ERROR(line))
+
+    def list_jobs(self, jobs):
+        self.stdout.write(f"{'job':<28}{'schedule':<16}{'next run':<18}{'runs':>6}{'fails':>6}{'last':>9}{'avg':>9}{'max':>9}  status")
+        rows = {row.name: row for row in ScheduledJob.objects.filter(name__in=jobs)}
+        for name, job in sorted(jobs.items()):
+            row = rows[name]
+            schedule = job.cron.expression if job.cron else f"every {int(job.every.total_seconds())}s"
+            seconds = lambda value: '-' if value is None else f"{value:.2f}s"
+            status = f"locked by {row.locked_by}" if row.locked_by else (row.last_status or 'never run')
+            self.stdout.write(
+                f"{name:<28}{schedule:<16}{row.next_run_at:%Y-%m-%d %H:%M}  {row.run_count:>6}{row.failure_count:>6}"
+                f"{seconds(row.last_duration):>9}{seconds(row.average_duration):>9}{seconds(row.max_duration if row.run_count else None):>9}  {status}"
+            )
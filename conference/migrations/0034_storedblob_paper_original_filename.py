@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-18 22:13
+
+import conference.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conference', '0033_uploadsession'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.PositiveBigIntegerField()),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='paper',
+            name='original_filename',
+            field=models.CharField(blank=True, help_text='File name as uploaded by the author', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='paper',
+            name='file',
+            field=models.FileField(storage=conference.storage.paper_storage, upload_to='papers/'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-18 22:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conference', '0034_storedblob_paper_original_filename'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaperDocumentInfo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('file_name', models.CharField(blank=True, help_text='Paper file this data was extracted from', max_length=255)),
+                ('file_format', models.CharField(blank=True, max_length=10)),
+                ('page_count', models.PositiveIntegerField(blank=True, null=True)),
+                ('word_count', models.PositiveIntegerField(blank=True, null=True)),
+                ('title', models.CharField(blank=True, help_text='Title from the document metadata', max_length=255)),
+                ('preview', models.ImageField(blank=True, upload_to='previews/')),
+                ('exceeds_page_limit', models.BooleanField(default=False)),
+                ('format_mismatch', models.BooleanField(default=False)),
+                ('error', models.TextField(blank=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('paper', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='document_info', to='conference.paper')),
+            ],
+            options={
+                'verbose_name': 'Paper Document Info',
+                'verbose_name_plural': 'Paper Document Info',
+            },
+        ),
+    ]
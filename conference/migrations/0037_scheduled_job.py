@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-18 22:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conference', '0036_notification_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledJob',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('next_run_at', models.DateTimeField()),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('locked_by', models.CharField(blank=True, max_length=255)),
+                ('last_started_at', models.DateTimeField(blank=True, null=True)),
+                ('last_finished_at', models.DateTimeField(blank=True, null=True)),
+                ('last_duration', models.FloatField(blank=True, help_text='Seconds', null=True)),
+                ('last_status', models.CharField(blank=True, max_length=10)),
+                ('last_result', models.TextField(blank=True, help_text='Summary or error of the last run')),
+                ('run_count', models.PositiveIntegerField(default=0)),
+                ('failure_count', models.PositiveIntegerField(default=0)),
+                ('total_duration', models.FloatField(default=0, help_text='Seconds, over all runs')),
+                ('max_duration', models.FloatField(default=0, help_text='Seconds')),
+            ],
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-18 22:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conference', '0038_review_reminder'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conference',
+            name='chair_email_digest',
+            field=models.CharField(choices=[('immediate', 'One email per event'), ('hourly', 'Hourly digest'), ('daily', 'Daily digest')], default='immediate', help_text='How chairs receive event emails for this conference', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='ChairEmailEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('submission', 'New submission'), ('subreviewer_response', 'Subreviewer response'), ('subreviewer_review', 'Subreviewer review'), ('pc_accepted', 'PC invitation accepted')], max_length=30)),
+                ('summary', models.CharField(max_length=500)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('conference', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chair_email_events', to='conference.conference')),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chair_email_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sent_at', 'recipient'], name='conference__sent_at_43dda2_idx')],
+            },
+        ),
+    ]
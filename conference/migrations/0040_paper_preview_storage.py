@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-18 23:27
+
+import conference.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conference', '0039_chair_email_digest'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='paperdocumentinfo',
+            name='preview',
+            field=models.ImageField(blank=True, storage=conference.storage.paper_storage, upload_to='previews/'),
+        ),
+    ]
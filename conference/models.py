@@ -1,8 +1,12 @@
+import os
+import uuid
 from django.conf import settings
 from django.db import models
 from accounts.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from .storage import ContentAddressedMixin, paper_storage
+from .mail_merge import compile_email_template
 
 AREA_CHOICES = [
     ('AI', 'Artificial Intelligence'),
@@ -80,6 +84,14 @@ class Conference(models.Model):
     decision_deadline = models.DateTimeField(null=True, blank=True, help_text="Final decision deadline")
     camera_ready_deadline = models.DateTimeField(null=True, blank=True, help_text="Camera-ready submission deadline")
 
+    # Emails to chairs about submissions, reviews and invitation responses
+    CHAIR_EMAIL_CHOICES = [
+        ('immediate', 'One email per event'),
+        ('hourly', 'Hourly digest'),
+        ('daily', 'Daily digest'),
+    ]
+    chair_email_digest = models.CharField(max_length=10, choices=CHAIR_EMAIL_CHOICES, default='immediate', help_text="How chairs receive event emails for this conference")
+
     def __str__(self):
         return self.name
 
@@ -132,7 +144,8 @@ class Track(models.Model):
 class Paper(models.Model):
     title = models.CharField(max_length=255)
     abstract = models.TextField()
-    file = models.FileField(upload_to='papers/')
+    file = models.FileField(upload_to='papers/', storage=paper_storage)
+    original_filename = models.CharField(max_length=255, blank=True, help_text="File name as uploaded by the author")
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='papers')
     conference = models.ForeignKey(Conference, on_delete=models.CASCADE, related_name='papers')
     submitted_at = models.DateTimeField(auto_now_add=True)
@@ -164,6 +177,8 @@ class Paper(models.Model):
         pass
 
     def save(self, *args, **kwargs):
+        if self.file and not self.file._committed:
+            self.original_filename = os.path.basename(self.file.name)[:255]
         if not self.paper_id:
             acronym = (self.conference.acronym or 'CONF').upper()
             year = self.conference.start_date.year if self.conference.start_date else 0
@@ -175,6 +190,98 @@ class Paper(models.Model):
             self.paper_id = f"{acronym}{yy}{serial:02d}"
         super().save(*args, **kwargs)
 
+class UploadSession(models.Model):
+    """
+    Server-side state for a resumable, chunked upload of a paper file.
+    Chunks are appended to a temp file until the declared size is reached,
+    then the file is attached to a Paper on finalisation.
+    """
+    STATUS_CHOICES = [
+        ('active', 'Active'),
+        ('completed', 'Completed'),
+        ('aborted', 'Aborted'),
+    ]
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    conference = models.ForeignKey(Conference, on_delete=models.CASCADE, related_name='upload_sessions')
+    paper = models.ForeignKey('Paper', on_delete=models.SET_NULL, null=True, blank=True, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    total_size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    received_bytes = models.PositiveBigIntegerField(default=0, help_text="Last confirmed offset")
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Optional whole-file checksum declared by the client")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='active')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'updated_at'])]
+
+    def __str__(self):
+        return f"Upload {self.id} ({self.filename}, {self.received_bytes}/{self.total_size})"
+
+    @property
+    def is_complete(self):
+        return self.received_bytes >= self.total_size
+
+class PaperDocumentInfo(models.Model):
+    """
+    Data extracted from a paper's file by the background document processor,
+    so listings can show page counts and previews without reopening files.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    paper = models.OneToOneField(Paper, on_delete=models.CASCADE, related_name='document_info')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    file_name = models.CharField(max_length=255, blank=True, help_text="Paper file this data was extracted from")
+    file_format = models.CharField(max_length=10, blank=True)
+    page_count = models.PositiveIntegerField(null=True, blank=True)
+    word_count = models.PositiveIntegerField(null=True, blank=True)
+    title = models.CharField(max_length=255, blank=True, help_text="Title from the document metadata")
+    # On the paper storage, served only through conference:paper_preview
+    preview = models.ImageField(upload_to='previews/', storage=paper_storage, blank=True)
+    exceeds_page_limit = models.BooleanField(default=False)
+    format_mismatch = models.BooleanField(default=False)
+    error = models.TextField(blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Paper Document Info'
+        verbose_name_plural = 'Paper Document Info'
+
+    def __str__(self):
+        return f"{self.paper} ({self.status}, {self.page_count or '?'} pages)"
+
+class StoredBlob(models.Model):
+    """
+    A de-duplicated file in ContentAddressedStorage, keyed by its SHA-256.
+    ref_count is the number of FileField values currently pointing at it.
+    """
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+@receiver(post_delete, sender=Paper)
+def release_paper_file(sender, instance, **kwargs):
+    """Drop this paper's reference to its de-duplicated file."""
+    storage = instance.file.storage if instance.file else None
+    if isinstance(storage, ContentAddressedMixin) and storage.is_blob_name(instance.file.name):
+        storage.delete(instance.file.name)
+
+@receiver(post_delete, sender=PaperDocumentInfo)
+def release_preview_file(sender, instance, **kwargs):
+    """Drop this document's reference to its preview image."""
+    if instance.preview:
+        instance.preview.storage.delete(instance.preview.name)
+
 class Review(models.Model):
     paper = models.ForeignKey(Paper, on_delete=models.CASCADE, related_name='reviews')
     reviewer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reviews')
@@ -197,6 +304,20 @@ class Review(models.Model):
         else:
             return f"{self.reviewer} review for {self.paper}: pending"
 
+class ReviewReminder(models.Model):
+    """A reminder email sent about a pending review; used to throttle repeats."""
+    review = models.ForeignKey(Review, on_delete=models.CASCADE, related_name='reminders')
+    reviewer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='review_reminders')
+    conference = models.ForeignKey(Conference, on_delete=models.CASCADE, related_name='review_reminders')
+    sent_at = models.DateTimeField(auto_now_add=True)
+    sent_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+', help_text="Empty for scheduled reminders")
+
+    class Meta:
+        indexes = [models.Index(fields=['review', 'sent_at'])]
+
+    def __str__(self):
+        return f"Reminder to {self.reviewer} for {self.review.paper} at {self.sent_at:%Y-%m-%d %H:%M}"
+
 class Notification(models.Model):
     NOTIFICATION_TYPES = [
         ('reviewer_invite', 'Reviewer Invitation'),
@@ -219,6 +340,10 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', 'is_read'], name='notification_unread_idx'),
+            models.Index(fields=['recipient', '-id'], name='notification_history_idx'),
+        ]
 
     def __str__(self):
         return f"{self.recipient.username} - {self.title}"
@@ -387,10 +512,14 @@ class EmailTemplate(models.Model):
     
     def __str__(self):
         return f"{self.conference.name} - {self.get_template_type_display()}"
+
+    def render(self, context):
+        """Return (subject, body) filled from a mail_merge.placeholder_context() dict."""
+        return compile_email_template(self).render(context)
     
     @classmethod
     def get_default_templates(cls):
-        """Return default email templates."""
+        """Return default email templates (placeholders are rendered by conference.mail_merge)."""
         return {
             'submission_confirmation': {
                 'subject': 'Submission Confirmation - {conference_name}',
@@ -474,3 +603,53 @@ def create_feature_toggles_for_conference(sender, instance, created, **kwargs):
     if created:
         for feature, _ in FEATURE_CHOICES:
             ConferenceFeatureToggle.objects.get_or_create(conference=instance, feature=feature, defaults={'enabled': True})
+
+class ChairEmailEvent(models.Model):
+    """An event email for a chair, buffered until the conference's next digest is sent."""
+    EVENT_TYPES = [
+        ('submission', 'New submission'),
+        ('subreviewer_response', 'Subreviewer response'),
+        ('subreviewer_review', 'Subreviewer review'),
+        ('pc_accepted', 'PC invitation accepted'),
+    ]
+    conference = models.ForeignKey(Conference, on_delete=models.CASCADE, related_name='chair_email_events')
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='chair_email_events')
+    event_type = models.CharField(max_length=30, choices=EVENT_TYPES)
+    summary = models.CharField(max_length=500)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['sent_at', 'recipient'])]
+
+    def __str__(self):
+        return f"{self.get_event_type_display()} for {self.recipient} ({'sent' if self.sent_at else 'pending'})"
+
+class ScheduledJob(models.Model):
+    """
+    State of one periodic job run by ``manage.py run_scheduler``.
+
+    The row doubles as the job's lock: a scheduler claims a due job with a
+    conditional UPDATE on ``locked_until``, so with several scheduler
+    processes each run happens on exactly one of them.
+    """
+    name = models.CharField(max_length=100, primary_key=True)
+    next_run_at = models.DateTimeField()
+    locked_until = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=255, blank=True)
+    last_started_at = models.DateTimeField(null=True, blank=True)
+    last_finished_at = models.DateTimeField(null=True, blank=True)
+    last_duration = models.FloatField(null=True, blank=True, help_text="Seconds")
+    last_status = models.CharField(max_length=10, blank=True)
+    last_result = models.TextField(blank=True, help_text="Summary or error of the last run")
+    run_count = models.PositiveIntegerField(default=0)
+    failure_count = models.PositiveIntegerField(default=0)
+    total_duration = models.FloatField(default=0, help_text="Seconds, over all runs")
+    max_duration = models.FloatField(default=0, help_text="Seconds")
+
+    def __str__(self):
+        return f"{self.name} (next {self.next_run_at:%Y-%m-%d %H:%M})"
+
+    @property
+    def average_duration(self):
+        return self.total_duration / self.run_count if self.run_count else None
@@ -0,0 +1,163 @@
+"""
+Notification service.
+
+All Notification rows are created through ``notify`` / ``send_notifications``,
+which insert with a single ``bulk_create`` however many recipients there are.
+With a shared cache (CACHE_IS_SHARED), each user's unread count is kept in
+the cache and adjusted on create and on read, so pages can show it without
+a COUNT query; a missing or evicted counter is rebuilt from the database on
+the next read. A per-process cache would drift as soon as another worker
+changed a count, so without one the indexed COUNT query runs every time.
+
+Changes are also published on ``notification_broker`` so open notification
+streams (see ``notification_events``) wake up and push them immediately.
+"""
+import asyncio
+import json
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+
+from .models import Notification
+from .pubsub import notification_broker
+
+UNREAD_CACHE_TIMEOUT = 24 * 60 * 60
+STREAM_BATCH_SIZE = 50
+
+
+def unread_cache_key(user_id):
+    return f"notifications:unread:{user_id}"
+
+
+def notify(recipients, notification_type, title, message, **related):
+    """Send the same notification to every user in ``recipients``."""
+    return send_notifications([
+        Notification(
+            recipient=recipient, notification_type=notification_type,
+            title=title, message=message, **related
+        )
+        for recipient in recipients
+    ])
+
+
+def send_notifications(notifications):
+    """Insert unsaved Notification instances in one query and bump unread counters."""
+    notifications = [n for n in notifications if n.recipient_id]
+    if not notifications:
+        return []
+    created = Notification.objects.bulk_create(notifications)
+    per_user = Counter(n.recipient_id for n in created)
+    transaction.on_commit(lambda: _adjust_unread(per_user))
+    return created
+
+
+def unread_count(user):
+    unread = Notification.objects.filter(recipient=user, is_read=False)
+    if not settings.CACHE_IS_SHARED:
+        return unread.count()
+    key = unread_cache_key(user.pk)
+    count = cache.get(key)
+    if count is None:
+        count = unread.count()
+        cache.set(key, count, UNREAD_CACHE_TIMEOUT)
+    return count
+
+
+async def aunread_count(user_id):
+    unread = Notification.objects.filter(recipient_id=user_id, is_read=False)
+    if not settings.CACHE_IS_SHARED:
+        return await unread.acount()
+    key = unread_cache_key(user_id)
+    count = await cache.aget(key)
+    if count is None:
+        count = await unread.acount()
+        await cache.aset(key, count, UNREAD_CACHE_TIMEOUT)
+    return count
+
+
+def mark_notifications_read(user, ids=None):
+    """Mark ``user``'s unread notifications (or just ``ids``) read with one UPDATE."""
+    unread = Notification.objects.filter(recipient=user, is_read=False)
+    if ids is not None:
+        unread = unread.filter(id__in=ids)
+    updated = unread.update(is_read=True)
+    if ids is None:
+        transaction.on_commit(lambda: _reset_unread(user.pk))
+    elif updated:
+        transaction.on_commit(lambda: _adjust_unread({user.pk: -updated}))
+    return updated
+
+
+def notification_history(user, before=None, limit=20):
+    """
+    Return ``(notifications, next_before)`` for one page of ``user``'s history,
+    newest first. Pages are keyed on id, so deep pages cost the same as the first.
+    """
+    qs = Notification.objects.filter(recipient=user).select_related('related_conference', 'related_paper')
+    if before:
+        qs = qs.filter(id__lt=before)
+    page = list(qs.order_by('-id')[:limit + 1])
+    next_before = page[limit - 1].id if len(page) > limit else None
+    return page[:limit], next_before
+
+
+async def notification_events(user_id, since=None, once=False):
+    """
+    Yield Server-Sent Events for ``user_id``: one ``notification`` event per
+    row with id > ``since`` and an ``unread`` event with the current count.
+
+    Between batches the generator waits for a publish or, at most,
+    NOTIFICATION_STREAM_HEARTBEAT seconds, then re-runs the same cheap
+    since-id query; the heartbeat also catches rows created by other
+    processes. With ``once`` it stops after the first batch.
+    """
+    if since is None:
+        latest = await Notification.objects.filter(recipient_id=user_id).aaggregate(latest=Max('id'))
+        since = latest['latest'] or 0
+    yield f"retry: {settings.NOTIFICATION_STREAM_RETRY_MS}\n\n"
+    unread = None
+    with notification_broker.subscribe(user_id) as wake:
+        while True:
+            wake.clear()
+            rows = Notification.objects.filter(recipient_id=user_id, id__gt=since).order_by('id').values(
+                'id', 'notification_type', 'title', 'message', 'related_conference_id', 'related_paper_id', 'created_at',
+            )
+            sent = 0
+            async for row in rows[:STREAM_BATCH_SIZE]:
+                since = row['id']
+                sent += 1
+                row['created_at'] = row['created_at'].isoformat()
+                yield f"id: {row['id']}\nevent: notification\ndata: {json.dumps(row)}\n\n"
+            if sent == STREAM_BATCH_SIZE:
+                continue  # more rows waiting
+            count = await aunread_count(user_id)
+            if count != unread:
+                unread = count
+                yield f"event: unread\ndata: {json.dumps({'unread': count})}\n\n"
+            if once:
+                return
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=settings.NOTIFICATION_STREAM_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+
+
+def _reset_unread(user_id):
+    if settings.CACHE_IS_SHARED:
+        cache.set(unread_cache_key(user_id), 0, UNREAD_CACHE_TIMEOUT)
+    notification_broker.publish([user_id])
+
+
+def _adjust_unread(deltas):
+    if settings.CACHE_IS_SHARED:
+        for user_id, delta in deltas.items():
+            key = unread_cache_key(user_id)
+            try:
+                if cache.incr(key, delta) < 0:
+                    cache.delete(key)
+            except ValueError:
+                pass  # not cached; rebuilt on next read
+    notification_broker.publish(deltas.keys())
@@ -0,0 +1,224 @@
+"""
+S3-compatible object storage for media files.
+
+S3Storage is a Django storage backend that talks to any S3-compatible
+service (AWS S3, MinIO, R2, ...) with AWS Signature V4, using ``requests``
+rather than a full SDK. Downloads and uploads can bypass Django entirely
+through presigned URLs: ``url()`` returns a presigned GET and
+``presigned_upload()`` a presigned PUT.
+
+For local development and tests, ``run_fake_object_storage`` serves a
+filesystem-backed stand-in (conference.fake_object_storage) that checks the
+same signatures.
+"""
+import datetime
+import hashlib
+import hmac
+import tempfile
+from email.utils import parsedate_to_datetime
+from urllib.parse import quote, urlsplit
+
+from django.core.files import File
+from django.core.files.storage import Storage
+from django.utils.deconstruct import deconstructible
+
+ALGORITHM = 'AWS4-HMAC-SHA256'
+UNSIGNED_PAYLOAD = 'UNSIGNED-PAYLOAD'
+
+
+def _hmac(key, msg):
+    return hmac.new(key, msg.encode('utf-8'), hashlib.sha256).digest()
+
+
+def signing_key(secret_key, date_stamp, region, service='s3'):
+    k_date = _hmac(('AWS4' + secret_key).encode('utf-8'), date_stamp)
+    k_region = _hmac(k_date, region)
+    k_service = _hmac(k_region, service)
+    return _hmac(k_service, 'aws4_request')
+
+
+def canonical_query(params):
+    return '&'.join(
+        f"{quote(str(k), safe='-_.~')}={quote(str(v), safe='-_.~')}"
+        for k, v in sorted(params.items())
+    )
+
+
+def canonical_request(method, path, params, headers, signed_headers, payload_hash):
+    canonical_headers = ''.join(f"{h}:{headers[h].strip()}\n" for h in signed_headers)
+    return '\n'.join([
+        method, path, canonical_query(params), canonical_headers,
+        ';'.join(signed_headers), payload_hash,
+    ])
+
+
+def sign(secret_key, region, amz_date, canonical):
+    """Return the hex signature for a canonical request."""
+    date_stamp = amz_date[:8]
+    scope = f"{date_stamp}/{region}/s3/aws4_request"
+    string_to_sign = '\n'.join([
+        ALGORITHM, amz_date, scope, hashlib.sha256(canonical.encode('utf-8')).hexdigest(),
+    ])
+    return hmac.new(
+        signing_key(secret_key, date_stamp, region), string_to_sign.encode('utf-8'), hashlib.sha256
+    ).hexdigest()
+
+
+class ObjectStorageError(Exception):
+    pass
+
+
+class S3Client:
+    """Minimal path-style S3 client: put, get, head, delete and presigning."""
+
+    def __init__(self, endpoint_url, bucket, access_key, secret_key, region='us-east-1', timeout=30):
+        self.endpoint_url = endpoint_url.rstrip('/')
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.timeout = timeout
+        self.host = urlsplit(self.endpoint_url).netloc
+        import requests  # only loaded when the s3 backend is used
+        self.session = requests.Session()
+
+    def object_path(self, key):
+        return '/' + quote(f"{self.bucket}/{key}", safe='/-_.~')
+
+    def _now(self):
+        return datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+    def request(self, method, key, data=None, extra_headers=None, stream=False):
+        amz_date = self._now()
+        path = self.object_path(key)
+        headers = {
+            'host': self.host,
+            'x-amz-content-sha256': UNSIGNED_PAYLOAD,
+            'x-amz-date': amz_date,
+        }
+        # S3 requires every x-amz-* header to be signed
+        headers.update({k.lower(): v for k, v in (extra_headers or {}).items() if k.lower().startswith('x-amz-')})
+        signed_headers = sorted(headers)
+        canonical = canonical_request(method, path, {}, headers, signed_headers, UNSIGNED_PAYLOAD)
+        signature = sign(self.secret_key, self.region, amz_date, canonical)
+        scope = f"{amz_date[:8]}/{self.region}/s3/aws4_request"
+        headers['Authorization'] = (
+            f"{ALGORITHM} Credential={self.access_key}/{scope}, "
+            f"SignedHeaders={';'.join(signed_headers)}, Signature={signature}"
+        )
+        del headers['host']  # requests sets it from the URL
+        headers.update(extra_headers or {})
+        response = self.session.request(
+            method, self.endpoint_url + path, data=data, headers=headers,
+            stream=stream, timeout=self.timeout,
+        )
+        if response.status_code >= 400 and not (method == 'HEAD' and response.status_code == 404):
+            raise ObjectStorageError(f"{method} {key} failed: {response.status_code} {response.text[:200]}")
+        return response
+
+    def presigned_url(self, method, key, expires=300, params=None):
+        amz_date = self._now()
+        scope = f"{amz_date[:8]}/{self.region}/s3/aws4_request"
+        query = dict(params or {})
+        query.update({
+            'X-Amz-Algorithm': ALGORITHM,
+            'X-Amz-Credential': f"{self.access_key}/{scope}",
+            'X-Amz-Date': amz_date,
+            'X-Amz-Expires': str(expires),
+            'X-Amz-SignedHeaders': 'host',
+        })
+        path = self.object_path(key)
+        canonical = canonical_request(method, path, query, {'host': self.host}, ['host'], UNSIGNED_PAYLOAD)
+        query['X-Amz-Signature'] = sign(self.secret_key, self.region, amz_date, canonical)
+        return f"{self.endpoint_url}{path}?{canonical_query(query)}"
+
+
+@deconstructible
+class S3Storage(Storage):
+    """Django storage backend on an S3-compatible bucket."""
+    supports_presigned_urls = True
+
+    def __init__(self, endpoint_url=None, bucket=None, access_key=None, secret_key=None,
+                 region='us-east-1', location='', presigned_expiry=300):
+        self.client = S3Client(endpoint_url, bucket, access_key, secret_key, region)
+        self.location = location.strip('/')
+        self.presigned_expiry = presigned_expiry
+
+    def _key(self, name):
+        name = name.replace('\\', '/').lstrip('/')
+        return f"{self.location}/{name}" if self.location else name
+
+    def _head(self, name):
+        response = self.client.request('HEAD', self._key(name))
+        return response if response.status_code == 200 else None
+
+    def _open(self, name, mode='rb'):
+        response = self.client.request('GET', self._key(name), stream=True)
+        tmp = tempfile.SpooledTemporaryFile(max_size=10 * 1024 * 1024)
+        for chunk in response.iter_content(1024 * 1024):
+            tmp.write(chunk)
+        tmp.seek(0)
+        return File(tmp, name=name)
+
+    def _save(self, name, content):
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        # Send the underlying file: a Django File without a name is falsy,
+        # which HTTP clients take for "no body"
+        self.client.request(
+            'PUT', self._key(name), data=getattr(content, 'file', content),
+            extra_headers={'Content-Length': str(content.size)},
+        )
+        return name
+
+    def save_path(self, name, path):
+        """Upload a local file to ``name`` without the Storage.save() name handling."""
+        with open(path, 'rb') as fh:
+            self.client.request('PUT', self._key(name), data=fh)
+
+    def copy(self, source, name):
+        """Copy the object ``source`` to ``name`` inside the bucket, without downloading it."""
+        response = self.client.request('PUT', self._key(name), extra_headers={
+            'x-amz-copy-source': self.client.object_path(self._key(source)),
+        })
+        # A copy can fail after the 200 status line has been sent
+        if b'<Error>' in response.content:
+            raise ObjectStorageError(f"COPY {source} failed: {response.text[:200]}")
+
+    def delete(self, name):
+        self.client.request('DELETE', self._key(name))
+
+    def exists(self, name):
+        return self._head(name) is not None
+
+    def size(self, name):
+        head = self._head(name)
+        if head is None:
+            raise FileNotFoundError(name)
+        return int(head.headers['Content-Length'])
+
+    def get_modified_time(self, name):
+        head = self._head(name)
+        if head is None:
+            raise FileNotFoundError(name)
+        return parsedate_to_datetime(head.headers['Last-Modified'])
+
+    def get_accessed_time(self, name):
+        return self.get_modified_time(name)
+
+    def get_created_time(self, name):
+        return self.get_modified_time(name)
+
+    def url(self, name, filename=None, expires=None):
+        """Presigned GET URL; ``filename`` makes the download an attachment."""
+        params = {}
+        if filename:
+            params['response-content-disposition'] = f'attachment; filename="{filename}"'
+        return self.client.presigned_url('GET', self._key(name), expires or self.presigned_expiry, params)
+
+    def presigned_upload(self, name, expires=None):
+        """Presigned PUT URL that lets a browser upload straight to the bucket."""
+        return self.client.presigned_url('PUT', self._key(name), expires or self.presigned_expiry)
+
+    def listdir(self, path):
+        raise NotImplementedError('S3Storage does not support listing directories.')
@@ -0,0 +1,214 @@
+"""
+Background document processing for uploaded papers.
+
+After a paper file is saved, ``enqueue_paper_processing`` schedules
+``extract_document_info`` in a process pool. The worker only reads the file
+and returns plain data (page count, title metadata, word count and a
+first-page PNG preview); the result is stored on PaperDocumentInfo back in
+the web process, together with flags for the conference's page limit and
+format. Listings read PaperDocumentInfo instead of reopening files.
+
+PaperDocumentInfo rows left ``pending`` (e.g. by a restart) are picked up by
+the ``process_documents`` management command.
+"""
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_executor():
+    """Return the shared process pool, created lazily in each web worker."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.DOCUMENT_PROCESSING_WORKERS)
+    return _executor
+
+
+def enqueue_paper_processing(paper):
+    """Mark a paper's document info pending and process it after commit."""
+    from .models import PaperDocumentInfo
+    PaperDocumentInfo.objects.update_or_create(
+        paper=paper,
+        defaults={'status': 'pending', 'error': '', 'file_name': paper.file.name},
+    )
+    transaction.on_commit(lambda: _submit(paper.pk))
+
+
+def _submit(paper_id):
+    if settings.DOCUMENT_PROCESSING_WORKERS <= 0:
+        process_paper(paper_id)
+        return
+    from .models import Paper
+    paper = Paper.objects.select_related('conference').get(pk=paper_id)
+    path, is_temp = _local_copy(paper.file)
+    future = get_executor().submit(extract_document_info, path, settings.DOCUMENT_PREVIEW_SIZE)
+    future.add_done_callback(lambda f: _store_result(paper_id, paper.file.name, f, path if is_temp else None))
+
+
+def _store_result(paper_id, file_name, future, temp_path=None):
+    # Runs on the executor's callback thread, which needs its own connection
+    close_old_connections()
+    try:
+        from .models import Paper
+        try:
+            paper = Paper.objects.select_related('conference').get(pk=paper_id)
+        except Paper.DoesNotExist:
+            return  # deleted while processing
+        if paper.file.name != file_name:
+            return  # replaced while processing; the newer file has its own job
+        try:
+            info = future.result()
+        except Exception as e:
+            logger.exception('Document processing failed for paper %s', paper_id)
+            info = {'error': str(e)}
+        save_document_info(paper, info)
+    finally:
+        if temp_path:
+            os.remove(temp_path)
+        close_old_connections()
+
+
+def process_paper(paper_id):
+    """Process one paper synchronously in the calling process."""
+    from .models import Paper
+    paper = Paper.objects.select_related('conference').get(pk=paper_id)
+    path, is_temp = _local_copy(paper.file)
+    try:
+        info = extract_document_info(path, settings.DOCUMENT_PREVIEW_SIZE)
+    except Exception as e:
+        logger.exception('Document processing failed for paper %s', paper_id)
+        info = {'error': str(e)}
+    finally:
+        if is_temp:
+            os.remove(path)
+    return save_document_info(paper, info)
+
+
+def _local_copy(field_file):
+    """Return ``(path, is_temp)`` for a file the worker process can open."""
+    try:
+        return field_file.path, False
+    except NotImplementedError:
+        ext = os.path.splitext(field_file.name)[1]
+        fd, path = tempfile.mkstemp(suffix=ext)
+        with os.fdopen(fd, 'wb') as out, field_file.open('rb') as src:
+            shutil.copyfileobj(src, out)
+        return path, True
+
+
+def save_document_info(paper, info):
+    """Store extracted data on the paper's PaperDocumentInfo and flag violations."""
+    from .models import PaperDocumentInfo
+    conference = paper.conference
+    doc, _ = PaperDocumentInfo.objects.get_or_create(paper=paper)
+    doc.file_name = paper.file.name
+    doc.processed_at = timezone.now()
+    if info.get('error'):
+        doc.status = 'failed'
+        doc.error = info['error'][:1000]
+        doc.save()
+        return doc
+    doc.status = 'done'
+    doc.error = ''
+    doc.file_format = info.get('format', '')
+    doc.page_count = info.get('page_count')
+    doc.word_count = info.get('word_count')
+    doc.title = (info.get('title') or '')[:255]
+    doc.exceeds_page_limit = bool(
+        doc.page_count and conference.max_paper_length and doc.page_count > conference.max_paper_length
+    )
+    doc.format_mismatch = bool(doc.file_format and doc.file_format != conference.paper_format)
+    if info.get('preview'):
+        if doc.preview:
+            doc.preview.delete(save=False)
+        doc.preview.save(f"paper_{paper.pk}.png", ContentFile(info['preview']), save=False)
+    doc.save()
+    return doc
+
+
+# Worker side: everything below runs in the pool process and must not touch
+# the database.
+
+def extract_document_info(path, preview_size=300):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.pdf':
+        return _extract_pdf(path, preview_size)
+    if ext == '.docx':
+        return _extract_docx(path)
+    return {'format': ext.lstrip('.')}
+
+
+def _extract_pdf(path, preview_size):
+    info = {'format': 'pdf'}
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        PdfReader = None
+    if PdfReader is not None:
+        reader = PdfReader(path)
+        info['page_count'] = len(reader.pages)
+        info['title'] = (reader.metadata.title if reader.metadata else None) or ''
+        words = 0
+        for page in reader.pages:
+            words += len((page.extract_text() or '').split())
+        info['word_count'] = words
+    else:
+        # Fallback without pypdf: count page objects in the raw file
+        with open(path, 'rb') as fh:
+            data = fh.read()
+        info['page_count'] = len(re.findall(rb'/Type\s*/Page(?!s)', data)) or None
+        match = re.search(rb'/Title\s*\((.*?)\)', data)
+        info['title'] = match.group(1).decode('latin-1', 'ignore') if match else ''
+    info['preview'] = _render_pdf_preview(path, preview_size)
+    return info
+
+
+def _render_pdf_preview(path, size):
+    """Render the first page to PNG with poppler's pdftoppm, if installed."""
+    if not shutil.which('pdftoppm'):
+        return None
+    with tempfile.TemporaryDirectory() as out_dir:
+        prefix = os.path.join(out_dir, 'preview')
+        subprocess.run(
+            ['pdftoppm', '-png', '-f', '1', '-l', '1', '-singlefile',
+             '-scale-to', str(size), path, prefix],
+            check=True, timeout=60, capture_output=True,
+        )
+        with open(prefix + '.png', 'rb') as fh:
+            return fh.read()
+
+
+def _extract_docx(path):
+    ns = {
+        'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+        'ep': 'http://schemas.openxmlformats.org/officeDocument/2006/extended-properties',
+        'dc': 'http://purl.org/dc/elements/1.1/',
+    }
+    info = {'format': 'docx'}
+    with zipfile.ZipFile(path) as docx:
+        names = set(docx.namelist())
+        body = ElementTree.fromstring(docx.read('word/document.xml'))
+        text = ' '.join(node.text or '' for node in body.iter(f"{{{ns['w']}}}t"))
+        info['word_count'] = len(text.split())
+        if 'docProps/app.xml' in names:
+            pages = ElementTree.fromstring(docx.read('docProps/app.xml')).find('ep:Pages', ns)
+            info['page_count'] = int(pages.text) if pages is not None and pages.text else None
+        if 'docProps/core.xml' in names:
+            title = ElementTree.fromstring(docx.read('docProps/core.xml')).find('dc:title', ns)
+            info['title'] = title.text if title is not None and title.text else ''
+    return info
@@ -0,0 +1,51 @@
+"""
+In-process publish/subscribe used to wake long-lived async connections.
+
+Subscribers are asyncio events keyed by an arbitrary key (e.g. a user id);
+``publish`` may be called from any thread and only sets those events, it
+carries no payload. Subscribers re-read whatever changed from the database,
+so a missed wake-up (e.g. a publish from another worker process) only
+delays delivery until the subscriber's next periodic check.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class Broker:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    @contextmanager
+    def subscribe(self, key):
+        """Yield an asyncio.Event that is set whenever ``key`` is published."""
+        event = asyncio.Event()
+        entry = (asyncio.get_running_loop(), event)
+        with self._lock:
+            self._subscribers[key].add(entry)
+        try:
+            yield event
+        finally:
+            with self._lock:
+                self._subscribers[key].discard(entry)
+                if not self._subscribers[key]:
+                    del self._subscribers[key]
+
+    def publish(self, keys):
+        with self._lock:
+            entries = [entry for key in keys for entry in self._subscribers.get(key, ())]
+        for loop, event in entries:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # loop already closed
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(entries) for entries in self._subscribers.values())
+
+
+notification_broker = Broker()
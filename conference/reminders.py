@@ -0,0 +1,100 @@
+"""
+Deadline-driven review reminders.
+
+``send_review_reminders`` (run daily by the scheduler, see conference/jobs.py)
+selects, in one query, every review without a decision whose conference
+``review_deadline`` is within REVIEW_REMINDER_WINDOW_DAYS or already passed,
+skipping reviews reminded in the last REVIEW_REMINDER_INTERVAL_DAYS. Each
+reviewer then gets a single digest listing all of their pending papers,
+the messages go out over one SMTP connection, and every reminded review
+gets a ReviewReminder row (one bulk insert) that throttles the next run.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Exists, OuterRef
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Review, ReviewReminder
+
+logger = logging.getLogger(__name__)
+
+
+def pending_reviews_for_reminder(now=None, conference=None):
+    """Reviews due for a reminder (optionally of one conference), ordered by reviewer and deadline."""
+    now = now or timezone.now()
+    recently_reminded = ReviewReminder.objects.filter(
+        review=OuterRef('pk'),
+        sent_at__gte=now - timedelta(days=settings.REVIEW_REMINDER_INTERVAL_DAYS),
+    )
+    reviews = Review.objects.filter(decision__isnull=True)
+    if conference is not None:
+        reviews = reviews.filter(paper__conference=conference)
+    return reviews.filter(
+        paper__conference__review_deadline__lte=now + timedelta(days=settings.REVIEW_REMINDER_WINDOW_DAYS),
+        paper__conference__review_deadline__gte=now - timedelta(days=settings.REVIEW_REMINDER_MAX_OVERDUE_DAYS),
+    ).exclude(
+        Exists(recently_reminded)
+    ).select_related('reviewer', 'paper', 'paper__conference').order_by(
+        'reviewer_id', 'paper__conference__review_deadline', 'paper_id'
+    )
+
+
+def build_digest(reviewer, reviews, now):
+    """One email listing every pending review of ``reviewer``, grouped by conference."""
+    by_conference = defaultdict(list)
+    for review in reviews:
+        by_conference[review.paper.conference].append(review)
+    sections = []
+    for conference, items in by_conference.items():
+        deadline = conference.review_deadline
+        when = 'overdue since' if deadline < now else 'due'
+        lines = '\n'.join(f"  - {review.paper.title}" for review in items)
+        sections.append(f"{conference.name} - {len(items)} review(s) {when} {timezone.localtime(deadline):%b %d, %Y %H:%M}:\n{lines}")
+    count = len(reviews)
+    body = f"""Dear {reviewer.get_full_name() or reviewer.username},
+
+This is a reminder that you have {count} pending review{'s' if count != 1 else ''}:
+
+{chr(10).join(sections)}
+
+Please log in to your dashboard to complete them: {settings.SITE_URL}{reverse('dashboard:dashboard')}
+
+Best regards,
+PaperSetu"""
+    subject = f"Reminder: {count} pending review{'s' if count != 1 else ''}"
+    return EmailMessage(subject, body, None, [reviewer.email])
+
+
+def send_review_reminders(now=None, conference=None, sent_by=None, dry_run=False):
+    """Send one digest per reviewer with reviews due for a reminder. Returns (emails, reviews)."""
+    now = now or timezone.now()
+    per_reviewer = defaultdict(list)
+    for review in pending_reviews_for_reminder(now, conference):
+        if review.reviewer.email:
+            per_reviewer[review.reviewer].append(review)
+    if dry_run or not per_reviewer:
+        return len(per_reviewer), sum(len(reviews) for reviews in per_reviewer.values())
+
+    reminded = []
+    with get_connection() as connection:
+        for reviewer, reviews in per_reviewer.items():
+            message = build_digest(reviewer, reviews, now)
+            message.connection = connection
+            try:
+                message.send()
+            except Exception:
+                logger.exception('Review reminder to %s failed', reviewer.email)
+                continue
+            reminded.extend(reviews)
+    ReviewReminder.objects.bulk_create([
+        ReviewReminder(review=review, reviewer_id=review.reviewer_id, conference_id=review.paper.conference_id, sent_by=sent_by)
+        for review in reminded
+    ])
+    emails = len({review.reviewer_id for review in reminded})
+    logger.info('Sent %s review reminder digests covering %s reviews', emails, len(reminded))
+    return emails, len(reminded)
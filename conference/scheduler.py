@@ -0,0 +1,181 @@
+"""
+Periodic jobs run by ``manage.py run_scheduler``.
+
+Jobs are plain functions registered in an app's ``jobs`` module:
+
+    @periodic('cleanup_upload_sessions', every=timedelta(hours=1))
+    def cleanup():
+        return f"removed {cleanup_upload_sessions()} sessions"
+
+    @periodic('update_conference_statuses', cron='5 0 * * *')
+    def statuses(): ...
+
+``every`` runs the job at a fixed interval after each run; ``cron`` takes a
+five-field crontab expression (minute hour day month weekday, supporting
+``*``, ``*/n``, ``a-b`` and ``a,b``) in the project time zone. As in cron,
+when both day and weekday are restricted (neither starts with ``*``) a day
+matching either one runs: ``0 9 1 * 1`` is the 1st of the month and every
+Monday. The return value, if any, is stored as the run's summary.
+
+Each job has a ScheduledJob row holding its next run time, its lock and
+runtime metrics. ``run_due_jobs`` claims a due job with a single conditional
+UPDATE, so when several scheduler processes run only one of them gets it;
+the lock expires after ``timeout`` in case a scheduler dies mid-run.
+"""
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+class Cron:
+    """A five-field crontab expression."""
+    RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse(field, low, high) for field, (low, high) in zip(fields, self.RANGES)
+        )
+        # cron ORs day and weekday when both are restricted
+        self.either_day = not fields[2].startswith('*') and not fields[4].startswith('*')
+
+    @staticmethod
+    def _parse(field, low, high):
+        values = set()
+        for part in field.split(','):
+            part, _, step = part.partition('/')
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start, end = (int(v) for v in part.split('-'))
+            else:
+                start = end = int(part)
+            if not low <= start <= end <= high:
+                raise ValueError(f"Cron field {field!r} out of range {low}-{high}")
+            values.update(range(start, end + 1, int(step) if step else 1))
+        return values
+
+    def next_after(self, moment):
+        """Return the first matching minute strictly after ``moment`` (an aware datetime)."""
+        moment = timezone.localtime(moment).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(366 * 24 * 60):
+            if moment.month in self.months and self._day_matches(moment):
+                if moment.hour in self.hours and moment.minute in self.minutes:
+                    return moment
+                moment += timedelta(minutes=1)
+            else:
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+    def _day_matches(self, moment):
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        return day or weekday if self.either_day else day and weekday
+
+
+@dataclass
+class Job:
+    name: str
+    func: object
+    every: timedelta = None
+    cron: Cron = None
+    timeout: timedelta = timedelta(minutes=30)
+
+    def next_run_after(self, moment):
+        if self.cron:
+            return self.cron.next_after(moment)
+        return moment + self.every
+
+
+def periodic(name, every=None, cron=None, timeout=None):
+    """Register the decorated function as periodic job ``name``."""
+    if (every is None) == (cron is None):
+        raise ValueError('Give exactly one of every= or cron=')
+
+    def decorator(func):
+        registry[name] = Job(
+            name=name, func=func, every=every, cron=Cron(cron) if cron else None,
+            timeout=timeout or Job.timeout,
+        )
+        return func
+    return decorator
+
+
+def load_jobs():
+    """Import every installed app's ``jobs`` module and return the registry."""
+    autodiscover_modules('jobs')
+    return registry
+
+
+def node_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def ensure_job_rows(jobs):
+    from .models import ScheduledJob
+    now = timezone.now()
+    existing = set(ScheduledJob.objects.filter(name__in=jobs).values_list('name', flat=True))
+    ScheduledJob.objects.bulk_create([
+        ScheduledJob(name=job.name, next_run_at=job.next_run_after(now) if job.cron else now)
+        for job in jobs.values() if job.name not in existing
+    ], ignore_conflicts=True)
+
+
+def claim(job, node, force=False):
+    """Lock ``job`` for ``node`` if it is due (or ``force``) and unlocked. Returns True on success."""
+    from .models import ScheduledJob
+    now = timezone.now()
+    rows = ScheduledJob.objects.filter(name=job.name).filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+    if not force:
+        rows = rows.filter(next_run_at__lte=now)
+    return rows.update(locked_until=now + job.timeout, locked_by=node, last_started_at=now) == 1
+
+
+def run_job(job, node, force=False):
+    """Run ``job`` if this node can claim it and record the outcome. Returns the ScheduledJob row or None."""
+    from .models import ScheduledJob
+    if not claim(job, node, force=force):
+        return None
+    started = time.monotonic()
+    try:
+        result = job.func()
+        status, summary = 'ok', '' if result is None else str(result)
+    except Exception as exc:
+        logger.exception('Scheduled job %s failed', job.name)
+        status, summary = 'failed', f"{type(exc).__name__}: {exc}"
+    duration = time.monotonic() - started
+    finished = timezone.now()
+    ScheduledJob.objects.filter(name=job.name, locked_by=node).update(
+        next_run_at=job.next_run_after(finished),
+        locked_until=None,
+        locked_by='',
+        last_finished_at=finished,
+        last_duration=duration,
+        last_status=status,
+        last_result=summary[:2000],
+        run_count=F('run_count') + 1,
+        failure_count=F('failure_count') + int(status == 'failed'),
+        total_duration=F('total_duration') + duration,
+    )
+    ScheduledJob.objects.filter(name=job.name, max_duration__lt=duration).update(max_duration=duration)
+    logger.info('Scheduled job %s %s in %.2fs %s', job.name, status, duration, summary)
+    return ScheduledJob.objects.get(name=job.name)
+
+
+def run_due_jobs(jobs, node):
+    """Run every due job once; returns the ScheduledJob rows of the jobs that ran."""
+    return [row for row in (run_job(job, node) for job in jobs.values()) if row is not None]
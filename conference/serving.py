@@ -0,0 +1,97 @@
+"""
+Paper download responses.
+
+Views check permissions and then call ``paper_file_response``. Depending on
+PAPER_DOWNLOAD_MODE the bytes are either streamed by Django or handed to the
+front proxy through an internal-redirect header:
+
+- ``django``: FileResponse streamed by the worker (default).
+- ``x-accel-redirect``: nginx serves PAPER_ACCEL_REDIRECT_LOCATION + name.
+- ``x-sendfile``: Apache/lighttpd serve the absolute file path.
+- ``local``: emits X-Accel-Redirect like nginx, and
+  InternalRedirectMiddleware plays the proxy's part (development and tests).
+
+Every mode sends ETag and Last-Modified, so repeat downloads get a 304.
+
+When the paper storage is object storage (``supports_presigned_urls``) the
+mode is ignored and the response is a redirect to a short-lived presigned
+URL, so the bytes never pass through Django.
+"""
+import mimetypes
+import os
+from urllib.parse import quote, unquote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseRedirect
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date
+
+from .storage import ContentAddressedMixin
+
+
+def paper_file_validators(field_file):
+    """Return ``(etag, last_modified_timestamp)`` for a stored paper file."""
+    storage = field_file.storage
+    name = field_file.name
+    last_modified = int(storage.get_modified_time(name).timestamp())
+    if isinstance(storage, ContentAddressedMixin) and storage.is_blob_name(name):
+        # The content hash is already part of the name
+        etag = '"%s"' % os.path.splitext(os.path.basename(name))[0]
+    else:
+        etag = '"%x-%x"' % (storage.size(name), last_modified)
+    return etag, last_modified
+
+
+def paper_file_response(request, field_file, filename, as_attachment=True):
+    """Build the download response for an already-authorised request."""
+    if getattr(field_file.storage, 'supports_presigned_urls', False):
+        response = HttpResponseRedirect(field_file.storage.url(field_file.name, filename=filename if as_attachment else None))
+        # The signed URL expires, so the redirect itself must not be reused
+        response['Cache-Control'] = 'private, no-store'
+        return response
+    try:
+        etag, last_modified = paper_file_validators(field_file)
+    except FileNotFoundError:
+        raise Http404("Paper file not found.")
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        mode = settings.PAPER_DOWNLOAD_MODE
+        if mode == 'django':
+            response = FileResponse(field_file.open('rb'), as_attachment=as_attachment, filename=filename)
+        else:
+            content_type, _ = mimetypes.guess_type(filename)
+            response = HttpResponse(content_type=content_type or 'application/octet-stream')
+            response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+            if mode == 'x-sendfile':
+                response['X-Sendfile'] = field_file.path
+            else:
+                response['X-Accel-Redirect'] = settings.PAPER_ACCEL_REDIRECT_LOCATION + quote(field_file.name)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+class InternalRedirectMiddleware:
+    """
+    Stand-in for the front proxy in ``local`` mode: resolves X-Accel-Redirect
+    responses by streaming the file from MEDIA_ROOT.
+    """
+    passthrough_headers = ('Content-Disposition', 'ETag', 'Last-Modified', 'Cache-Control')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        target = response.get('X-Accel-Redirect')
+        location = settings.PAPER_ACCEL_REDIRECT_LOCATION
+        if not target or not target.startswith(location):
+            return response
+        path = safe_join(settings.MEDIA_ROOT, unquote(target[len(location):]))
+        served = FileResponse(open(path, 'rb'), content_type=response['Content-Type'])
+        for header in self.passthrough_headers:
+            if header in response:
+                served[header] = response[header]
+        return served
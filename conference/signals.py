@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import bump_conference_version
+from .models import Conference, Paper, Review, Track, UserConferenceRole
+
+
+@receiver([post_save, post_delete], sender=Conference)
+def conference_changed(sender, instance, **kwargs):
+    bump_conference_version(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Paper)
+@receiver([post_save, post_delete], sender=Track)
+@receiver([post_save, post_delete], sender=UserConferenceRole)
+def conference_child_changed(sender, instance, **kwargs):
+    bump_conference_version(instance.conference_id)
+
+
+@receiver([post_save, post_delete], sender=Review)
+def review_changed(sender, instance, **kwargs):
+    if Review._meta.get_field('paper').is_cached(instance):
+        conference_id = instance.paper.conference_id
+    else:
+        conference_id = Paper.objects.filter(pk=instance.paper_id).values_list('conference_id', flat=True).first()
+    bump_conference_version(conference_id)
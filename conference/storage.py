@@ -0,0 +1,184 @@
+"""
+Storage backends for paper files.
+
+ContentAddressedStorage keeps one copy of every distinct file. Uploads are
+hashed (SHA-256) while they are streamed to a temp file and stored under a
+fan-out layout ``papers/ab/cd/<hash><ext>``. A StoredBlob row keeps the
+reference count, so saving a file whose content is already stored only
+bumps the count and deleting releases one reference.
+
+The content addressing lives in ContentAddressedMixin so it works on top of
+the local filesystem (ContentAddressedStorage) and on S3-compatible object
+storage (ContentAddressedS3Storage).
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage, storages
+from django.db import transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+from .object_storage import S3Storage
+
+
+def paper_storage():
+    """Storage used by ``Paper.file``, configured as ``STORAGES['papers']``."""
+    return storages['papers']
+
+
+def blob_name_for(digest, ext='', prefix='papers'):
+    """Return the fan-out storage name for a content hash."""
+    return f"{prefix}/{digest[:2]}/{digest[2:4]}/{digest}{ext.lower()}"
+
+
+class ContentAddressedMixin:
+    """
+    Content addressing for a storage backend. Subclasses provide
+    ``_temp_dir()``, ``_store_blob(name, tmp_path)`` and, for ``adopt()``,
+    ``_copy_blob(source, name)``.
+    """
+    prefix = 'papers'
+
+    def __init__(self, prefix=None, **kwargs):
+        super().__init__(**kwargs)
+        if prefix:
+            self.prefix = prefix.strip('/')
+
+    def get_available_name(self, name, max_length=None):
+        # The incoming name is only used for its extension; the final name
+        # is derived from the content hash in _save().
+        return name
+
+    def is_blob_name(self, name):
+        parts = name.split('/')
+        return (
+            len(parts) == 4 and parts[0] == self.prefix
+            and len(parts[1]) == 2 and len(parts[2]) == 2
+            and parts[3].startswith(parts[1] + parts[2])
+        )
+
+    def _temp_dir(self):
+        return None
+
+    def _save(self, name, content):
+        StoredBlob = apps.get_model('conference', 'StoredBlob')
+        tmp_dir = self._temp_dir()
+        if tmp_dir:
+            os.makedirs(tmp_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+            digest = digest.hexdigest()
+            ext = os.path.splitext(name)[1]
+            with transaction.atomic():
+                blob, created = StoredBlob.objects.select_for_update().get_or_create(
+                    sha256=digest,
+                    defaults={'name': blob_name_for(digest, ext, self.prefix), 'size': size, 'ref_count': 1},
+                )
+                if not created:
+                    StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+                if created or not self.exists(blob.name):
+                    self._store_blob(blob.name, tmp_path)
+            return blob.name
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _digest(self, name):
+        """Return ``(sha256 hex digest, size)`` of a stored file."""
+        digest = hashlib.sha256()
+        size = 0
+        with self.open(name, 'rb') as fh:
+            for chunk in fh.chunks():
+                digest.update(chunk)
+                size += len(chunk)
+        return digest.hexdigest(), size
+
+    def adopt(self, name):
+        """
+        Turn a file already in this storage under a plain name (a direct
+        upload) into a reference to its content-addressed blob and return
+        the blob name. The original is deleted once the transaction commits.
+        """
+        StoredBlob = apps.get_model('conference', 'StoredBlob')
+        digest, size = self._digest(name)
+        ext = os.path.splitext(name)[1]
+        with transaction.atomic():
+            blob, created = StoredBlob.objects.select_for_update().get_or_create(
+                sha256=digest,
+                defaults={'name': blob_name_for(digest, ext, self.prefix), 'size': size, 'ref_count': 1},
+            )
+            if not created:
+                StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+            if created or not self.exists(blob.name):
+                self._copy_blob(name, blob.name)
+            transaction.on_commit(lambda: self.delete(name))
+        return blob.name
+
+    def delete(self, name):
+        """Release one reference; the file is removed with the last one."""
+        if not name:
+            raise ValueError('The name must be given to delete().')
+        if not self.is_blob_name(name):
+            return super().delete(name)
+        StoredBlob = apps.get_model('conference', 'StoredBlob')
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None:
+                return super().delete(name)
+            if blob.ref_count > 1:
+                StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') - 1)
+                return
+            blob.delete()
+            remove = super().delete
+            transaction.on_commit(lambda: remove(name))
+
+
+@deconstructible
+class ContentAddressedStorage(ContentAddressedMixin, FileSystemStorage):
+
+    def _temp_dir(self):
+        # Same filesystem as the blobs, so the final move is an atomic rename
+        return self.path('tmp')
+
+    def _store_blob(self, name, tmp_path):
+        target = self.path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if self.file_permissions_mode is not None:
+            os.chmod(tmp_path, self.file_permissions_mode)
+        os.replace(tmp_path, target)
+
+    def _copy_blob(self, source, name):
+        target = self.path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(self.path(source), target)
+
+
+@deconstructible
+class ContentAddressedS3Storage(ContentAddressedMixin, S3Storage):
+
+    def _store_blob(self, name, tmp_path):
+        self.save_path(name, tmp_path)
+
+    def _digest(self, name):
+        # Stream the object through the hash instead of spooling it to disk
+        digest = hashlib.sha256()
+        size = 0
+        response = self.client.request('GET', self._key(name), stream=True)
+        for chunk in response.iter_content(1024 * 1024):
+            digest.update(chunk)
+            size += len(chunk)
+        return digest.hexdigest(), size
+
+    def _copy_blob(self, source, name):
+        self.copy(source, name)
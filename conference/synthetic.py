@@ -0,0 +1,164 @@
+"""
+Synthetic conference data for benchmarks (``manage.py bench``, ``check_query_budget``).
+
+``seed_conference`` creates one approved conference with a chair, PC
+members, authors, papers (each with co-authors and a shared small PDF),
+reviews, review/PC/subreviewer invites and the statistics feature enabled,
+using one ``bulk_create`` per table. The PDF's blob holds one reference per
+paper, so deleting the papers releases it exactly. Callers run it inside a
+transaction they roll back; ``release_paper_file`` then removes the shared
+PDF if the rollback dropped its StoredBlob row. ``isolated_caches`` gives a
+benchmark private caches it can clear freely.
+"""
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.db.models import F
+from django.test import override_settings
+from django.utils import timezone
+
+from .models import (
+    Author, Conference, ConferenceFeatureToggle, Paper, PCInvite, Review, ReviewInvite,
+    StoredBlob, SubreviewerInvite, UserConferenceRole,
+)
+from .storage import paper_storage
+
+PAPER_PDF = b"""%PDF-1.4
+1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj
+2 0 obj << /Type /Pages /Kids [3 0 R] /Count 1 >> endobj
+3 0 obj << /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >> endobj
+trailer << /Root 1 0 R >>
+%%EOF
+"""
+
+
+@dataclass
+class Scale:
+    papers: int = 200
+    pc_members: int = 30
+    reviews_per_paper: int = 3
+    coauthors_per_paper: int = 2
+    invites: int = 50
+
+
+SCALES = {
+    'small': Scale(papers=20, pc_members=5, reviews_per_paper=2, coauthors_per_paper=1, invites=5),
+    'medium': Scale(),
+    'large': Scale(papers=2000, pc_members=150, reviews_per_paper=3, coauthors_per_paper=3, invites=300),
+}
+
+
+@dataclass
+class SeededConference:
+    conference: Conference
+    chair: object
+    pc_members: list
+    authors: list
+    paper_file: str
+
+
+def seed_conference(scale, label='bench'):
+    """Create one synthetic conference of the given ``Scale``."""
+    User = get_user_model()
+    token = uuid.uuid4().hex[:8]
+    now = timezone.now()
+    password = make_password(None)
+
+    def users(kind, count):
+        return User.objects.bulk_create([
+            User(
+                username=f'{label}-{token}-{kind}{i}', email=f'{kind}{i}.{token}@{label}.example',
+                first_name=kind.title(), last_name=str(i), password=password, is_active=True, is_verified=True,
+            )
+            for i in range(count)
+        ])
+
+    chair, = users('chair', 1)
+    pc_members = users('pc', scale.pc_members)
+    authors = users('author', max(1, scale.papers // 2))
+    conference = Conference.objects.create(
+        name=f'{label.title()} Conference {token}', acronym=f'B{token[:4].upper()}', chair=chair,
+        start_date=(now + timedelta(days=90)).date(), end_date=(now + timedelta(days=92)).date(),
+        is_approved=True, status='live', description='Synthetic conference',
+        paper_submission_deadline=(now + timedelta(days=30)).date(), review_deadline=now + timedelta(days=60),
+    )
+    ConferenceFeatureToggle.objects.update_or_create(conference=conference, feature='statistics', defaults={'enabled': True})
+    UserConferenceRole.objects.bulk_create(
+        [UserConferenceRole(user=chair, conference=conference, role='chair')]
+        + [UserConferenceRole(user=user, conference=conference, role='pc_member') for user in pc_members]
+        + [UserConferenceRole(user=user, conference=conference, role='author') for user in authors]
+    )
+
+    paper_file = paper_storage().save('papers/bench.pdf', ContentFile(PAPER_PDF))
+    statuses = ['submitted', 'under_review', 'pending', 'accepted', 'rejected']
+    papers = Paper.objects.bulk_create([
+        Paper(
+            title=f'Synthetic paper {i} on scalable reviewing', abstract='Lorem ipsum dolor sit amet. ' * 20,
+            file=paper_file, original_filename='paper.pdf', author=authors[i % len(authors)],
+            conference=conference, paper_id=f'{conference.acronym}{token[4:]}{i:05d}',
+            status=statuses[i % len(statuses)], keywords='benchmarks, synthetic data',
+        )
+        for i in range(scale.papers)
+    ])
+    # save() took one reference and bulk_create() takes none; every paper
+    # releases one when it is deleted.
+    StoredBlob.objects.filter(name=paper_file).update(ref_count=F('ref_count') + len(papers) - 1)
+    Author.objects.bulk_create([
+        Author(
+            paper=paper, first_name='Co', last_name=f'Author {j}', email=f'co{paper.pk}.{j}.{token}@{label}.example',
+            country_region='India', affiliation='Synthetic University', is_corresponding=(j == 0),
+        )
+        for paper in papers for j in range(scale.coauthors_per_paper)
+    ])
+    if pc_members:
+        Review.objects.bulk_create([
+            Review(
+                paper=paper, reviewer=pc_members[(i + j) % len(pc_members)],
+                decision=('accept', 'reject', None)[(i + j) % 3], rating=(i + j) % 5 + 1, confidence=(i * j) % 5 + 1,
+                comments='Synthetic review comments. ' * 10,
+            )
+            for i, paper in enumerate(papers) for j in range(min(scale.reviews_per_paper, len(pc_members)))
+        ])
+        ReviewInvite.objects.bulk_create([
+            ReviewInvite(conference=conference, reviewer=pc_members[i % len(pc_members)], status=('pending', 'accepted')[i % 2])
+            for i in range(min(scale.invites, len(pc_members)))
+        ])
+        SubreviewerInvite.objects.bulk_create([
+            SubreviewerInvite(
+                paper=papers[i % len(papers)], subreviewer=pc_members[i % len(pc_members)], invited_by=chair,
+                email=pc_members[i % len(pc_members)].email, token=uuid.uuid4().hex, status=('invited', 'accepted')[i % 2],
+            )
+            for i in range(scale.invites if papers else 0)
+        ])
+    PCInvite.objects.bulk_create([
+        PCInvite(
+            conference=conference, email=f'invitee{i}.{token}@{label}.example', name=f'Invitee {i}',
+            invited_by=chair, token=uuid.uuid4().hex,
+        )
+        for i in range(scale.invites)
+    ])
+    return SeededConference(conference, chair, pc_members, authors, paper_file)
+
+
+def release_paper_file(name):
+    """After the seeding transaction is rolled back, delete the shared PDF unless real papers use it."""
+    if name and not StoredBlob.objects.filter(name=name).exists():
+        paper_storage().delete(name)
+
+
+def isolated_caches():
+    """
+    override_settings() replacing every cache alias with one private locmem
+    cache, so clearing it never touches the deployment's shared cache
+    (rate-limit buckets, counters, cached sessions).
+    """
+    location = f"benchmark-{uuid.uuid4().hex}"
+    return override_settings(CACHES={
+        alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': location}
+        for alias in settings.CACHES
+    })
@@ -15,6 +15,14 @@ def has_conference_role(user, args):
     except Exception:
         return False
 
+@register.simple_tag
+def unread_notification_count(user):
+    """Unread notifications for the nav badge, served from the cached counter."""
+    if not user.is_authenticated:
+        return 0
+    from conference.notifications import unread_count
+    return unread_count(user)
+
 @register.filter
 def get_item(dictionary, key):
     """Get item from dictionary by key"""
@@ -0,0 +1,198 @@
+"""
+Resumable chunked uploads for paper files.
+
+A client opens an UploadSession, then sends fixed-size chunks, each with its
+byte offset and SHA-256 checksum. Chunks are appended to a temp file and the
+confirmed offset is stored on the session, so an interrupted upload resumes
+from ``received_bytes``. Once every byte has arrived the session is attached
+to a Paper with ``finalize_upload``.
+
+When papers live in object storage, ``start_direct_upload`` instead hands
+the browser a presigned PUT URL under ``incoming/<conference>/<user>/`` and
+the submission form refers to the uploaded object by name. On submit the
+object is hashed and copied server-side into its content-addressed blob
+(``ContentAddressedMixin.adopt``) and the incoming object is deleted, so
+``incoming/`` only ever holds uploads that were never submitted.
+"""
+import hashlib
+import logging
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .models import UploadSession
+from .storage import paper_storage
+
+logger = logging.getLogger(__name__)
+
+
+class UploadError(Exception):
+    """Raised when a chunk or finalisation request cannot be accepted."""
+
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def temp_path(session):
+    """Return the path of the partial file backing an upload session."""
+    return os.path.join(settings.PAPER_UPLOAD_TMP_DIR, f"{session.id}.part")
+
+
+def start_upload(user, conference, filename, total_size, sha256=''):
+    """Create an upload session and its empty temp file."""
+    if total_size <= 0:
+        raise UploadError('File is empty.')
+    if total_size > settings.PAPER_UPLOAD_MAX_SIZE:
+        raise UploadError('File is larger than the allowed upload size.', status=413)
+    session = UploadSession.objects.create(
+        user=user,
+        conference=conference,
+        filename=os.path.basename(filename)[:255] or 'paper',
+        total_size=total_size,
+        chunk_size=settings.PAPER_UPLOAD_CHUNK_SIZE,
+        sha256=(sha256 or '').lower(),
+    )
+    os.makedirs(settings.PAPER_UPLOAD_TMP_DIR, exist_ok=True)
+    open(temp_path(session), 'wb').close()
+    return session
+
+
+def append_chunk(session_id, user, offset, data, checksum):
+    """
+    Append one chunk at ``offset`` and return the new confirmed offset.
+
+    Re-sending a chunk that was already confirmed is a no-op, so clients can
+    safely retry after a dropped response.
+    """
+    with transaction.atomic():
+        try:
+            session = UploadSession.objects.select_for_update().get(id=session_id, user=user)
+        except UploadSession.DoesNotExist:
+            raise UploadError('Upload session not found.', status=404)
+        if session.status != 'active':
+            raise UploadError('Upload session is no longer active.', status=410)
+        end = offset + len(data)
+        if offset < session.received_bytes and end <= session.received_bytes:
+            return session.received_bytes
+        if offset != session.received_bytes:
+            raise UploadError('Unexpected chunk offset.', status=409, offset=session.received_bytes)
+        if not data or len(data) > session.chunk_size or end > session.total_size:
+            raise UploadError('Invalid chunk size.')
+        if hashlib.sha256(data).hexdigest() != (checksum or '').lower():
+            raise UploadError('Chunk checksum mismatch.', offset=session.received_bytes)
+
+        with open(temp_path(session), 'r+b') as fh:
+            fh.seek(offset)
+            fh.write(data)
+            fh.truncate()
+            fh.flush()
+            os.fsync(fh.fileno())
+        session.received_bytes = end
+        session.save(update_fields=['received_bytes', 'updated_at'])
+        return end
+
+
+def get_finalizable_session(session_id, user, conference):
+    """Return a fully received session owned by ``user`` or raise UploadError."""
+    try:
+        session = UploadSession.objects.get(id=session_id, user=user, conference=conference)
+    except UploadSession.DoesNotExist:
+        raise UploadError('Upload session not found.', status=404)
+    if session.status != 'active':
+        raise UploadError('Upload session is no longer active.', status=410)
+    if not session.is_complete:
+        raise UploadError('Upload is not complete yet.', status=409, offset=session.received_bytes)
+    return session
+
+
+def finalize_upload(session, paper):
+    """
+    Attach the uploaded temp file to ``paper`` and save it.
+
+    The paper row and the session state change commit together; the temp file
+    is only removed once the transaction has committed.
+    """
+    path = temp_path(session)
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if session.status != 'active' or not session.is_complete:
+            raise UploadError('Upload session cannot be finalised.', status=409)
+        if session.sha256:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as fh:
+                for block in iter(lambda: fh.read(1024 * 1024), b''):
+                    digest.update(block)
+            if digest.hexdigest() != session.sha256:
+                raise UploadError('File checksum mismatch.')
+        paper.original_filename = session.filename
+        with open(path, 'rb') as fh:
+            paper.file.save(session.filename, File(fh), save=True)
+        session.paper = paper
+        session.status = 'completed'
+        session.save(update_fields=['paper', 'status', 'updated_at'])
+        transaction.on_commit(lambda: _remove_temp_file(path))
+    return paper
+
+
+def direct_upload_prefix(user, conference):
+    return f"incoming/{conference.pk}/{user.pk}/"
+
+
+def start_direct_upload(user, conference, filename, total_size):
+    """Return ``(name, url)`` for uploading a paper straight to object storage."""
+    storage = paper_storage()
+    if not getattr(storage, 'supports_presigned_urls', False):
+        raise UploadError('Direct uploads are not available.', status=404)
+    if total_size <= 0:
+        raise UploadError('File is empty.')
+    if total_size > settings.PAPER_UPLOAD_MAX_SIZE:
+        raise UploadError('File is larger than the allowed upload size.', status=413)
+    filename = os.path.basename(filename)[:200] or 'paper'
+    name = f"{direct_upload_prefix(user, conference)}{uuid.uuid4().hex}/{filename}"
+    return name, storage.presigned_upload(name)
+
+
+def get_direct_upload(name, user, conference):
+    """Validate an object uploaded with ``start_direct_upload`` and return its name."""
+    storage = paper_storage()
+    if not name.startswith(direct_upload_prefix(user, conference)) or '..' in name.split('/'):
+        raise UploadError('Upload not found.', status=404)
+    try:
+        size = storage.size(name)
+    except FileNotFoundError:
+        raise UploadError('Upload not found.', status=404)
+    if size > settings.PAPER_UPLOAD_MAX_SIZE:
+        storage.delete(name)
+        raise UploadError('File is larger than the allowed upload size.', status=413)
+    return name
+
+
+def _remove_temp_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def cleanup_upload_sessions(max_age=None):
+    """
+    Delete upload sessions untouched for ``max_age`` seconds together with
+    their temp files. Returns the number of sessions removed.
+    """
+    max_age = max_age if max_age is not None else settings.PAPER_UPLOAD_SESSION_TTL
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    stale_ids = list(UploadSession.objects.filter(updated_at__lt=cutoff).values_list('id', flat=True))
+    for session_id in stale_ids:
+        _remove_temp_file(os.path.join(settings.PAPER_UPLOAD_TMP_DIR, f"{session_id}.part"))
+    UploadSession.objects.filter(id__in=stale_ids).delete()
+    removed = len(stale_ids)
+    if removed:
+        logger.info('Removed %s upload sessions', removed)
+    return removed
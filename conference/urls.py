@@ -14,6 +14,11 @@ urlpatterns = [
     path('<int:conference_id>/author/', views.author_dashboard, name='author_dashboard'),
     path('<int:conference_id>/subreviewer/', views.subreviewer_dashboard, name='subreviewer_dashboard'),
     path('paper/<int:paper_id>/download/', views.download_paper, name='download_paper'),
+    path('paper/<int:paper_id>/preview/', views.paper_preview, name='paper_preview'),
+    path('<int:conference_id>/uploads/', views.upload_start, name='upload_start'),
+    path('<int:conference_id>/uploads/direct/', views.upload_direct_start, name='upload_direct_start'),
+    path('uploads/<uuid:upload_id>/', views.upload_status, name='upload_status'),
+    path('uploads/<uuid:upload_id>/chunk/', views.upload_chunk, name='upload_chunk'),
     path('author/<int:conference_id>/papers/', views.author_papers_view, name='author_papers'),
     path('search/', views.search_conferences, name='search_conferences'),
     path('browse/', views.browse_conferences, name='browse_conferences'),
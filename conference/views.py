@@ -16,24 +16,37 @@ from django import forms
 from conference.models import Review
 from django.core.mail import EmailMessage
 from django.conf import settings
-from .models import Author
+from .models import Author, UploadSession
+from .uploads import UploadError, start_upload, append_chunk, finalize_upload, start_direct_upload
+from .chair_emails import send_chair_email
+from .serving import paper_file_response
+from .storage import paper_storage
+from .processing import enqueue_paper_processing
+from django.views.decorators.http import require_POST
 
-import stripe
 from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
 from django.shortcuts import get_object_or_404, render
 from django.http import JsonResponse
 from .models import Paper
-from django.db import models
+from django.db import models, transaction
+import logging
 
-stripe.api_key = settings.STRIPE_SECRET_KEY
+logger = logging.getLogger(__name__)
+
+
+def get_stripe():
+    """The stripe module, configured with STRIPE_SECRET_KEY. Imported on first use, not at startup."""
+    import stripe
+    stripe.api_key = settings.STRIPE_SECRET_KEY
+    return stripe
 
 @csrf_exempt
 def create_checkout_session(request, paper_id):
     paper = get_object_or_404(Paper, id=paper_id)
     if paper.is_paid or paper.status != 'accepted':
         return JsonResponse({'error': 'Payment not allowed.'}, status=400)
-    session = stripe.checkout.Session.create(
+    session = get_stripe().checkout.Session.create(
         payment_method_types=['card'],
         line_items=[{
             'price_data': {
@@ -86,11 +99,9 @@ You can view and manage this submission through your conference dashboard.
 Best regards,
 PaperSetu Team"""
 
-            send_mail(
-                subject=chair_subject,
-                message=chair_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[conference.chair.email],
+            send_chair_email(
+                conference, conference.chair, 'submission', chair_subject, chair_message,
+                summary=f"New submission: {paper.title} ({corresponding_author.first_name} {corresponding_author.last_name})",
                 fail_silently=True,
             )
 
@@ -122,9 +133,9 @@ Best regards,
                 fail_silently=True,
             )
 
-    except Exception as e:
+    except Exception:
         # Log the error but don't break the submission process
-        print(f"Error sending paper submission emails: {e}")
+        logger.exception('Error sending paper submission emails for paper %s', paper.id)
 
 def send_payment_request_email(author_email, paper):
     subject = "Your paper has been accepted! Please pay the conference fee"
@@ -245,17 +256,102 @@ def reviewer_volunteer(request):
         form = ReviewerVolunteerForm()
     return render(request, 'conference/reviewer_volunteer.html', {'form': form})
 
+def save_submitted_paper(paper, form):
+    """Save a new paper, attaching a chunked or direct upload if one was used."""
+    upload_session = form.cleaned_data.get('upload_session')
+    direct_upload = form.cleaned_data.get('direct_upload')
+    if upload_session:
+        finalize_upload(upload_session, paper)
+    elif direct_upload:
+        # Move the object out of incoming/ into its content-addressed blob,
+        # so the bucket's incoming/ expiry never touches submitted papers.
+        with transaction.atomic():
+            paper.file.name = paper.file.storage.adopt(direct_upload)
+            paper.original_filename = os.path.basename(direct_upload)
+            paper.save()
+    else:
+        paper.save()
+    enqueue_paper_processing(paper)
+
+@login_required
+@require_POST
+def upload_start(request, conference_id):
+    """Open a resumable upload session for a paper file."""
+    conference = get_object_or_404(Conference, id=conference_id)
+    try:
+        total_size = int(request.POST.get('size', 0))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid file size.'}, status=400)
+    try:
+        session = start_upload(
+            request.user, conference,
+            request.POST.get('filename', ''), total_size,
+            sha256=request.POST.get('sha256', ''),
+        )
+    except UploadError as e:
+        return JsonResponse({'error': str(e)}, status=e.status)
+    return JsonResponse({
+        'upload_id': str(session.id),
+        'chunk_size': session.chunk_size,
+        'offset': session.received_bytes,
+    })
+
+@login_required
+@require_POST
+def upload_direct_start(request, conference_id):
+    """Return a presigned URL for uploading a paper file straight to object storage."""
+    conference = get_object_or_404(Conference, id=conference_id)
+    try:
+        total_size = int(request.POST.get('size', 0))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid file size.'}, status=400)
+    try:
+        name, url = start_direct_upload(request.user, conference, request.POST.get('filename', ''), total_size)
+    except UploadError as e:
+        return JsonResponse({'error': str(e)}, status=e.status)
+    return JsonResponse({'name': name, 'url': url})
+
+@login_required
+@require_POST
+def upload_chunk(request, upload_id):
+    """
+    Append one chunk to an upload session. The raw request body is the chunk;
+    its offset and SHA-256 are sent in the X-Upload-Offset and X-Chunk-SHA256
+    headers.
+    """
+    try:
+        offset = int(request.headers.get('X-Upload-Offset', ''))
+    except ValueError:
+        return JsonResponse({'error': 'Missing chunk offset.'}, status=400)
+    try:
+        received = append_chunk(upload_id, request.user, offset, request.body, request.headers.get('X-Chunk-SHA256'))
+    except UploadError as e:
+        return JsonResponse({'error': str(e), 'offset': e.offset}, status=e.status)
+    return JsonResponse({'offset': received})
+
+@login_required
+def upload_status(request, upload_id):
+    """Report the last confirmed offset so an interrupted upload can resume."""
+    session = get_object_or_404(UploadSession, id=upload_id, user=request.user)
+    return JsonResponse({
+        'upload_id': str(session.id),
+        'offset': session.received_bytes,
+        'total_size': session.total_size,
+        'chunk_size': session.chunk_size,
+        'status': session.status,
+    })
+
 @login_required
 def submit_paper(request, conference_id):
     conference = get_object_or_404(Conference, id=conference_id)
     if request.method == 'POST':
-        form = PaperSubmissionForm(request.POST, request.FILES, conference=conference)
+        form = PaperSubmissionForm(request.POST, request.FILES, conference=conference, user=request.user)
         if form.is_valid():
             paper = form.save(commit=False)
             paper.author = request.user
             paper.conference = conference
             paper.submitted_at = timezone.now() # Add submitted_at field
-            paper.save()
+            save_submitted_paper(paper, form)
             UserConferenceRole.objects.get_or_create(user=request.user, conference=conference, role='author')
             # Get corresponding author
             corresponding_author = Author.objects.filter(paper=paper, is_corresponding=True).first()
@@ -440,7 +536,7 @@ def author_dashboard(request, conference_id):
     )
     message = ''
     if request.method == 'POST':
-        paper_form = PaperSubmissionForm(request.POST, request.FILES, conference=conference)
+        paper_form = PaperSubmissionForm(request.POST, request.FILES, conference=conference, user=user)
         authors_data = request.POST.getlist('authors_json')
         import json
         authors = json.loads(authors_data[0]) if authors_data else []
@@ -449,7 +545,7 @@ def author_dashboard(request, conference_id):
             paper.author = user
             paper.conference = conference
             paper.submitted_at = timezone.now() # Add submitted_at field
-            paper.save()
+            save_submitted_paper(paper, paper_form)
             # Save authors
             corresponding_found = False
             for idx, author in enumerate(authors):
@@ -488,6 +584,7 @@ def author_dashboard(request, conference_id):
         'papers': papers,
         'message': message,
         'paper_form': paper_form,
+        'direct_uploads': getattr(paper_storage(), 'supports_presigned_urls', False),
     }
     return render(request, 'conference/author_dashboard.html', context)
 
@@ -582,7 +679,10 @@ def subreviewer_answer_request(request, invite_id):
             assigner = invite.invited_by
             subject = f"Subreviewer Response for '{invite.paper.title}'"
             message = f"{request.user.get_full_name() or request.user.username} has {decision} the request to review the paper '{invite.paper.title}' for {invite.paper.conference.name}."
-            send_mail(subject, message, None, [assigner.email])
+            send_chair_email(
+                invite.paper.conference, assigner, 'subreviewer_response', subject, message,
+                summary=f"{request.user.get_full_name() or request.user.username} {decision} to review {invite.paper.title}",
+            )
             if decision == 'accepted':
                 # Redirect to review form (to be implemented)
                 return redirect('conference:subreviewer_review_form', invite_id=invite.id)
@@ -623,21 +723,23 @@ def subreviewer_review_form(request, invite_id):
             )
             
             # Send notification to chair about new subreviewer review
-            from conference.models import Notification
-            Notification.objects.create(
-                recipient=invite.paper.conference.chair,
+            from conference.notifications import notify
+            notify(
+                [invite.paper.conference.chair],
                 notification_type='paper_review',
                 title=f'New Subreviewer Review for "{invite.paper.title}"',
                 message=f'Subreviewer {request.user.get_full_name() or request.user.username} has submitted a review with {recommendation} recommendation for paper "{invite.paper.title}".',
                 related_paper=invite.paper,
                 related_conference=invite.paper.conference
             )
-            # Send real email to chair
-            chair_email = invite.paper.conference.chair.email
-            if chair_email:
-                subject = f"New Subreviewer Review Submitted - {invite.paper.conference.name}"
-                body = f"Dear {invite.paper.conference.chair.get_full_name() or invite.paper.conference.chair.username},\n\nA new subreviewer review has been submitted for the paper '{invite.paper.title}' by {request.user.get_full_name() or request.user.username}.\n\nPlease log in to your dashboard to view the review.\n\nBest regards,\n{invite.paper.conference.name} System"
-                send_mail(subject, body, None, [chair_email])
+            # Send real email to chair (or add it to their digest)
+            chair = invite.paper.conference.chair
+            subject = f"New Subreviewer Review Submitted - {invite.paper.conference.name}"
+            body = f"Dear {chair.get_full_name() or chair.username},\n\nA new subreviewer review has been submitted for the paper '{invite.paper.title}' by {request.user.get_full_name() or request.user.username}.\n\nPlease log in to your dashboard to view the review.\n\nBest regards,\n{invite.paper.conference.name} System"
+            send_chair_email(
+                invite.paper.conference, chair, 'subreviewer_review', subject, body,
+                summary=f"{request.user.get_full_name() or request.user.username} reviewed {invite.paper.title} ({recommendation})",
+            )
             
             return redirect('conference:subreviewer_dashboard', conference_id=invite.paper.conference.id)
     else:
@@ -657,8 +759,26 @@ def download_paper(request, paper_id):
         raise Http404("You do not have permission to download this paper.")
     if not paper.file:
         raise Http404("Paper file not found.")
-    response = FileResponse(paper.file.open('rb'), as_attachment=True, filename=os.path.basename(paper.file.name))
-    return response
+    return paper_file_response(request, paper.file, paper.original_filename or os.path.basename(paper.file.name))
+
+@login_required
+def paper_preview(request, paper_id):
+    from conference.models import PaperDocumentInfo, SubreviewerInvite
+    paper = get_object_or_404(Paper.objects.select_related('conference'), id=paper_id)
+    user = request.user
+    # Whoever may download the paper, plus the PC members who see it in the submissions listing
+    is_author = paper.author_id == user.id
+    is_chair = paper.conference.chair_id == user.id
+    is_pc_member = UserConferenceRole.objects.filter(
+        user=user, conference=paper.conference, role='pc_member',
+    ).filter(Q(track__isnull=True) | Q(track_id=paper.track_id)).exists()
+    is_accepted_subreviewer = SubreviewerInvite.objects.filter(paper=paper, subreviewer=user, status='accepted').exists()
+    if not (is_author or is_chair or is_pc_member or is_accepted_subreviewer):
+        raise Http404("You do not have permission to view this paper.")
+    doc = PaperDocumentInfo.objects.filter(paper=paper).first()
+    if doc is None or not doc.preview:
+        raise Http404("Preview not found.")
+    return paper_file_response(request, doc.preview, f"paper_{paper.pk}.png", as_attachment=False)
 
 nav_items = [
     "Submissions", "Reviews", "Status", "PC", "Events",
@@ -678,7 +798,7 @@ def stripe_webhook(request):
     endpoint_secret = os.environ.get('STRIPE_WEBHOOK_SECRET')
     event = None
     try:
-        event = stripe.Webhook.construct_event(
+        event = get_stripe().Webhook.construct_event(
             payload, sig_header, endpoint_secret
         )
     except Exception:
@@ -0,0 +1,103 @@
+"""
+Read-replica routing.
+
+With a ``replica`` database configured (DATABASE_REPLICA_URL), views
+decorated with ``use_replica`` (exports, statistics, large listings) run
+their reads on the replica; every write and every other view stays on the
+primary. A replica lags the primary, so a client that has just written
+reads from the primary for READ_REPLICA_STICKY_SECONDS: ``ReplicaPinMiddleware``
+sets a short-lived cookie on the response of any request that wrote, and
+``use_replica`` skips the replica while it is present. Reads inside
+``transaction.atomic()`` always use the primary.
+"""
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA = 'replica'
+PIN_COOKIE = 'replica_pin'
+
+# Apps whose rows must never be read stale: a session created on login may
+# not have reached the replica yet.
+PRIMARY_ONLY_APPS = {'sessions'}
+
+# True while a use_replica view runs
+reading_from_replica = ContextVar('reading_from_replica', default=False)
+# The current request's RequestWrites, set by ReplicaPinMiddleware
+current_writes = ContextVar('current_writes', default=None)
+
+
+class RequestWrites:
+    """Whether the current request has written to the primary (shared across sync_to_async threads)."""
+
+    def __init__(self):
+        self.wrote = False
+
+
+def replica_available():
+    return REPLICA in connections.settings
+
+
+def is_pinned(request):
+    """True if this client wrote within the last READ_REPLICA_STICKY_SECONDS."""
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def pin_response(response):
+    """Keep the client on the primary for READ_REPLICA_STICKY_SECONDS."""
+    seconds = settings.READ_REPLICA_STICKY_SECONDS
+    response.set_cookie(PIN_COOKIE, str(int(time.time() + seconds)), max_age=seconds, httponly=True, samesite='Lax')
+
+
+def use_replica(view):
+    """Run the view's reads on the read replica unless this client wrote recently."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not replica_available() or is_pinned(request):
+            return view(request, *args, **kwargs)
+        # Permissions depend on the user: load it (and the session) from the
+        # primary before switching.
+        user = getattr(request, 'user', None)
+        if user is not None:
+            user.is_authenticated
+        token = reading_from_replica.set(True)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            reading_from_replica.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    """Reads go to the replica inside use_replica views; writes and migrations only to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if (
+            reading_from_replica.get()
+            and model._meta.app_label not in PRIMARY_ONLY_APPS
+            and replica_available()
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return REPLICA
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Explicit, so an instance read from the replica is saved to the primary.
+        writes = current_writes.get()
+        if writes is not None:
+            writes.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both databases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica copies the primary's schema.
+        return db != REPLICA
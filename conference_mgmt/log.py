@@ -0,0 +1,147 @@
+"""
+Structured, non-blocking logging.
+
+``QueuedRotatingFileHandler`` is a QueueHandler: the logging call only puts
+the record on an in-memory queue, and a QueueListener thread writes it to a
+size-rotated file as one JSON object per line (``JsonFormatter``). Records
+logged during a request carry its ``request_id`` and the ``elapsed_ms``
+since it started; ``RequestLogMiddleware`` sets both and logs one line per
+request with its status and ``duration_ms``.
+"""
+import json
+import logging
+import os
+import queue
+import time
+import traceback
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# (request_id, perf_counter at request start) while a request is handled
+current_request = ContextVar('current_request', default=None)
+
+# Attributes every LogRecord has; anything else was passed in ``extra``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def request_fields():
+    """The request_id and elapsed_ms of the current request, or {}."""
+    state = current_request.get()
+    if state is None:
+        return {}
+    request_id, started = state
+    return {'request_id': request_id, 'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, request fields and extras."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'process': record.process,
+            'thread': record.thread,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = ''.join(traceback.format_exception(*record.exc_info))
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class ReopeningRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that reopens its file when another process has
+    rotated it away, so every worker keeps writing to the current file.
+    """
+
+    def emit(self, record):
+        if self.stream is not None:
+            try:
+                current = os.stat(self.baseFilename)
+                opened = os.fstat(self.stream.fileno())
+                moved = (current.st_dev, current.st_ino) != (opened.st_dev, opened.st_ino)
+            except FileNotFoundError:
+                moved = True
+            if moved:
+                self.stream.close()
+                self.stream = None
+        super().emit(record)
+
+
+class QueuedRotatingFileHandler(QueueHandler):
+    """
+    Hands records to a background thread that writes them as JSON lines to
+    ``filename``, rotated at ``max_bytes`` with ``backup_count`` old files.
+    When the queue (``queue_size`` records) is full, records are dropped
+    rather than blocking the caller.
+    """
+
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, backup_count=5, queue_size=10000):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        self.target = ReopeningRotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+        self.target.setFormatter(JsonFormatter())
+        self.queue_size = queue_size
+        self.dropped = 0
+        self.closed = False
+        super().__init__(queue.Queue(queue_size))
+        self.listener = None
+        self.start()
+        # Threads do not survive fork (gunicorn preload_app), and one caught
+        # mid-write would leave the file's lock held in the child: drain and
+        # stop the listener first, then restart it on both sides, the child
+        # with a fresh queue.
+        os.register_at_fork(
+            before=self.stop, after_in_parent=self.start,
+            after_in_child=lambda: self.start(queue.Queue(self.queue_size)),
+        )
+
+    def start(self, new_queue=None):
+        if self.closed:
+            return
+        if new_queue is not None:
+            self.queue = new_queue
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self):
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Runs in the logging thread: resolve everything the listener thread
+        # cannot (request context, message arguments, the traceback).
+        record = logging.makeLogRecord(vars(record))
+        for key, value in request_fields().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = ''.join(traceback.format_exception(*record.exc_info))
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        self.closed = True
+        self.stop()
+        self.target.close()
+        super().close()
@@ -0,0 +1,176 @@
+"""
+Per-request metrics in Prometheus text format.
+
+``RequestMetricsMiddleware`` (conference_mgmt.middleware) times every request,
+counts its SQL queries and their time through a database execute wrapper,
+and records the response size. Requests are labelled by method, URL route
+pattern (not the concrete path, to keep the label set small) and status
+class. ``/metrics`` renders everything recorded by the current worker
+process; each process reports its own series, labelled ``worker`` with its
+pid, so sum over that label when graphing.
+
+Requests slower than SLOW_REQUEST_MS are logged with their most expensive
+SQL statements. Databases using a connection pool also report its size,
+idle connections and waits (``db_pool_*``).
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+QUERY_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values."""
+
+    def __init__(self, name, help_text, labels, buckets):
+        self.name, self.help_text, self.labels, self.buckets = name, help_text, labels, buckets
+        self.series = defaultdict(lambda: [[0] * (len(buckets) + 1), 0.0, 0])  # bucket counts, sum, count
+
+    def observe(self, label_values, value):
+        series = self.series[label_values]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self, extra_labels):
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        for label_values, (counts, total, count) in sorted(self.series.items()):
+            labels = format_labels(zip(self.labels, label_values), extra_labels)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket_count
+                yield f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+            yield f"{self.name}_sum{{{labels}}} {total:.6f}"
+            yield f"{self.name}_count{{{labels}}} {count}"
+
+
+def format_labels(pairs, extra_labels=()):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{key}="{escape(value)}"' for key, value in (*extra_labels, *pairs))
+
+
+class Registry:
+    LABELS = ('method', 'route', 'status')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.histograms = [
+            Histogram('http_request_duration_seconds', 'Time to produce the response.', self.LABELS, LATENCY_BUCKETS),
+            Histogram('http_request_db_queries', 'SQL queries per request.', self.LABELS, QUERY_COUNT_BUCKETS),
+            Histogram('http_request_db_seconds', 'Time spent in SQL per request.', self.LABELS, QUERY_TIME_BUCKETS),
+            Histogram('http_response_size_bytes', 'Response body size (streamed responses excluded).', self.LABELS, SIZE_BUCKETS),
+        ]
+        self.slow_requests = defaultdict(int)
+
+    def record(self, method, route, status, duration, queries, query_time, size, slow):
+        labels = (method, route, f"{status // 100}xx")
+        with self.lock:
+            duration_h, queries_h, query_time_h, size_h = self.histograms
+            duration_h.observe(labels, duration)
+            queries_h.observe(labels, queries)
+            query_time_h.observe(labels, query_time)
+            if size is not None:
+                size_h.observe(labels, size)
+            if slow:
+                self.slow_requests[labels] += 1
+
+    def render(self):
+        worker = (('worker', os.getpid()),)
+        with self.lock:
+            lines = [
+                '# HELP process_start_time_seconds Start time of this worker since the epoch.',
+                '# TYPE process_start_time_seconds gauge',
+                f"process_start_time_seconds{{{format_labels((), worker)}}} {self.started:.3f}",
+                '# HELP http_slow_requests_total Requests slower than SLOW_REQUEST_MS.',
+                '# TYPE http_slow_requests_total counter',
+            ]
+            lines += [
+                f"http_slow_requests_total{{{format_labels(zip(self.LABELS, labels), worker)}}} {count}"
+                for labels, count in sorted(self.slow_requests.items())
+            ]
+            for histogram in self.histograms:
+                lines.extend(histogram.render(worker))
+        lines.extend(pool_metrics(worker))
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+# psycopg_pool statistics -> (metric, type, help, scale); counters are only
+# reported by the pool once non-zero.
+POOL_STATS = {
+    'pool_max': ('db_pool_max_connections', 'gauge', 'Largest number of connections the pool may open.', 1),
+    'pool_size': ('db_pool_connections', 'gauge', 'Connections currently open, idle or in use.', 1),
+    'pool_available': ('db_pool_available_connections', 'gauge', 'Idle connections ready to be borrowed.', 1),
+    'requests_waiting': ('db_pool_waiting_requests', 'gauge', 'Requests currently waiting for a connection.', 1),
+    'requests_num': ('db_pool_requests_total', 'counter', 'Connections borrowed from the pool.', 1),
+    'requests_queued': ('db_pool_requests_queued_total', 'counter', 'Borrows that had to wait for a free connection.', 1),
+    'requests_wait_ms': ('db_pool_wait_seconds_total', 'counter', 'Time spent waiting for a free connection.', 0.001),
+    'requests_errors': ('db_pool_request_errors_total', 'counter', 'Borrows that timed out or failed.', 1),
+    'connections_lost': ('db_pool_connections_lost_total', 'counter', 'Connections found broken and discarded.', 1),
+}
+
+
+def pool_metrics(worker):
+    """Prometheus lines for the connection pool of every database using Django's "pool" option."""
+    from django.db import connections
+
+    pools = [
+        (connection.alias, pool.get_stats())
+        for connection in connections.all()
+        if (pool := getattr(connection, 'pool', None)) is not None
+    ]
+    lines = []
+    for key, (name, kind, help_text, scale) in POOL_STATS.items() if pools else ():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        lines += [
+            f"{name}{{{format_labels((('database', alias),), worker)}}} {stats.get(key, 0) * scale:g}"
+            for alias, stats in pools
+        ]
+    return lines
+
+
+class QueryRecorder:
+    """The (sql, seconds) of every statement run while it is the current recorder."""
+
+    def __init__(self):
+        self.queries = []
+
+    @property
+    def total_time(self):
+        return sum(seconds for _, seconds in self.queries)
+
+    def top(self, count):
+        return sorted(self.queries, key=lambda query: query[1], reverse=True)[:count]
+
+
+# A context variable rather than a per-connection wrapper, so queries run by
+# sync views under ASGI (in a sync_to_async thread) reach the same recorder.
+current_recorder = ContextVar('query_recorder', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.queries.append((sql, time.perf_counter() - started))
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    """connection_created receiver: route the connection's queries through record_query."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
@@ -0,0 +1,308 @@
+"""
+Project-wide middleware.
+"""
+import copy
+import logging
+import re
+import time
+import uuid
+from importlib import import_module
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware as DjangoSessionMiddleware
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from .db_routing import RequestWrites, current_writes, pin_response, replica_available
+from .log import current_request
+from .metrics import QueryRecorder, current_recorder, install_query_wrapper, registry
+from .nplusone import NPlusOneError, QueryShapeRecorder, current_shape_recorder, format_report, install_shape_wrapper
+from .profiling import profile_trigger, run_profiled
+
+logger = logging.getLogger(__name__)
+request_logger = logging.getLogger('conference_mgmt.requests')
+
+_REQUEST_ID = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+class _SnapshotSessionMixin:
+    """Remembers the session data as loaded so changes can be detected."""
+
+    def load(self):
+        data = super().load()
+        self._loaded_key = self._session_key
+        self._loaded_data = copy.deepcopy(data)
+        return data
+
+    def is_unchanged(self):
+        return (
+            hasattr(self, '_loaded_data')
+            and self._session_key == self._loaded_key
+            and self._session == self._loaded_data
+        )
+
+
+class SessionMiddleware(DjangoSessionMiddleware):
+    """
+    Django's SessionMiddleware, except that a session marked modified whose
+    data is identical to what was loaded (e.g. a view re-assigning the same
+    value) is not saved again. Works with any SESSION_ENGINE.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        engine = import_module(settings.SESSION_ENGINE)
+        self.SessionStore = type('SessionStore', (_SnapshotSessionMixin, engine.SessionStore), {})
+
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        if (
+            session is not None and session.modified
+            and not settings.SESSION_SAVE_EVERY_REQUEST
+            and session.is_unchanged()
+        ):
+            session.modified = False
+        return super().process_response(request, response)
+
+
+class RequestLogMiddleware:
+    """
+    Gives every request an id (a valid incoming X-Request-ID, e.g. from the
+    proxy, or a new one) that log records made while handling it carry (see
+    conference_mgmt.log), returns it in the X-Request-ID response header, and
+    logs one line per request with its status and duration_ms when
+    LOG_REQUESTS is on.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = self.start(request)
+        try:
+            response = self.get_response(request)
+            self.finish(request, response)
+        finally:
+            current_request.reset(token)
+        return response
+
+    async def __acall__(self, request):
+        token = self.start(request)
+        try:
+            response = await self.get_response(request)
+            self.finish(request, response)
+        finally:
+            current_request.reset(token)
+        return response
+
+    def start(self, request):
+        incoming = request.headers.get('X-Request-ID', '')
+        request.request_id = incoming if _REQUEST_ID.match(incoming) else uuid.uuid4().hex
+        return current_request.set((request.request_id, time.perf_counter()))
+
+    def finish(self, request, response):
+        response['X-Request-ID'] = request.request_id
+        if settings.LOG_REQUESTS:
+            duration_ms = round((time.perf_counter() - current_request.get()[1]) * 1000, 1)
+            request_logger.info(
+                '%s %s %s %.0f ms', request.method, request.path, response.status_code, duration_ms,
+                extra={'method': request.method, 'path': request.path, 'status': response.status_code, 'duration_ms': duration_ms},
+            )
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, SQL query count and time, and response size of every
+    request for /metrics (see conference_mgmt.metrics), and logs requests
+    slower than SLOW_REQUEST_MS with their slowest SQL statements.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        connection_created.connect(install_query_wrapper, dispatch_uid='request_metrics')
+        for connection in connections.all(initialized_only=True):
+            install_query_wrapper(None, connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.REQUEST_METRICS_ENABLED:
+            return self.get_response(request)
+        recorder, started = QueryRecorder(), time.perf_counter()
+        token = current_recorder.set(recorder)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        self.record(request, response, recorder, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.REQUEST_METRICS_ENABLED:
+            return await self.get_response(request)
+        recorder, started = QueryRecorder(), time.perf_counter()
+        token = current_recorder.set(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        self.record(request, response, recorder, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, recorder, duration):
+        match = getattr(request, 'resolver_match', None)
+        route = f"/{match.route}" if match else 'unmatched'
+        size = None if response.streaming else len(response.content)
+        slow = duration * 1000 >= settings.SLOW_REQUEST_MS
+        registry.record(
+            request.method, route, response.status_code, duration,
+            len(recorder.queries), recorder.total_time, size, slow,
+        )
+        if slow:
+            top_sql = ''.join(
+                f"\n  {seconds * 1000:8.1f} ms  {sql[:500]}" for sql, seconds in recorder.top(settings.SLOW_REQUEST_TOP_SQL)
+            )
+            logger.warning(
+                'Slow request %s %s (%s): %.0f ms, %s queries in %.0f ms, top SQL:%s',
+                request.method, request.get_full_path(), route, duration * 1000,
+                len(recorder.queries), recorder.total_time * 1000, top_sql,
+            )
+
+
+class ProfilingMiddleware:
+    """
+    Runs the request under cProfile when a staff user asks for it or it is
+    sampled (see conference_mgmt.profiling). Must come after
+    AuthenticationMiddleware.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        trigger = profile_trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+        return run_profiled(request, self.get_response, trigger)
+
+    async def __acall__(self, request):
+        trigger = await sync_to_async(profile_trigger)(request)
+        if trigger is None:
+            return await self.get_response(request)
+        # cProfile only sees its own thread: run the rest of the chain from a
+        # worker thread so that sync views (thread-sensitive) run in it too.
+        return await sync_to_async(run_profiled)(request, async_to_sync(self.get_response), trigger)
+
+
+class NPlusOneMiddleware:
+    """
+    Logs SQL statement shapes repeated NPLUSONE_THRESHOLD or more times in a
+    request, with where they were issued (see conference_mgmt.nplusone), and
+    raises NPlusOneError instead when NPLUSONE_STRICT is set. Only added to
+    MIDDLEWARE when DEBUG is on.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        connection_created.connect(install_shape_wrapper, dispatch_uid='nplusone')
+        for connection in connections.all(initialized_only=True):
+            install_shape_wrapper(None, connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.NPLUSONE_ENABLED:
+            return self.get_response(request)
+        recorder = QueryShapeRecorder()
+        token = current_shape_recorder.set(recorder)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_shape_recorder.reset(token)
+        self.report(request, recorder)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.NPLUSONE_ENABLED:
+            return await self.get_response(request)
+        recorder = QueryShapeRecorder()
+        token = current_shape_recorder.set(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_shape_recorder.reset(token)
+        self.report(request, recorder)
+        return response
+
+    def report(self, request, recorder):
+        repeated = recorder.repeated(settings.NPLUSONE_THRESHOLD)
+        if not repeated:
+            return
+        message = format_report(request, repeated)
+        if settings.NPLUSONE_STRICT:
+            raise NPlusOneError(message)
+        logger.warning(message)
+
+
+class ReplicaPinMiddleware:
+    """
+    Sets the replica pin cookie on the response of any request that wrote
+    to the database, so that client's next use_replica views read from the
+    primary and see the change (see conference_mgmt.db_routing).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replica_available():
+            return self.get_response(request)
+        writes = RequestWrites()
+        token = current_writes.set(writes)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_writes.reset(token)
+        if writes.wrote:
+            pin_response(response)
+        return response
+
+    async def __acall__(self, request):
+        if not replica_available():
+            return await self.get_response(request)
+        writes = RequestWrites()
+        token = current_writes.set(writes)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_writes.reset(token)
+        if writes.wrote:
+            pin_response(response)
+        return response
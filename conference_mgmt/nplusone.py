@@ -0,0 +1,99 @@
+"""
+Development-time N+1 query detection.
+
+While a request runs, every SQL statement is reduced to its shape
+(conference_mgmt.sql_shapes) together with the place that issued it: the
+innermost project source line or template tag on the stack. A shape run
+NPLUSONE_THRESHOLD or more times in one request is an N+1 loop, such as
+``paper.reviews.filter(...)`` inside ``for paper in papers``. It is logged
+with those locations; with NPLUSONE_STRICT the request fails instead.
+Enabled by NPlusOneMiddleware only when DEBUG is on.
+"""
+import os
+import sys
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from .sql_shapes import sql_shape
+
+_IGNORED = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+_THIS_FILE = os.path.abspath(__file__)
+
+
+class NPlusOneError(Exception):
+    """Raised in strict mode when a request repeats a query shape."""
+
+
+class QueryShapeRecorder:
+    """Counts the statements of one request by shape, with the locations that ran them."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.locations = defaultdict(Counter)
+        self.examples = {}
+
+    def add(self, sql, location):
+        shape = sql_shape(sql)
+        self.counts[shape] += 1
+        self.locations[shape][location] += 1
+        self.examples.setdefault(shape, sql)
+
+    def repeated(self, threshold):
+        """[(shape, count, [(location, count)])] of shapes run at least ``threshold`` times."""
+        return [
+            (shape, count, self.locations[shape].most_common())
+            for shape, count in self.counts.most_common() if count >= threshold
+        ]
+
+
+current_shape_recorder = ContextVar('query_shape_recorder', default=None)
+
+
+def _project_paths():
+    base = str(settings.BASE_DIR) + os.sep
+    return base, (os.sep + 'site-packages' + os.sep, os.sep + 'dist-packages' + os.sep)
+
+
+def query_location(frame=None):
+    """
+    'path:line' of the innermost project source line or template tag on the
+    stack, or '?' if there is none.
+    """
+    base, excluded = _project_paths()
+    frame = frame or sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == 'render_annotated':
+            # django.template.base.Node.render_annotated: the tag or variable being rendered
+            node = frame.f_locals.get('self')
+            origin, token = getattr(node, 'origin', None), getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                return f"{os.path.relpath(origin.name, base) if origin.name.startswith(base) else origin.name}:{token.lineno}"
+        filename = code.co_filename
+        if filename.startswith(base) and filename != _THIS_FILE and not any(part in filename for part in excluded):
+            return f"{os.path.relpath(filename, base)}:{frame.f_lineno} ({code.co_name})"
+        frame = frame.f_back
+    return '?'
+
+
+def detect_query(execute, sql, params, many, context):
+    recorder = current_shape_recorder.get()
+    if recorder is not None and not sql.startswith(_IGNORED):
+        recorder.add(sql, query_location(sys._getframe(1)))
+    return execute(sql, params, many, context)
+
+
+def install_shape_wrapper(sender, connection, **kwargs):
+    """connection_created receiver: route the connection's queries through detect_query."""
+    if detect_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(detect_query)
+
+
+def format_report(request, repeated):
+    lines = [f"{len(repeated)} repeated query shape(s) in {request.method} {request.get_full_path()}:"]
+    for shape, count, locations in repeated:
+        lines.append(f"  {count}x {shape[:300]}")
+        lines.extend(f"      {times:>4}x at {location}" for location, times in locations[:5])
+    return '\n'.join(lines)
@@ -0,0 +1,123 @@
+"""
+On-demand request profiling.
+
+Staff users get a cProfile of a request by sending an ``X-Profile: 1``
+header or adding ``?_profile=1`` to the URL; with PROFILE_SAMPLE_RATE > 0 a
+random fraction of all requests is profiled as well. Each profile is saved
+to PROFILE_DIR as ``<id>.prof`` (loadable with pstats, snakeviz, etc.) next
+to ``<id>.json`` describing the request, the response carries its id in
+``X-Profile-Id``, and only the newest PROFILE_MAX_FILES profiles are kept.
+Staff can list, inspect and download them at /admin/profiles/.
+"""
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ID_RE = re.compile(r'^[0-9]{8}-[0-9]{6}-[0-9a-f]{8}$')
+
+
+def profile_trigger(request):
+    """Return why this request should be profiled ('requested' or 'sampled'), or None."""
+    if not settings.PROFILING_ENABLED:
+        return None
+    if request.headers.get('X-Profile') == '1' or request.GET.get('_profile') == '1':
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_staff:
+            return 'requested'
+    if settings.PROFILE_SAMPLE_RATE and random.random() < settings.PROFILE_SAMPLE_RATE:
+        return 'sampled'
+    return None
+
+
+def run_profiled(request, get_response, trigger):
+    """Call ``get_response(request)`` under cProfile and save the profile."""
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    try:
+        profiler.enable()
+    except ValueError:  # another profiler is active in this thread
+        return get_response(request)
+    try:
+        response = get_response(request)
+    finally:
+        profiler.disable()
+    duration = time.perf_counter() - started
+    try:
+        response['X-Profile-Id'] = save_profile(profiler, request, response, trigger, duration)
+    except OSError:
+        logger.exception('Could not save the profile of %s', request.path)
+    return response
+
+
+def save_profile(profiler, request, response, trigger, duration):
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    now = timezone.now()
+    profile_id = f"{now:%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+    profiler.dump_stats(os.path.join(settings.PROFILE_DIR, f"{profile_id}.prof"))
+    user = getattr(request, 'user', None)
+    meta = {
+        'id': profile_id,
+        'created_at': now.isoformat(),
+        'method': request.method,
+        'path': request.get_full_path(),
+        'status': response.status_code,
+        'duration_ms': round(duration * 1000, 1),
+        'user': user.get_username() if user is not None and user.is_authenticated else '',
+        'trigger': trigger,
+    }
+    with open(os.path.join(settings.PROFILE_DIR, f"{profile_id}.json"), 'w') as fh:
+        json.dump(meta, fh)
+    prune_profiles()
+    logger.info('Saved profile %s of %s %s (%.0f ms)', profile_id, request.method, meta['path'], meta['duration_ms'])
+    return profile_id
+
+
+def list_profiles():
+    """Metadata of the saved profiles, newest first."""
+    if not os.path.isdir(settings.PROFILE_DIR):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(settings.PROFILE_DIR), reverse=True):
+        if name.endswith('.json'):
+            try:
+                with open(os.path.join(settings.PROFILE_DIR, name)) as fh:
+                    profiles.append(json.load(fh))
+            except (OSError, ValueError):
+                continue
+    return profiles
+
+
+def prune_profiles():
+    for meta in list_profiles()[settings.PROFILE_MAX_FILES:]:
+        for extension in ('.prof', '.json'):
+            try:
+                os.remove(os.path.join(settings.PROFILE_DIR, meta['id'] + extension))
+            except OSError:
+                pass
+
+
+def profile_path(profile_id):
+    """Path of the .prof file for ``profile_id``, or None if it is not a saved profile."""
+    if not PROFILE_ID_RE.match(profile_id):
+        return None
+    path = os.path.join(settings.PROFILE_DIR, f"{profile_id}.prof")
+    return path if os.path.exists(path) else None
+
+
+def profile_summary(path, sort='cumulative', limit=40):
+    """The pstats report of the top ``limit`` functions as text."""
+    out = io.StringIO()
+    pstats.Stats(path, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
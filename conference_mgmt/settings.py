@@ -36,7 +36,16 @@ if not DEBUG:
     # Additional security headers
     SECURE_REFERRER_POLICY = 'strict-origin-when-cross-origin'
 
-# Logging configuration
+# Logging configuration: the file handler only queues records; a background thread writes
+# them to logs/django.log as JSON lines (conference_mgmt.log), rotated at
+# LOG_MAX_BYTES with LOG_BACKUP_COUNT old files. Records carry the request_id
+# set by RequestLogMiddleware, which also logs each request with its timing
+# when LOG_REQUESTS is on.
+LOG_FILE = os.environ.get('LOG_FILE', os.path.join(BASE_DIR, 'logs', 'django.log'))
+LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', 5))
+LOG_REQUESTS = os.environ.get('LOG_REQUESTS', 'True') == 'True'
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -49,13 +58,18 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'conference_mgmt.log.JsonFormatter',
+        },
     },
     'handlers': {
         'file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': os.path.join(BASE_DIR, 'logs', 'django.log'),
-            'formatter': 'verbose',
+            'class': 'conference_mgmt.log.QueuedRotatingFileHandler',
+            'filename': LOG_FILE,
+            'max_bytes': LOG_MAX_BYTES,
+            'backup_count': LOG_BACKUP_COUNT,
+            'formatter': 'json',
         },
         'console': {
             'level': 'INFO',
@@ -83,12 +97,14 @@ LOGGING = {
             'level': 'ERROR',
             'propagate': False,
         },
+        'conference_mgmt.requests': {
+            'handlers': ['file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
-# Create logs directory if it doesn't exist
-os.makedirs(os.path.join(BASE_DIR, 'logs'), exist_ok=True)
-
 INSTALLED_APPS = [
     'admin_interface',
     'colorfield',
@@ -105,11 +121,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'conference_mgmt.middleware.RequestLogMiddleware',  # request ids and the per-request log line
+    'conference_mgmt.middleware.RequestMetricsMiddleware',  # /metrics and the slow-request log
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'conference_mgmt.middleware.SessionMiddleware',  # skips saving unchanged sessions
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'conference_mgmt.middleware.ReplicaPinMiddleware',  # read-your-writes for the read replica
+    'conference_mgmt.middleware.ProfilingMiddleware',  # X-Profile: 1 / ?_profile=1 for staff
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -127,12 +147,14 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'dashboard.context_processors.notification_stream',
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'conference_mgmt.wsgi.application'
+ASGI_APPLICATION = 'conference_mgmt.asgi.application'
 
 # Database configuration
 import os
@@ -141,13 +163,25 @@ import dj_database_url
 # Check if we're in production (Render) or development
 IS_PRODUCTION = os.environ.get('DATABASE_URL') is not None
 
+# PostgreSQL connection pooling (psycopg 3 with psycopg_pool, Django's "pool"
+# option). Each worker process keeps DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE open
+# connections that its threads borrow per request, instead of one persistent
+# connection per thread (conn_max_age, which cannot be combined with a pool).
+# DB_POOL_MAX_SIZE should cover the worker's threads (GUNICORN_THREADS); the
+# database must allow workers x DB_POOL_MAX_SIZE connections. A request
+# waits up to DB_POOL_TIMEOUT seconds for a free connection.
+DB_POOL = os.environ.get('DB_POOL', 'True') == 'True'
+DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 2))
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', os.environ.get('GUNICORN_THREADS', 4)))
+DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 10))
+
 if IS_PRODUCTION:
     # ✅ Use PostgreSQL in production (Render)
     try:
         DATABASES = {
             'default': dj_database_url.config(
                 default=os.environ.get('DATABASE_URL'),
-                conn_max_age=600,
+                conn_max_age=0 if DB_POOL else 600,
                 conn_health_checks=True,
             )
         }
@@ -155,6 +189,12 @@ if IS_PRODUCTION:
         DATABASES['default']['OPTIONS'] = {
             'sslmode': 'require',
         }
+        if DB_POOL:
+            DATABASES['default']['OPTIONS']['pool'] = {
+                'min_size': DB_POOL_MIN_SIZE,
+                'max_size': DB_POOL_MAX_SIZE,
+                'timeout': DB_POOL_TIMEOUT,
+            }
     except Exception as e:
         print(f"Error configuring PostgreSQL: {e}")
         # Fallback to SQLite if PostgreSQL fails
@@ -176,6 +216,103 @@ else:
         }
     }
 
+# Read replica. With DATABASE_REPLICA_URL set, the exports, statistics and
+# large listing pages (views decorated with conference_mgmt.db_routing.use_replica)
+# read from this "replica" database; all writes go to "default". A client
+# that wrote anything reads from the primary for READ_REPLICA_STICKY_SECONDS
+# afterwards, which should exceed the usual replication lag.
+# `manage.py check_replica_routing` demonstrates the routing.
+DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+READ_REPLICA_STICKY_SECONDS = int(os.environ.get('READ_REPLICA_STICKY_SECONDS', 10))
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=DATABASES['default'].get('CONN_MAX_AGE', 0),
+        conn_health_checks=True,
+    )
+    if DATABASES['replica']['ENGINE'] == DATABASES['default']['ENGINE']:
+        DATABASES['replica']['OPTIONS'] = dict(DATABASES['default'].get('OPTIONS', {}))
+    # Tests read their own writes: the replica is the test database itself.
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+DATABASE_ROUTERS = ['conference_mgmt.db_routing.ReplicaRouter']
+
+
+# Sessions. SESSION_BACKEND: 'db' (default), 'cached_db' (reads served from
+# the cache, writes go to both) or 'signed_cookies' (no server-side storage;
+# the data is signed but readable by the client, so only ids/flags belong in it).
+SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'db')
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}[SESSION_BACKEND]
+
+# Cache. CACHE_BACKEND picks the default backend: 'locmem' (per process,
+# the default), 'file', 'redis' or 'memcached' (CACHE_URL gives the server,
+# e.g. redis://localhost:6379/1 or 127.0.0.1:11211). If the client library
+# for redis/memcached is not installed we fall back to locmem.
+import importlib.util
+
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+CACHE_URL = os.environ.get('CACHE_URL', '')
+_cache_backends = {
+    'redis': ('redis', 'django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+    'memcached': ('pymemcache', 'django.core.cache.backends.memcached.PyMemcacheCache', '127.0.0.1:11211'),
+}
+if CACHE_BACKEND in _cache_backends and importlib.util.find_spec(_cache_backends[CACHE_BACKEND][0]) is None:
+    print(f"CACHE_BACKEND={CACHE_BACKEND} needs the '{_cache_backends[CACHE_BACKEND][0]}' package; using locmem")
+    CACHE_BACKEND = 'locmem'
+if CACHE_BACKEND in _cache_backends:
+    _default_cache = {
+        'BACKEND': _cache_backends[CACHE_BACKEND][1],
+        'LOCATION': CACHE_URL or _cache_backends[CACHE_BACKEND][2],
+    }
+elif CACHE_BACKEND == 'file':
+    _default_cache = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_URL or os.path.join(BASE_DIR, 'tmp', 'cache'),
+    }
+else:
+    _default_cache = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'papersetu',
+    }
+# True when every process talks to the same cache server, with atomic incr
+# (redis, memcached). Counters kept in the cache are only trusted then.
+CACHE_IS_SHARED = CACHE_BACKEND in _cache_backends
+CACHES = {
+    'default': {
+        **_default_cache,
+        'KEY_PREFIX': os.environ.get('CACHE_KEY_PREFIX', 'papersetu'),
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', 300)),
+    }
+}
+
+# Values every process must agree on, such as the conference cache versions
+# (conference.caching) and rate-limit buckets, live in the "shared" cache. A per-process locmem
+# default is not shared, so in production it is swapped for a database
+# cache table, like the OTP cache below. The cached data itself stays in
+# the default cache under keys that embed the version.
+SHARED_CACHE_ALIAS = 'shared'
+if CACHE_BACKEND == 'locmem' and IS_PRODUCTION:
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'shared_cache',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    }
+else:
+    CACHES['shared'] = CACHES['default']
+
+# One-time passwords (accounts.otp) must be visible to every worker. A
+# per-process locmem cache is not, so in production it is swapped for the
+# database cache table created by `manage.py createcachetable`.
+OTP_CACHE_ALIAS = 'otp'
+if CACHE_BACKEND == 'locmem' and IS_PRODUCTION:
+    CACHES['otp'] = {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'otp_cache'}
+else:
+    CACHES['otp'] = CACHES['default']
+OTP_TTL = 600  # seconds
+OTP_MAX_ATTEMPTS = 5
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -207,9 +344,7 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
 # Add whitenoise middleware for static files in production
 if not DEBUG:
-    MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
-    # Use simpler static files storage for better compatibility
-    STATICFILES_STORAGE = 'whitenoise.storage.StaticFilesStorage'
+    MIDDLEWARE.insert(MIDDLEWARE.index('django.middleware.security.SecurityMiddleware'), 'whitenoise.middleware.WhiteNoiseMiddleware')
     # Ensure admin static files are served
     WHITENOISE_ROOT = os.path.join(BASE_DIR, 'staticfiles')
     WHITENOISE_INDEX_FILE = True
@@ -262,9 +397,10 @@ PASSWORD_HASHERS = [
 ]
 
 # Custom authentication backend for email/username login
+# EmailOrUsernameModelBackend covers plain username logins too; a second
+# backend would re-hash the password on every failed attempt.
 AUTHENTICATION_BACKENDS = [
     'accounts.backends.EmailOrUsernameModelBackend',
-    'django.contrib.auth.backends.ModelBackend',
 ]
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -295,6 +431,120 @@ EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# File storage. Paper files are content-addressed and de-duplicated.
+# MEDIA_STORAGE_BACKEND=s3 moves all media (papers, previews, exports) to an
+# S3-compatible bucket; downloads then redirect to presigned URLs. For local
+# work run ``manage.py run_fake_object_storage`` with the default endpoint.
+MEDIA_STORAGE_BACKEND = os.environ.get('MEDIA_STORAGE_BACKEND', 'filesystem')  # filesystem | s3
+OBJECT_STORAGE = {
+    'endpoint_url': os.environ.get('OBJECT_STORAGE_ENDPOINT', 'http://127.0.0.1:9000'),
+    'bucket': os.environ.get('OBJECT_STORAGE_BUCKET', 'conference-media'),
+    'access_key': os.environ.get('OBJECT_STORAGE_ACCESS_KEY', 'dev-access-key'),
+    'secret_key': os.environ.get('OBJECT_STORAGE_SECRET_KEY', 'dev-secret-key'),
+    'region': os.environ.get('OBJECT_STORAGE_REGION', 'us-east-1'),
+    'presigned_expiry': int(os.environ.get('OBJECT_STORAGE_URL_EXPIRY', 300)),  # seconds
+}
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG else 'whitenoise.storage.StaticFilesStorage',
+    },
+    'papers': {
+        'BACKEND': 'conference.storage.ContentAddressedStorage',
+    },
+}
+if MEDIA_STORAGE_BACKEND == 's3':
+    STORAGES['default'] = {'BACKEND': 'conference.object_storage.S3Storage', 'OPTIONS': OBJECT_STORAGE}
+    STORAGES['papers'] = {'BACKEND': 'conference.storage.ContentAddressedS3Storage', 'OPTIONS': OBJECT_STORAGE}
+
+# Paper downloads: 'django' streams through the worker; 'x-accel-redirect'
+# (nginx) and 'x-sendfile' (Apache) hand the transfer to the front proxy;
+# 'local' emulates the nginx hand-off in-process for development and tests.
+PAPER_DOWNLOAD_MODE = os.environ.get('PAPER_DOWNLOAD_MODE', 'django')
+PAPER_ACCEL_REDIRECT_LOCATION = os.environ.get('PAPER_ACCEL_REDIRECT_LOCATION', '/protected-media/')
+if PAPER_DOWNLOAD_MODE == 'local':
+    MIDDLEWARE.insert(0, 'conference.serving.InternalRedirectMiddleware')
+
+# Background document processing (page count, metadata, previews).
+# 0 workers processes inline in the request, which is useful for tests.
+DOCUMENT_PROCESSING_WORKERS = int(os.environ.get('DOCUMENT_PROCESSING_WORKERS', 2))
+DOCUMENT_PREVIEW_SIZE = 300  # px, longest side of the first-page preview
+
+# Resumable chunked paper uploads
+PAPER_UPLOAD_CHUNK_SIZE = int(os.environ.get('PAPER_UPLOAD_CHUNK_SIZE', 1024 * 1024))  # must stay below DATA_UPLOAD_MAX_MEMORY_SIZE
+PAPER_UPLOAD_MAX_SIZE = int(os.environ.get('PAPER_UPLOAD_MAX_SIZE', 50 * 1024 * 1024))
+PAPER_UPLOAD_TMP_DIR = os.path.join(BASE_DIR, 'tmp', 'uploads')
+PAPER_UPLOAD_SESSION_TTL = int(os.environ.get('PAPER_UPLOAD_SESSION_TTL', 24 * 60 * 60))  # seconds
+
+# Notification stream (Server-Sent Events). Open streams are woken by
+# in-process publishes and re-check the database every HEARTBEAT seconds.
+NOTIFICATION_STREAM_HEARTBEAT = int(os.environ.get('NOTIFICATION_STREAM_HEARTBEAT', 15))
+NOTIFICATION_STREAM_RETRY_MS = 5000  # EventSource reconnect delay (ASGI; pages do not open the stream under WSGI)
+
+# Scheduled review reminders (conference/reminders.py): reviewers with
+# pending reviews get one digest email, starting WINDOW days before the
+# conference review_deadline and continuing while overdue, at most once per
+# INTERVAL per review.
+REVIEW_REMINDER_WINDOW_DAYS = int(os.environ.get('REVIEW_REMINDER_WINDOW_DAYS', 7))
+REVIEW_REMINDER_INTERVAL_DAYS = int(os.environ.get('REVIEW_REMINDER_INTERVAL_DAYS', 2))
+REVIEW_REMINDER_MAX_OVERDUE_DAYS = 30  # stop nagging after this
+
+# Chair event emails in digest mode (Conference.chair_email_digest) are sent
+# by the hourly send_chair_digests job; daily digests go out at this hour.
+CHAIR_DIGEST_DAILY_HOUR = int(os.environ.get('CHAIR_DIGEST_DAILY_HOUR', 8))
+
+# Rate limits for login, OTP and password reset (accounts.ratelimit). Each
+# endpoint has token buckets per client IP and per account: (burst, seconds
+# to refill the whole burst). Buckets live in the "shared" cache, so every
+# worker process draws from the same bucket.
+# RATE_LIMIT_PROXY_COUNT is the number of trusted proxies in front of the
+# app (Render's load balancer: 1). The client IP is the X-Forwarded-For entry
+# that many hops from the right; entries further left come from the client
+# and are ignored. 0 uses REMOTE_ADDR.
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'True') == 'True'
+RATE_LIMIT_PROXY_COUNT = int(os.environ.get('RATE_LIMIT_PROXY_COUNT', 1 if IS_PRODUCTION else 0))
+RATE_LIMITS = {
+    'login': {'ip': (20, 60), 'account': (5, 300)},
+    'verify_otp': {'ip': (20, 60), 'account': (5, 600)},
+    'password_reset_request': {'ip': (5, 300), 'account': (3, 900)},
+    'password_reset_otp': {'ip': (20, 60), 'account': (5, 600)},
+}
+
+# Request metrics (conference_mgmt.metrics): latency, SQL and response size
+# histograms per route, served in Prometheus text format at /metrics to
+# staff users or to requests with "Authorization: Bearer <METRICS_TOKEN>".
+# Requests slower than SLOW_REQUEST_MS are logged with their slowest SQL.
+REQUEST_METRICS_ENABLED = os.environ.get('REQUEST_METRICS_ENABLED', 'True') == 'True'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', 1000))
+SLOW_REQUEST_TOP_SQL = 5  # statements listed per slow request
+
+# On-demand profiling (conference_mgmt.profiling): staff requests with an
+# "X-Profile: 1" header or ?_profile=1, plus a random PROFILE_SAMPLE_RATE
+# fraction of all requests, are run under cProfile. Profiles are listed at
+# /admin/profiles/.
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'True') == 'True'
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(BASE_DIR, 'tmp', 'profiles'))
+PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 200))
+
+# Modules the gunicorn warm-up (conference_mgmt.warmup) imports in the
+# master under preload_app. Views import them lazily, so other processes
+# (management commands, the scheduler) never load them.
+WARMUP_IMPORTS = [name for name in os.environ.get('WARMUP_IMPORTS', 'openpyxl,stripe').split(',') if name]
+
+# N+1 query detection (conference_mgmt.nplusone), DEBUG only: a SQL shape run
+# NPLUSONE_THRESHOLD or more times in one request is logged with the source
+# lines and template tags that issued it. NPLUSONE_STRICT=True makes such a
+# request fail with NPlusOneError instead.
+NPLUSONE_ENABLED = DEBUG and os.environ.get('NPLUSONE_ENABLED', 'True') == 'True'
+NPLUSONE_THRESHOLD = int(os.environ.get('NPLUSONE_THRESHOLD', 5))
+NPLUSONE_STRICT = os.environ.get('NPLUSONE_STRICT', 'False') == 'True'
+if NPLUSONE_ENABLED:
+    MIDDLEWARE.insert(MIDDLEWARE.index('conference_mgmt.middleware.RequestMetricsMiddleware') + 1, 'conference_mgmt.middleware.NPlusOneMiddleware')
+
 LOGIN_REDIRECT_URL = '/'
 LOGIN_URL = '/accounts/login/'
 
@@ -0,0 +1,27 @@
+"""
+SQL statement shapes: a statement with its literal values and parameter
+placeholders replaced by ``?`` and IN lists collapsed, so the same query run
+for different rows (the signature of an N+1 loop) maps to one shape.
+"""
+import re
+from collections import Counter
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w"])-?\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_IN_LIST = re.compile(r'\bIN \((?:\s*\?\s*,?)+\)', re.IGNORECASE)
+_SPACE = re.compile(r'\s+')
+
+
+def sql_shape(sql):
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+def repeated_shapes(statements, minimum=2):
+    """[(shape, count)] of shapes occurring at least ``minimum`` times, most frequent first."""
+    counts = Counter(sql_shape(sql) for sql in statements)
+    return [(shape, count) for shape, count in counts.most_common() if count >= minimum]
@@ -6,7 +6,7 @@ from django.conf.urls.static import static
 from django.views.generic import TemplateView
 from django.contrib.auth.decorators import login_required
 from conference.models import Conference, UserConferenceRole, SubreviewerInvite
-from .views import custom_404, custom_500, custom_403, health_check, run_migrations, create_superuser, check_database, complete_migration, fix_missing_tables
+from .views import custom_404, custom_500, custom_403, health_check, metrics, profile_list, profile_detail, run_migrations, create_superuser, check_database, complete_migration, fix_missing_tables
 from accounts.decorators import verified_user_required
 
 # Customize admin site
@@ -57,6 +57,8 @@ def root_redirect(request):
         return render(request, 'landing.html', {'conferences': conferences})
 
 urlpatterns = [
+    path('admin/profiles/', admin.site.admin_view(profile_list), name='admin_profiles'),
+    path('admin/profiles/<str:profile_id>/', admin.site.admin_view(profile_detail), name='admin_profile_detail'),
     path('admin/', admin.site.urls),
     path('accounts/', include('accounts.urls', namespace='accounts')),
     path('conference/', include('conference.urls', namespace='conference')),
@@ -67,6 +69,7 @@ urlpatterns = [
     path('', root_redirect, name='landing'),
     path('home/', homepage, name='homepage'),
     path('health/', health_check, name='health_check'),
+    path('metrics', metrics, name='metrics'),
     
     # TEMPORARY MIGRATION FIX URLs - DELETE AFTER USE
     path('run-migrations/', run_migrations, name='run_migrations'),
@@ -3,6 +3,12 @@ from django.http import HttpResponse
 from django.core.management import call_command
 from django.contrib.auth import get_user_model
 from django.views.decorators.csrf import csrf_exempt
+from django.conf import settings
+from django.contrib import admin
+from django.utils.crypto import constant_time_compare
+from django.http import FileResponse, Http404
+from .metrics import registry
+from .profiling import list_profiles, profile_path, profile_summary
 import os
 import logging
 
@@ -30,6 +36,47 @@ def health_check(request):
     """Health check endpoint for monitoring"""
     return HttpResponse("OK", content_type="text/plain")
 
+def metrics(request):
+    """Request metrics of this worker in Prometheus text format"""
+    token = settings.METRICS_TOKEN
+    authorized = request.user.is_staff or (
+        token and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    )
+    if not authorized:
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+def profile_list(request):
+    """Admin page listing saved request profiles"""
+    return render(request, 'admin/profiles.html', {
+        **admin.site.each_context(request),
+        'title': 'Request profiles',
+        'profiles': list_profiles(),
+        'enabled': settings.PROFILING_ENABLED,
+        'sample_rate': settings.PROFILE_SAMPLE_RATE,
+        'sample_percent': f"{settings.PROFILE_SAMPLE_RATE * 100:g}",  # 0.001 -> "0.1"
+        'profile_dir': settings.PROFILE_DIR,
+    })
+
+def profile_detail(request, profile_id):
+    """Top functions of one profile; ?download=1 returns the .prof file"""
+    path = profile_path(profile_id)
+    if path is None:
+        raise Http404('No such profile')
+    if request.GET.get('download'):
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=f'{profile_id}.prof')
+    sort = request.GET.get('sort', 'cumulative')
+    if sort not in ('cumulative', 'tottime', 'ncalls'):
+        sort = 'cumulative'
+    meta = next((meta for meta in list_profiles() if meta['id'] == profile_id), {'id': profile_id})
+    return render(request, 'admin/profile_detail.html', {
+        **admin.site.each_context(request),
+        'title': f'Profile {profile_id}',
+        'profile': meta,
+        'sort': sort,
+        'summary': profile_summary(path, sort),
+    })
+
 @csrf_exempt
 def run_migrations(request):
     """Temporary view to run migrations - DELETE AFTER USE"""
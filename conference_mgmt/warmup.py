@@ -0,0 +1,82 @@
+"""
+Start-up warm-up for gunicorn (see gunicorn.conf.py).
+
+``warm_up_process`` does the per-process work that otherwise lands on the
+first requests: it builds the URL resolver, compiles the project's
+templates into the cached loader, and imports WARMUP_IMPORTS, the heavy
+modules that views only load on use. With ``preload_app`` it runs once in
+the master before forking, so the workers share the result.
+``warm_up_worker`` runs in each worker and opens and closes every database
+connection once. That loads the driver, resolves the host and checks that
+the database answers before the worker takes traffic.
+"""
+import importlib
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.template import engines
+from django.urls import get_resolver, resolve
+
+logger = logging.getLogger(__name__)
+
+
+def project_templates():
+    """Names of the templates under BASE_DIR, from every template directory the Django engine searches."""
+    base = str(settings.BASE_DIR)
+    for engine in engines.all():
+        for directory in getattr(engine, 'template_dirs', ()):
+            directory = str(directory)
+            if not directory.startswith(base) or os.sep + 'site-packages' + os.sep in directory:
+                continue
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    if name.endswith(('.html', '.txt')):
+                        yield engine, os.path.relpath(os.path.join(root, name), directory).replace(os.sep, '/')
+
+
+def warm_up_process():
+    started = time.perf_counter()
+    resolver = get_resolver()
+    for _, namespace_resolver in resolver.namespace_dict.values():
+        namespace_resolver.reverse_dict  # builds the namespace's reverse lookup
+    resolve('/')
+
+    compiled = failed = 0
+    for engine, name in project_templates():
+        try:
+            engine.get_template(name)
+            compiled += 1
+        except Exception:
+            failed += 1
+            logger.debug('Warm-up could not compile template %s', name, exc_info=True)
+
+    imported = []
+    for module in settings.WARMUP_IMPORTS:
+        try:
+            importlib.import_module(module)
+            imported.append(module)
+        except ImportError:
+            logger.debug('Warm-up could not import %s', module)
+
+    # Nothing above should touch the database; make sure no connection is
+    # inherited by forked workers.
+    connections.close_all()
+    logger.info(
+        'Warm-up: URL resolver, %d templates (%d failed), imports %s in %.0f ms',
+        compiled, failed, ', '.join(imported) or 'none', (time.perf_counter() - started) * 1000,
+    )
+
+
+def warm_up_worker():
+    started = time.perf_counter()
+    for connection in connections.all():
+        try:
+            connection.ensure_connection()
+        except Exception:
+            logger.warning('Warm-up could not connect to database %r', connection.alias, exc_info=True)
+        finally:
+            connection.close()
+    logger.info('Worker %d warm-up: database connections checked in %.0f ms', os.getpid(), (time.perf_counter() - started) * 1000)
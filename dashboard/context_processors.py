@@ -0,0 +1,10 @@
+from django.core.handlers.asgi import ASGIRequest
+
+
+def notification_stream(request):
+    """
+    Pages open the live notification stream only when served over ASGI:
+    under WSGI every stream request answers once and the browser would
+    reconnect (a full authenticated request) every few seconds per tab.
+    """
+    return {'notification_stream_live': isinstance(request, ASGIRequest)}
@@ -0,0 +1,170 @@
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, replace
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from conference.synthetic import SCALES, isolated_caches, release_paper_file, seed_conference
+
+EXCEL_COLUMNS = ['authors', 'title', 'paper_id', 'time', 'decision', 'keywords', 'abstract']
+
+# (label, user, method, url name, GET/POST data); user is 'chair' or 'author'
+CASES = [
+    ('dashboard', 'author', 'get', 'dashboard:dashboard', None),
+    ('conference_submissions', 'chair', 'get', 'dashboard:conference_submissions', None),
+    ('by_submission', 'chair', 'get', 'dashboard:by_submission', None),
+    ('by_pc_member', 'chair', 'get', 'dashboard:by_pc_member', None),
+    ('statistics', 'chair', 'get', 'dashboard:admin_statistics', None),
+    ('analytics_export_csv', 'chair', 'get', 'dashboard:analytics_export', {'format': 'csv'}),
+    ('analytics_export_excel', 'chair', 'get', 'dashboard:analytics_export', {'format': 'excel'}),
+    ('accepted_submissions_csv', 'chair', 'get', 'dashboard:accepted_submissions_export', None),
+    ('export_reviews_csv', 'chair', 'get', 'dashboard:export_reviews', {'format': 'csv'}),
+    ('export_reviews_excel', 'chair', 'get', 'dashboard:export_reviews', {'format': 'excel'}),
+    ('export_submissions_excel', 'chair', 'post', 'dashboard:export_submissions_excel', {'columns': EXCEL_COLUMNS}),
+    ('download_submissions', 'chair', 'get', 'dashboard:download_submissions', None),
+]
+
+
+class Command(BaseCommand):
+    help = 'Seed a synthetic conference and benchmark key dashboard views against a stored baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(SCALES), default='medium', help='Data size preset (default: medium)')
+        parser.add_argument('--papers', type=int, help='Override the number of papers')
+        parser.add_argument('--pc-members', type=int, help='Override the number of PC members')
+        parser.add_argument('--reviews-per-paper', type=int, help='Override the reviews per paper')
+        parser.add_argument('--coauthors', type=int, help='Override the co-authors per paper')
+        parser.add_argument('--invites', type=int, help='Override the number of PC/subreviewer invites')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed requests per view; the median is reported (default: 5)')
+        parser.add_argument('--only', nargs='+', metavar='VIEW', help=f"Benchmark only these views: {', '.join(c[0] for c in CASES)}")
+        parser.add_argument('--baseline', default=os.path.join(settings.BASE_DIR, 'bench_baseline.json'), help='Baseline JSON file')
+        parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline instead of comparing')
+        parser.add_argument('--threshold', type=float, default=0.25, help='Allowed relative increase in time and peak memory (default: 0.25)')
+        parser.add_argument('--query-slack', type=int, default=0, help='Allowed extra queries per request (default: 0)')
+        parser.add_argument('--min-delta-ms', type=float, default=5, help='Ignore time increases smaller than this (default: 5)')
+
+    def handle(self, *args, **options):
+        scale = replace(SCALES[options['scale']], **{
+            field: options[option] for field, option in [
+                ('papers', 'papers'), ('pc_members', 'pc_members'), ('reviews_per_paper', 'reviews_per_paper'),
+                ('coauthors_per_paper', 'coauthors'), ('invites', 'invites'),
+            ] if options[option] is not None
+        })
+        cases = [case for case in CASES if not options['only'] or case[0] in options['only']]
+        if not cases:
+            raise CommandError('No matching views.')
+        baseline = None if options['save_baseline'] else self.load_baseline(options['baseline'], asdict(scale))
+
+        self.stdout.write(f"Seeding {', '.join(f'{k}={v}' for k, v in asdict(scale).items())}")
+        results = {}
+        # Everything runs in a transaction that is rolled back, and against a
+        # private cache, so the benchmark leaves no data behind.
+        with isolated_caches(), transaction.atomic(), override_settings(
+            ALLOWED_HOSTS=['*'], RATE_LIMIT_ENABLED=False, PROFILE_SAMPLE_RATE=0, NPLUSONE_ENABLED=False,
+        ):
+            started = time.perf_counter()
+            seeded = seed_conference(scale)
+            self.stdout.write(f"Seeded in {time.perf_counter() - started:.1f}s; {options['repeat']} requests per view\n")
+            clients = {'chair': Client(), 'author': Client()}
+            clients['chair'].force_login(seeded.chair)
+            clients['author'].force_login(seeded.authors[0])
+            self.stdout.write(f"{'view':<28}{'status':>7}{'median ms':>11}{'queries':>9}{'peak KiB':>10}")
+            for label, user, method, name, data in cases:
+                url = reverse(name, args=[] if name == 'dashboard:dashboard' else [seeded.conference.id])
+                results[label] = self.measure(clients[user], method, url, data, options['repeat'])
+                row = results[label]
+                self.stdout.write(f"{label:<28}{row['status']:>7}{row['time_ms']:>11.1f}{row['queries']:>9}{row['peak_kb']:>10.0f}")
+            transaction.set_rollback(True)
+            cache.clear()
+        release_paper_file(seeded.paper_file)
+
+        report = {'scale': asdict(scale), 'repeat': options['repeat'], 'results': results}
+        if options['save_baseline']:
+            with open(options['baseline'], 'w') as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"\nBaseline saved to {options['baseline']}"))
+            return
+        if baseline is None:
+            self.stdout.write(self.style.WARNING(f"\nNo baseline at {options['baseline']}; run with --save-baseline to create one."))
+            return
+        self.compare(report, baseline, options)
+
+    def measure(self, client, method, url, data, repeat):
+        send = getattr(client, method)
+
+        def request():
+            # Every timed request starts from an empty cache, so cached views
+            # (statistics) report the cost of computing, not of a cache hit.
+            cache.clear()
+            response = send(url, data or {})
+            # Consume streamed bodies so their cost is included
+            if response.streaming:
+                b''.join(response.streaming_content)
+            return response
+
+        request()  # warm up lazy imports
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            request()
+            timings.append((time.perf_counter() - started) * 1000)
+        with CaptureQueriesContext(connection) as ctx:
+            tracemalloc.start()
+            try:
+                response = request()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        return {
+            'status': response.status_code,
+            'time_ms': round(statistics.median(timings), 2),
+            'queries': len(ctx.captured_queries),
+            'peak_kb': round(peak / 1024, 1),
+        }
+
+    def load_baseline(self, path, scale):
+        if not os.path.exists(path):
+            return None
+        with open(path) as fh:
+            baseline = json.load(fh)
+        if baseline['scale'] != scale:
+            raise CommandError(f"Baseline {path} was recorded at a different scale: {baseline['scale']}")
+        return baseline
+
+    def compare(self, report, baseline, options):
+        threshold = options['threshold']
+        regressions = []
+        self.stdout.write(f"\nAgainst {options['baseline']} (threshold +{threshold:.0%} time/memory, +{options['query_slack']} queries):")
+        for label, current in report['results'].items():
+            base = baseline['results'].get(label)
+            if base is None:
+                self.stdout.write(f"  {label:<28} not in baseline")
+                continue
+            problems = []
+            if current['status'] != base['status']:
+                problems.append(f"status {base['status']} -> {current['status']}")
+            if current['queries'] > base['queries'] + options['query_slack']:
+                problems.append(f"queries {base['queries']} -> {current['queries']}")
+            if (current['time_ms'] > base['time_ms'] * (1 + threshold)
+                    and current['time_ms'] - base['time_ms'] >= options['min_delta_ms']):
+                problems.append(f"time {base['time_ms']:.1f} -> {current['time_ms']:.1f} ms")
+            if current['peak_kb'] > base['peak_kb'] * (1 + threshold) and current['peak_kb'] - base['peak_kb'] >= 64:
+                problems.append(f"memory {base['peak_kb']:.0f} -> {current['peak_kb']:.0f} KiB")
+            change = (current['time_ms'] - base['time_ms']) / base['time_ms'] if base['time_ms'] else 0
+            if problems:
+                regressions.append(f"{label}: {', '.join(problems)}")
+                self.stdout.write(self.style.ERROR(f"  {label:<28} REGRESSED  {'; '.join(problems)}"))
+            else:
+                self.stdout.write(f"  {label:<28} ok         time {change:+.0%}, queries {current['queries'] - base['queries']:+d}")
+        if regressions:
+            raise CommandError(f"{len(regressions)} view(s) regressed:\n" + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions.'))
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from conference.synthetic import isolated_caches
+
+ENGINES = [
+    ('db', 'django.contrib.sessions.backends.db'),
+    ('cached_db', 'django.contrib.sessions.backends.cached_db'),
+    ('signed_cookies', 'django.contrib.sessions.backends.signed_cookies'),
+]
+PAGES = ['dashboard:dashboard', 'dashboard:my_conferences', 'dashboard:settings', 'dashboard:notification_history']
+
+
+class Command(BaseCommand):
+    help = 'Count per-request database round trips on dashboard pages for each session engine'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', help='User to log in as (defaults to the first active user)')
+        parser.add_argument('--requests', type=int, default=20, help='Requests per page and engine')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        users = User.objects.filter(is_active=True).order_by('id')
+        if options['username']:
+            users = users.filter(username=options['username'])
+        user = users.first()
+        if user is None:
+            raise CommandError('No matching active user.')
+        rounds = options['requests']
+        self.stdout.write(f'Logged in as {user.username}; {rounds} requests per page\n')
+        self.stdout.write(f"{'engine':<16}{'page':<38}{'queries/req':>12}{'session reads':>15}{'session writes':>16}")
+
+        # Everything runs in a transaction that is rolled back, so the
+        # benchmark leaves no sessions behind, and against private caches.
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=['*']), isolated_caches():
+            for label, engine in ENGINES:
+                with override_settings(SESSION_ENGINE=engine):
+                    cache.clear()
+                    client = Client()
+                    client.force_login(user)
+                    totals = [0, 0, 0]
+                    for name in PAGES:
+                        url = reverse(name)
+                        client.get(url)  # warm up caches
+                        with CaptureQueriesContext(connection) as ctx:
+                            for _ in range(rounds):
+                                client.get(url)
+                        queries, reads, writes = self.summarise(ctx.captured_queries)
+                        totals = [totals[0] + queries, totals[1] + reads, totals[2] + writes]
+                        self.stdout.write(
+                            f'{label:<16}{url:<38}{queries / rounds:>12.1f}{reads / rounds:>15.1f}{writes / rounds:>16.1f}'
+                        )
+                    n = rounds * len(PAGES)
+                    self.stdout.write(self.style.SUCCESS(
+                        f"{label:<16}{'all pages':<38}{totals[0] / n:>12.1f}{totals[1] / n:>15.1f}{totals[2] / n:>16.1f}"
+                    ))
+            cache.clear()
+            transaction.set_rollback(True)
+        self.stdout.write(f'\nCurrent SESSION_ENGINE: {settings.SESSION_ENGINE}')
+
+    def summarise(self, captured):
+        reads = writes = 0
+        for query in captured:
+            sql = query['sql'].lower()
+            if 'django_session' not in sql:
+                continue
+            if sql.startswith('select'):
+                reads += 1
+            else:
+                writes += 1
+        return len(captured), reads, writes
@@ -0,0 +1,78 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Loaded only by the features that use them; importing one of these at
+# startup is a regression.
+LAZY_MODULES = ['openpyxl', 'stripe', 'requests']
+
+# Runs in a fresh interpreter: what a gunicorn worker or management command
+# imports before it can do anything.
+STARTUP = """
+import sys, time
+sys.stderr.write('--startup--\\n')
+started = time.perf_counter()
+import django
+django.setup()
+import importlib
+importlib.import_module({urlconf!r})
+print(time.perf_counter() - started)
+print(' '.join(sorted(sys.modules)))
+"""
+
+IMPORT_TIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+
+
+class Command(BaseCommand):
+    help = 'Measure cold-start import time (django.setup() plus the URLconf and all views) in fresh interpreters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to start; the median is reported (default: 5)')
+        parser.add_argument('--top', type=int, default=15, help='Packages listed by import time (default: 15)')
+        parser.add_argument('--max-ms', type=float, help='Fail if the median start-up time exceeds this')
+
+    def handle(self, *args, **options):
+        code = STARTUP.format(urlconf=settings.ROOT_URLCONF)
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE))
+        timings, packages, loaded = [], Counter(), set()
+        for _ in range(options['runs']):
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', code],
+                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+            )
+            if result.returncode != 0:
+                raise CommandError(f"Start-up failed:\n{result.stderr[-2000:]}")
+            seconds, modules = result.stdout.strip().splitlines()[-2:]
+            timings.append(float(seconds) * 1000)
+            loaded = set(modules.split())
+            packages += self.self_time_by_package(result.stderr)
+
+        median = statistics.median(timings)
+        self.stdout.write(f"Start-up (django.setup() + {settings.ROOT_URLCONF}): median {median:.0f} ms over {options['runs']} runs "
+                          f"(min {min(timings):.0f}, max {max(timings):.0f}), {len(loaded)} modules\n")
+        self.stdout.write(f"{'package':<32}{'ms':>8}")
+        for package, micros in packages.most_common(options['top']):
+            self.stdout.write(f"{package:<32}{micros / options['runs'] / 1000:>8.1f}")
+
+        problems = [f"{module} is imported at startup" for module in LAZY_MODULES if module in loaded]
+        if options['max_ms'] is not None and median > options['max_ms']:
+            problems.append(f"median {median:.0f} ms is over {options['max_ms']:.0f} ms")
+        if problems:
+            raise CommandError('Start-up regressed: ' + '; '.join(problems))
+        self.stdout.write(self.style.SUCCESS(f"\nNone of {', '.join(LAZY_MODULES)} is imported at startup."))
+
+    def self_time_by_package(self, importtime_output):
+        """Microseconds of own import time per top-level package, counting only imports made by the start-up code."""
+        totals = Counter()
+        _, _, after = importtime_output.partition('--startup--\n')
+        for line in after.splitlines():
+            match = IMPORT_TIME.match(line)
+            if match:
+                totals[match.group(4).split('.')[0]] += int(match.group(1))
+        return totals
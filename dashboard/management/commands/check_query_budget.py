@@ -0,0 +1,187 @@
+import logging
+from collections import Counter
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from conference.models import Notification, PCInvite, Paper, ReviewInvite, SubreviewerInvite
+from conference.synthetic import SCALES, isolated_caches, release_paper_file, seed_conference
+from conference_mgmt.sql_shapes import sql_shape
+from dashboard.query_budgets import QUERY_BUDGETS
+
+NAMESPACES = ('dashboard', 'conference', 'accounts')
+
+# URL kwarg -> fixture attribute whose id (or value) fills it
+DEFAULT_KWARGS = {
+    'conf_id': 'conference', 'conference_id': 'conference',
+    'paper_id': 'paper', 'submission_id': 'paper',
+    'review_id': 'review', 'invite_id': 'subreviewer_invite',
+    'notification_id': 'notification', 'user_id': 'pc', 'subreviewer_id': 'pc',
+    'token': 'pc_invite_token', 'invite_link': 'invite_link', 'uidb64': 'uidb64',
+}
+
+
+class Fixture:
+    """The objects of one seeded conference that URLs and logins refer to."""
+
+    def __init__(self, seeded):
+        self.seeded = seeded
+        self.conference = seeded.conference
+        self.chair = seeded.chair
+        self.pc = seeded.pc_members[0]
+        self.author = seeded.authors[0]
+        self.paper = Paper.objects.filter(conference=self.conference, author=self.author).order_by('id').first()
+        self.review = self.paper.reviews.order_by('id').first()
+        self.review_invite = ReviewInvite.objects.filter(conference=self.conference, reviewer=self.pc).first()
+        self.subreviewer_invite = SubreviewerInvite.objects.filter(paper=self.paper).order_by('id').first()
+        self.subreviewer = self.subreviewer_invite.subreviewer
+        self.pc_invite_token = PCInvite.objects.filter(conference=self.conference).first().token
+        self.invite_link = self.conference.invite_link or 'missing'
+        self.uidb64 = 'MQ'
+        self.notification = Notification.objects.create(
+            recipient=self.chair, notification_type='paper_review', title='Review submitted', message='Synthetic',
+            related_conference=self.conference, related_paper=self.paper,
+        )
+        self.users = {
+            'chair': self.chair, 'pc': self.pc, 'author': self.author, 'subreviewer': self.subreviewer, 'anonymous': None,
+        }
+
+    def value(self, attribute):
+        value = getattr(self, attribute)
+        return getattr(value, 'pk', value)
+
+
+def named_routes():
+    """(url name, pattern) for every named URL in NAMESPACES."""
+    for entry in get_resolver().url_patterns:
+        if isinstance(entry, URLResolver) and entry.namespace in NAMESPACES:
+            for pattern in entry.url_patterns:
+                if isinstance(pattern, URLPattern) and pattern.name:
+                    yield f'{entry.namespace}:{pattern.name}', pattern
+
+
+class Command(BaseCommand):
+    help = 'Check that no dashboard/conference/accounts view runs more queries as the data grows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--small', choices=sorted(SCALES), default='small', help='Smaller data size (default: small)')
+        parser.add_argument('--large', choices=sorted(SCALES), default='medium', help='Larger data size (default: medium)')
+        parser.add_argument('--only', nargs='+', metavar='URL_NAME', help='Check only these URL names (e.g. dashboard:by_submission)')
+        parser.add_argument('--shapes', type=int, default=5, help='Growing SQL shapes listed per failing view (default: 5)')
+
+    def handle(self, *args, **options):
+        routes = [(name, pattern) for name, pattern in named_routes() if not options['only'] or name in options['only']]
+        if not routes:
+            raise CommandError('No matching URL names.')
+        small_scale, large_scale = SCALES[options['small']], SCALES[options['large']]
+        self.stdout.write(f"Data sizes: {options['small']} ({small_scale.papers} papers) and {options['large']} ({large_scale.papers} papers)\n")
+        self.stdout.write(f"{'url name':<52}{'role':<12}{'status':>9}{'small':>7}{'large':>7}  result")
+
+        failures, known, errors = [], [], []
+        # Views that raise are reported in the table; keep their tracebacks out of it
+        request_logger = logging.getLogger('django.request')
+        previous_level, request_logger.level = request_logger.level, logging.CRITICAL
+        # Everything runs in a transaction that is rolled back, and against a
+        # private cache, so the check leaves no data behind.
+        with isolated_caches(), transaction.atomic(), override_settings(
+            ALLOWED_HOSTS=['*'], RATE_LIMIT_ENABLED=False, PROFILE_SAMPLE_RATE=0, NPLUSONE_ENABLED=False,
+            EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+        ):
+            small = Fixture(seed_conference(small_scale, label='budget'))
+            large = Fixture(seed_conference(large_scale, label='budget'))
+            for name, pattern in routes:
+                budget = QUERY_BUDGETS.get(name, {})
+                if 'skip' in budget:
+                    self.stdout.write(f"{name:<52}{'-':<12}{'':>9}{'':>7}{'':>7}  skipped: {budget['skip']}")
+                    continue
+                role = budget.get('role', 'anonymous' if name.startswith('accounts:') else 'chair')
+                self.request(small, name, pattern, role, budget)  # warm up lazy imports and per-process caches
+                small_run = self.request(small, name, pattern, role, budget)
+                large_run = self.request(large, name, pattern, role, budget)
+                if 'error' in small_run or 'error' in large_run:
+                    errors.append(name)
+                    error = small_run.get('error') or large_run.get('error')
+                    self.stdout.write(self.style.WARNING(f"{name:<52}{role:<12}{'error':>9}{'':>7}{'':>7}  {error}"))
+                    continue
+                status = f"{small_run['status']}/{large_run['status']}" if small_run['status'] != large_run['status'] else str(small_run['status'])
+                counts = len(small_run['queries']), len(large_run['queries'])
+                problem = self.over_budget(budget, *counts)
+                line = f"{name:<52}{role:<12}{status:>9}{counts[0]:>7}{counts[1]:>7}  "
+                if problem is None:
+                    self.stdout.write(line + 'ok')
+                    continue
+                if budget.get('growth', 0) is None:
+                    known.append(name)
+                    self.stdout.write(self.style.WARNING(line + f"known N+1 ({problem})"))
+                    continue
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(line + problem))
+                for shape, before, after in self.growing_shapes(small_run['queries'], large_run['queries'])[:options['shapes']]:
+                    self.stdout.write(f"      {before:>4} -> {after:<5} {shape[:240]}")
+            transaction.set_rollback(True)
+            cache.clear()
+        request_logger.setLevel(previous_level)
+        release_paper_file(small.seeded.paper_file)
+        release_paper_file(large.seeded.paper_file)
+
+        self.stdout.write(f"\n{len(routes)} URLs, {len(failures)} over budget, {len(known)} known N+1, {len(errors)} errors")
+        if failures or errors:
+            raise CommandError('; '.join(
+                f"{label}: {', '.join(names)}" for label, names in [('Over budget', failures), ('Errors', errors)] if names
+            ))
+        self.stdout.write(self.style.SUCCESS('All views within budget.'))
+
+    def request(self, fixture, name, pattern, role, budget):
+        overrides = budget.get('kwargs', {})
+        kwargs = {
+            key: fixture.value(overrides.get(key, DEFAULT_KWARGS.get(key, key)))
+            for key in pattern.pattern.converters
+        }
+        client = Client()
+        if fixture.users[role] is not None:
+            client.force_login(fixture.users[role])
+        url = reverse(name, kwargs=kwargs)
+        cache.clear()
+        queries = []
+
+        def collect(execute, sql, params, many, context):
+            if not sql.startswith(('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')):
+                queries.append(sql)
+            return execute(sql, params, many, context)
+
+        # Not connection.execute_wrapper(): it pops the last wrapper on exit, which is
+        # the metrics wrapper if RequestMetricsMiddleware installed one mid-request.
+        connection.execute_wrappers.append(collect)
+        try:
+            # Each request runs in a savepoint so views that write (or fail) leave the fixture untouched
+            with transaction.atomic():
+                response = client.get(url, budget.get('query', {}))
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                transaction.set_rollback(True)
+        except Exception as exc:
+            return {'error': f"{type(exc).__name__}: {str(exc)[:120]}"}
+        finally:
+            connection.execute_wrappers.remove(collect)
+        return {'status': response.status_code, 'queries': queries}
+
+    def over_budget(self, budget, small, large):
+        """Return a description of the budget violation, or None."""
+        growth = budget.get('growth', 0)
+        if large > small + (growth or 0):
+            return f"grew by {large - small}" + ('' if growth is None else f" (allowed {growth})")
+        if 'max' in budget and max(small, large) > budget['max']:
+            return f"over max {budget['max']}"
+        return None
+
+    def growing_shapes(self, small_queries, large_queries):
+        """[(shape, small count, large count)] of SQL shapes run more often at the larger size."""
+        before = Counter(sql_shape(sql) for sql in small_queries)
+        after = Counter(sql_shape(sql) for sql in large_queries)
+        return sorted(
+            ((shape, before[shape], count) for shape, count in after.items() if count > before[shape]),
+            key=lambda item: item[2] - item[1], reverse=True,
+        )
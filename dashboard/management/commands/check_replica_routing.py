@@ -0,0 +1,190 @@
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from conference.caching import conference_cache_key
+from conference.models import Paper, Review
+from conference.synthetic import SCALES, isolated_caches, release_paper_file, seed_conference
+from conference_mgmt.db_routing import PIN_COOKIE, REPLICA, reading_from_replica
+
+# Views decorated with use_replica, and one that is not
+REPLICA_PAGES = [
+    'dashboard:conference_submissions',
+    'dashboard:by_submission',
+    'dashboard:admin_statistics',
+    'dashboard:export_reviews',
+]
+PRIMARY_PAGE = 'dashboard:pc_list'
+
+LAG_MARKER = 'Not yet replicated'
+
+
+def drop_connection(alias):
+    for connection in connections.all(initialized_only=True):
+        if connection.alias == alias:
+            connection.close()
+            del connections[alias]
+
+
+@contextmanager
+def scratch_databases():
+    """Point "default" and "replica" at two new in-memory SQLite databases for the duration."""
+    aliases = (DEFAULT_DB_ALIAS, REPLICA)
+    saved = {alias: connections.settings.get(alias) for alias in aliases}
+    base = dict(connections.settings[DEFAULT_DB_ALIAS])
+    for alias in aliases:
+        drop_connection(alias)
+        connections.settings[alias] = {
+            **base,
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': f'file:replica_routing_{alias}?mode=memory&cache=shared',
+            'OPTIONS': {},
+            'CONN_MAX_AGE': 0,
+            'CONN_HEALTH_CHECKS': False,
+        }
+    try:
+        yield
+    finally:
+        for alias in aliases:
+            # In-memory SQLite ignores close(); dropping the connection frees the database.
+            drop_connection(alias)
+            if saved[alias] is None:
+                del connections.settings[alias]
+            else:
+                connections.settings[alias] = saved[alias]
+
+
+def replicate():
+    """Copy the primary into the replica, as replication would eventually do."""
+    for alias in (DEFAULT_DB_ALIAS, REPLICA):
+        connections[alias].ensure_connection()
+    connections[DEFAULT_DB_ALIAS].connection.backup(connections[REPLICA].connection)
+
+
+class Command(BaseCommand):
+    help = 'Show on two scratch SQLite databases which database the replica-routed views read from, and read-your-writes pinning'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(SCALES), default='small', help='Synthetic conference size (default: small)')
+
+    def handle(self, *args, **options):
+        self.failures = 0
+        with scratch_databases(), isolated_caches(), override_settings(
+            ALLOWED_HOSTS=['*'], RATE_LIMIT_ENABLED=False, PROFILE_SAMPLE_RATE=0, NPLUSONE_ENABLED=False,
+        ):
+            self.stdout.write('Migrating the scratch primary...')
+            call_command('migrate', database=DEFAULT_DB_ALIAS, verbosity=0, interactive=False)
+            seeded = seed_conference(SCALES[options['scale']], label='replica')
+            try:
+                replicate()
+                self.run_checks(seeded)
+            finally:
+                release_paper_file(seeded.paper_file)
+                cache.clear()
+        if self.failures:
+            raise CommandError(f'{self.failures} routing checks failed.')
+        self.stdout.write(self.style.SUCCESS('\nAll routing checks passed.'))
+
+    def run_checks(self, seeded):
+        conference = seeded.conference
+        chair = Client()
+        chair.force_login(seeded.chair)
+
+        def url(name):
+            return reverse(name, args=[conference.id])
+
+        self.stdout.write(f"\n{'page':<36}{'status':>7}{'primary':>9}{'replica':>9}")
+        for name in REPLICA_PAGES + [PRIMARY_PAGE]:
+            response, primary, replica = self.fetch(chair, url(name))
+            self.stdout.write(f"{name:<36}{response.status_code:>7}{primary:>9}{replica:>9}")
+            if name == PRIMARY_PAGE:
+                self.expect(f'{name} reads only from the primary', response.status_code == 200 and replica == 0)
+            else:
+                # Not replica > primary: cached figures are computed on the primary
+                self.expect(f'{name} reads from the replica', response.status_code == 200 and replica > 0)
+        self.stdout.write('')
+
+        # A change on the primary that the replica has not received yet
+        paper = Paper.objects.filter(conference=conference).order_by('id').first()
+        Paper.objects.filter(pk=paper.pk).update(title=LAG_MARKER)
+        submissions = url('dashboard:conference_submissions')
+        response, _, _ = self.fetch(chair, submissions)
+        self.expect('before replicating, the replica shows the old data', LAG_MARKER not in response.content.decode())
+
+        # The chair writes something: the response pins them to the primary
+        response, _, _ = self.fetch(chair, reverse('dashboard:mark_all_notifications_read'), method='post')
+        self.expect('a request that writes sets the pin cookie', PIN_COOKIE in response.cookies)
+        response, primary, replica = self.fetch(chair, submissions)
+        self.expect(
+            'the pinned client reads its listing from the primary and sees the change',
+            replica == 0 and LAG_MARKER in response.content.decode(),
+        )
+
+        other = Client()
+        other.force_login(seeded.chair)
+        response, _, replica = self.fetch(other, submissions)
+        self.expect('another client without the pin still reads the replica', replica > 0 and LAG_MARKER not in response.content.decode())
+
+        chair.cookies[PIN_COOKIE] = str(int(time.time()) - 1)  # as if READ_REPLICA_STICKY_SECONDS had passed
+        _, _, replica = self.fetch(chair, submissions)
+        self.expect('once the pin expires the client reads the replica again', replica > 0)
+
+        replicate()
+        response, _, replica = self.fetch(other, submissions)
+        self.expect('after replicating, the replica shows the change', replica > 0 and LAG_MARKER in response.content.decode())
+
+        # Writes inside a replica-routed view go to the primary, even for an
+        # instance that was read from the replica.
+        token = reading_from_replica.set(True)
+        try:
+            with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary, CaptureQueriesContext(connections[REPLICA]) as replica:
+                paper = Paper.objects.get(pk=paper.pk)
+                paper.title = 'Saved while reading from the replica'
+                paper.save(update_fields=['title'])
+        finally:
+            reading_from_replica.reset(token)
+        self.expect(
+            'an instance read from the replica is saved to the primary',
+            paper._state.db == DEFAULT_DB_ALIAS
+            and any(q['sql'].startswith('UPDATE') for q in primary.captured_queries)
+            and not any(q['sql'].startswith('UPDATE') for q in replica.captured_queries),
+        )
+
+        # Cached statistics: a write bumps the conference's cache version, and
+        # the next miss, from a client reading the lagging replica, must not
+        # store the replica's old figures under the new version.
+        replicate()
+        statistics = url('dashboard:admin_statistics')
+        self.fetch(other, statistics)
+        Review.objects.filter(paper__conference=conference).order_by('id').first().delete()
+        response, _, _ = self.fetch(other, statistics)
+        key = conference_cache_key(conference.id, 'review_statistics')
+        cached = cache.get(key)
+        self.expect(
+            'statistics cached after a write match the primary, not the replica',
+            response.status_code == 200 and cached is not None
+            and cached['total_reviews'] == Review.objects.filter(paper__conference=conference).count()
+            and cached['total_reviews'] < Review.objects.using(REPLICA).filter(paper__conference=conference).count(),
+        )
+        response, _, _ = self.fetch(chair, statistics)
+        self.expect('a later request is served the same cached figures', response.status_code == 200 and cache.get(key) == cached)
+
+    def fetch(self, client, url, method='get'):
+        """The response and the number of queries it ran on the primary and on the replica."""
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary, CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = getattr(client, method)(url)
+        return response, len(primary), len(replica)
+
+    def expect(self, label, ok):
+        if ok:
+            self.stdout.write(f"  ok    {label}")
+        else:
+            self.failures += 1
+            self.stdout.write(self.style.ERROR(f"  FAIL  {label}"))
@@ -216,8 +216,8 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING('  ⚠ No cache configured'))
         
         # Check static files storage
-        if hasattr(settings, 'STATICFILES_STORAGE'):
-            self.stdout.write(f'  ✓ Static files storage: {settings.STATICFILES_STORAGE}')
+        if 'staticfiles' in settings.STORAGES:
+            self.stdout.write(f"  ✓ Static files storage: {settings.STORAGES['staticfiles']['BACKEND']}")
         else:
             self.stdout.write(self.style.WARNING('  ⚠ No static files storage configured'))
 
@@ -0,0 +1,147 @@
+import statistics
+import threading
+import time
+from collections import Counter, defaultdict
+from importlib import import_module
+
+import requests
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from conference.models import Conference
+from conference.synthetic import SCALES, release_paper_file, seed_conference
+
+# (url name, takes the conference id); chair users cycle through the first
+# list, author users through the second.
+CHAIR_PAGES = [
+    ('dashboard:conference_submissions', True),
+    ('dashboard:by_pc_member', True),
+    ('dashboard:admin_statistics', True),
+    ('dashboard:pc_list', True),
+]
+AUTHOR_PAGES = [
+    ('dashboard:dashboard', False),
+    ('dashboard:my_conferences', False),
+    ('dashboard:notification_history', False),
+    ('conference:author_dashboard', True),
+]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class Command(BaseCommand):
+    help = 'Load-test the dashboard pages of a running server with concurrent logged-in users'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:10000', help='Base URL of the server under test (default: http://127.0.0.1:10000)')
+        parser.add_argument('--users', type=int, default=50, help='Concurrent users; half chairs, half authors (default: 50)')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds to run (default: 30)')
+        parser.add_argument('--think-ms', type=float, default=0, help='Pause between one user\'s requests (default: 0)')
+        parser.add_argument('--scale', choices=sorted(SCALES), default='small', help='Synthetic conference size (default: small)')
+        parser.add_argument('--timeout', type=float, default=60, help='Per-request timeout in seconds (default: 60)')
+
+    def handle(self, *args, **options):
+        base_url = options['url'].rstrip('/')
+        try:
+            requests.get(base_url + '/', timeout=10, allow_redirects=False)
+        except requests.RequestException as exc:
+            raise CommandError(f"Server at {base_url} is not reachable: {exc}")
+
+        # The server reads the same database, so the data is committed and
+        # deleted again afterwards.
+        seeded = seed_conference(SCALES[options['scale']], label='load')
+        SessionStore = import_module(settings.SESSION_ENGINE).SessionStore
+        sessions = []
+        try:
+            plans = []
+            for i in range(options['users']):
+                if i % 2 == 0:
+                    user, pages = seeded.chair, CHAIR_PAGES
+                else:
+                    user, pages = seeded.authors[(i // 2) % len(seeded.authors)], AUTHOR_PAGES
+                session = SessionStore()
+                session[SESSION_KEY] = str(user.pk)
+                session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+                session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+                session.save()
+                sessions.append(session)
+                urls = [
+                    (name, base_url + reverse(name, args=[seeded.conference.id] if takes_conference else []))
+                    for name, takes_conference in pages
+                ]
+                plans.append((session.session_key, urls[i % len(urls):] + urls[:i % len(urls)]))
+
+            self.stdout.write(
+                f"{options['users']} users against {base_url} for {options['duration']:.0f}s "
+                f"({options['scale']} conference, think time {options['think_ms']:.0f} ms)\n"
+            )
+            results = defaultdict(list)  # url name -> [(status, seconds)]
+            lock = threading.Lock()
+            deadline = time.monotonic() + options['duration']
+            threads = [
+                threading.Thread(target=self.user, args=(cookie, urls, deadline, options, results, lock))
+                for cookie, urls in plans
+            ]
+            started = time.monotonic()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.monotonic() - started
+        finally:
+            for session in sessions:
+                session.delete()
+            Conference.objects.filter(pk=seeded.conference.pk).delete()
+            get_user_model().objects.filter(pk__in=[seeded.chair.pk, *(u.pk for u in seeded.pc_members + seeded.authors)]).delete()
+            release_paper_file(seeded.paper_file)
+
+        self.report(results, elapsed)
+
+    def user(self, cookie, urls, deadline, options, results, lock):
+        client = requests.Session()
+        client.cookies.set(settings.SESSION_COOKIE_NAME, cookie)
+        think = options['think_ms'] / 1000
+        while time.monotonic() < deadline:
+            for name, url in urls:
+                started = time.perf_counter()
+                try:
+                    status = client.get(url, timeout=options['timeout'], allow_redirects=False).status_code
+                except requests.RequestException:
+                    status = 'failed'
+                with lock:
+                    results[name].append((status, time.perf_counter() - started))
+                if think:
+                    time.sleep(think)
+                if time.monotonic() >= deadline:
+                    return
+
+    def report(self, results, elapsed):
+        self.stdout.write(f"{'page':<36}{'requests':>9}{'errors':>8}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}")
+        every = []
+        errors = 0
+        statuses = Counter()
+        for name, samples in sorted(results.items()):
+            timings = [seconds * 1000 for _, seconds in samples]
+            failed = sum(1 for status, _ in samples if status != 200)
+            errors += failed
+            statuses.update(status for status, _ in samples if status != 200)
+            every += timings
+            self.stdout.write(
+                f"{name:<36}{len(samples):>9}{failed:>8}{len(samples) / elapsed:>8.1f}"
+                f"{statistics.median(timings):>9.0f}{percentile(timings, 0.95):>9.0f}{max(timings):>9.0f}"
+            )
+        if not every:
+            raise CommandError('No requests completed.')
+        summary = (
+            f"{'all pages':<36}{len(every):>9}{errors:>8}{len(every) / elapsed:>8.1f}"
+            f"{statistics.median(every):>9.0f}{percentile(every, 0.95):>9.0f}{max(every):>9.0f}"
+        )
+        self.stdout.write(self.style.SUCCESS(summary) if not errors else self.style.WARNING(summary))
+        if errors:
+            breakdown = ', '.join(f"{status}: {count}" for status, count in statuses.most_common())
+            self.stdout.write(self.style.WARNING(f"{errors} responses were not 200 ({breakdown}); 302 means the session was not accepted."))
@@ -0,0 +1,61 @@
+"""
+Per-view query budgets checked by ``manage.py check_query_budget``.
+
+Every named URL in dashboard, conference and accounts is requested (GET) at
+two data sizes. By default a view's query count must not grow with the
+data: queries at the large size <= queries at the small size. Entries here
+adjust that per URL name:
+
+    role     who is logged in: 'chair' (default for dashboard/conference),
+             'pc', 'author', 'subreviewer' or 'anonymous' (default for accounts)
+    growth   extra queries allowed at the large size (default 0)
+    max      absolute cap on queries at either size
+    query    GET parameters to send
+    kwargs   URL kwargs overriding the defaults (fixture attribute names)
+    skip     reason the view is not requested
+
+A view that raises fails the check; one that cannot be requested needs a
+``skip`` entry saying why.
+
+Views listed with a growth of None still run an N+1 loop; they are
+reported but do not fail the check. Fix them and drop the entry.
+"""
+
+QUERY_BUDGETS = {
+    # Not safe or not meaningful to request in a loop
+    'dashboard:notification_stream': {'skip': 'endless Server-Sent Events stream'},
+    'conference:create_checkout_session': {'skip': 'calls the Stripe API'},
+    'conference:stripe_webhook': {'skip': 'POST-only webhook'},
+    'conference:upload_status': {'skip': 'needs an upload session'},
+    'conference:upload_chunk': {'skip': 'needs an upload session'},
+    'accounts:logout': {'skip': 'ends the session'},
+
+    # Broken: the templates they render are not in the tree
+    'dashboard:accepted_submissions': {'skip': 'template dashboard/accepted_submissions.html is missing'},
+    'dashboard:all_reviews': {'skip': 'template dashboard/reviews_list.html is missing'},
+
+    # Role-specific pages
+    'dashboard:dashboard': {'role': 'author'},
+    'dashboard:review_invite_respond': {'role': 'pc', 'kwargs': {'invite_id': 'review_invite'}},
+    'dashboard:review_paper': {'role': 'pc'},
+    'dashboard:pc_invite_accept': {'role': 'pc'},
+    'conference:submit_paper': {'role': 'author'},
+    'conference:author_dashboard': {'role': 'author'},
+    'conference:author_papers': {'role': 'author'},
+    'conference:download_paper': {'role': 'author'},
+    'conference:payment_success': {'role': 'author'},
+    'conference:payment_cancel': {'role': 'author'},
+    'conference:subreviewer_dashboard': {'role': 'subreviewer', 'growth': None},  # review lookup per invite
+    'conference:subreviewer_answer_request': {'role': 'subreviewer'},
+    'conference:subreviewer_review_form': {'role': 'subreviewer'},
+
+    # Known N+1 loops (growth None): reported, not failing
+    'dashboard:pc_conference_detail': {'role': 'pc', 'growth': None},  # review exists() per paper
+    'dashboard:pc_invite': {'growth': None},  # user lookup per invite
+    'dashboard:conference_submissions': {'growth': None},  # review counts and authors per paper
+    'dashboard:admin_analytics': {'growth': None},  # review count per paper
+    'dashboard:analytics_export': {'growth': None},  # review count per paper
+    'dashboard:all_submissions': {'growth': None},  # reviews per paper
+    'dashboard:by_pc_member': {'growth': None},  # reviews per PC member
+    'dashboard:by_submission': {'growth': None},  # reviews and subreviewer invites per paper
+}
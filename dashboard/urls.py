@@ -12,6 +12,9 @@ urlpatterns = [
     path('paper/<int:paper_id>/review/', views.review_paper, name='review_paper'),
     path('paper-review/<int:review_id>/respond/', views.paper_review_respond, name='paper_review_respond'),
     path('notification/<int:notification_id>/mark-read/', views.mark_notification_read, name='mark_notification_read'),
+    path('notifications/', views.notification_history, name='notification_history'),
+    path('notifications/stream/', views.notification_stream, name='notification_stream'),
+    path('notifications/mark-all-read/', views.mark_all_notifications_read, name='mark_all_notifications_read'),
     path('chair/conference/<int:conf_id>/bulk-assign/', views.bulk_assign_papers, name='bulk_assign_papers'),
     path('bulk-assign/', views.bulk_assign_papers, name='bulk_assign_papers'),
     path('pc/conference/<int:conf_id>/', views.pc_conference_detail, name='pc_conference_detail'),
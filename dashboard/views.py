@@ -1,9 +1,9 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from conference.models import Conference, ReviewerPool, ReviewInvite, UserConferenceRole, Paper, Review, User, Notification, PCInvite, ConferenceAdminSettings, EmailTemplate, RegistrationApplication, SubreviewerInvite, Author, Track
-from django.db.models import Count, Q
+from conference.models import Conference, ReviewerPool, ReviewInvite, UserConferenceRole, Paper, Review, User, Notification, PCInvite, ConferenceAdminSettings, EmailTemplate, RegistrationApplication, SubreviewerInvite, Author, Track, ReviewReminder
+from django.db.models import Count, Max, Q
 from django.views.decorators.http import require_POST
-from django.http import HttpResponseRedirect, JsonResponse, HttpResponse
+from django.http import HttpResponseRedirect, JsonResponse, HttpResponse, FileResponse
 from django.urls import reverse
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views import View
@@ -22,6 +22,7 @@ from conference.forms import (
 from django.views.generic.edit import FormView, CreateView
 from django.contrib.auth.decorators import user_passes_test
 from django.utils.decorators import method_decorator
+from django.core.files import File
 from django.core.files.storage import default_storage
 from django.template.loader import render_to_string
 from django.core.mail import EmailMessage
@@ -33,16 +34,32 @@ from django.views.decorators.csrf import csrf_exempt
 from django.urls import reverse_lazy
 from conference.models import Conference
 from conference.forms import ConferenceForm
+import shutil
+import tempfile
+import uuid
 import zipfile
 from django.utils.text import slugify
 from io import BytesIO
 from .models import PCEmailLog
 from conference.models import ConferenceFeatureToggle, FEATURE_CHOICES
-from openpyxl import Workbook
 from django.utils.encoding import smart_str
 from conference.models import Conference, UserConferenceRole
 import csv
+import logging
 from accounts.decorators import verified_user_required
+from conference.notifications import (
+    notify, send_notifications, unread_count, mark_notifications_read,
+    notification_history as get_notification_history, notification_events,
+)
+from conference.caching import cached_for_conference
+from conference.mail_merge import compile_email_template, compile_message, compile_text, placeholder_context, send_mail_merge
+from conference.reminders import send_review_reminders
+from conference.chair_emails import send_chair_email
+from conference_mgmt.db_routing import use_replica
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+logger = logging.getLogger(__name__)
 
 class PCSendEmailForm(forms.Form):
     RECIPIENT_TYPE_CHOICES = [
@@ -84,17 +101,8 @@ class PCSendEmailForm(forms.Form):
         return [('', '--- Select Template ---')] + [(t.id, t.subject) for t in templates]
 
 def render_placeholders(text, user=None, paper=None, conference=None, extra=None):
-    # Replace placeholders in the text
-    context = {
-        'name': user.get_full_name() if user else '',
-        'submission_title': paper.title if paper else '',
-        'deadline': conference.paper_submission_deadline if conference else '',
-        'review_link': extra.get('review_link') if extra else '',
-        # Add more as needed
-    }
-    for key, value in context.items():
-        text = text.replace(f'{{{{{key}}}}}', str(value))
-    return text
+    """Fill {{name}} and {*NAME*} style placeholders in ``text``."""
+    return compile_text(text).render(placeholder_context(user=user, paper=paper, conference=conference, **(extra or {})))
 
 @verified_user_required
 def dashboard(request):
@@ -252,8 +260,8 @@ def review_invite_respond(request, invite_id):
         UserConferenceRole.objects.get_or_create(user=request.user, conference=invite.conference, role='reviewer')
         
         # Create notification for chair
-        Notification.objects.create(
-            recipient=invite.conference.chair,
+        notify(
+            [invite.conference.chair],
             notification_type='reviewer_response',
             title=f'Reviewer Accepted Invitation',
             message=f'{request.user.get_full_name()} ({request.user.username}) has accepted the reviewer invitation for {invite.conference.name}.',
@@ -266,8 +274,8 @@ def review_invite_respond(request, invite_id):
         invite.save()
         
         # Create notification for chair
-        Notification.objects.create(
-            recipient=invite.conference.chair,
+        notify(
+            [invite.conference.chair],
             notification_type='reviewer_response',
             title=f'Reviewer Declined Invitation',
             message=f'{request.user.get_full_name()} ({request.user.username}) has declined the reviewer invitation for {invite.conference.name}.',
@@ -321,10 +329,48 @@ def paper_review_respond(request, review_id):
 
 @login_required
 def mark_notification_read(request, notification_id):
-    notification = get_object_or_404(Notification, id=notification_id, recipient=request.user)
-    notification.is_read = True
-    notification.save()
-    return JsonResponse({'status': 'success'})
+    get_object_or_404(Notification.objects.only('id'), id=notification_id, recipient=request.user)
+    mark_notifications_read(request.user, ids=[notification_id])
+    return JsonResponse({'status': 'success', 'unread': unread_count(request.user)})
+
+@require_POST
+@login_required
+def mark_all_notifications_read(request):
+    updated = mark_notifications_read(request.user)
+    return JsonResponse({'status': 'success', 'updated': updated, 'unread': 0})
+
+@login_required
+async def notification_stream(request):
+    """
+    Server-Sent Events stream of the user's new notifications. Under ASGI the
+    connection stays open and idles on an asyncio event; under WSGI it sends
+    one batch and closes, so it never pins a sync worker (pages only open the
+    stream under ASGI, see dashboard.context_processors).
+    """
+    user = await request.auser()
+    since = request.headers.get('Last-Event-ID') or request.GET.get('since')
+    try:
+        since = int(since) if since else None
+    except ValueError:
+        since = None
+    once = not isinstance(request, ASGIRequest)
+    response = StreamingHttpResponse(notification_events(user.pk, since, once=once), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+@login_required
+def notification_history(request):
+    try:
+        before = int(request.GET.get('before', '')) or None
+    except ValueError:
+        before = None
+    notifications, next_before = get_notification_history(request.user, before=before)
+    return render(request, 'dashboard/notifications.html', {
+        'notifications': notifications,
+        'next_before': next_before,
+        'unread_count': unread_count(request.user),
+    })
 
 @require_POST
 @login_required
@@ -348,6 +394,7 @@ def bulk_assign_papers(request):
     
     assigned_count = 0
     errors = []
+    pending_notifications = []
     
     for paper in papers:
         for reviewer in reviewers:
@@ -364,21 +411,22 @@ def bulk_assign_papers(request):
                     
                     if review_created:
                         assigned_count += 1
-                        # Notify reviewer
-                        Notification.objects.create(
+                        # Notify reviewer (sent in one batch below)
+                        pending_notifications.append(Notification(
                             recipient=reviewer,
                             notification_type='paper_assignment',
                             title=f'Paper Assignment',
                             message=f'You have been assigned to review the paper "{paper.title}" for {paper.conference.name}.',
                             related_paper=paper,
                             related_conference=paper.conference
-                        )
+                        ))
                     else:
                         errors.append(f"{reviewer.username} was already assigned to paper '{paper.title}'")
                 else:
                     errors.append(f"{reviewer.username} has not accepted the invitation for {paper.conference.name}")
             except ReviewInvite.DoesNotExist:
                 errors.append(f"{reviewer.username} has not been invited to {paper.conference.name}")
+    send_notifications(pending_notifications)
     
     if assigned_count > 0:
         messages.success(request, f'Successfully assigned {assigned_count} paper-reviewer pairs!')
@@ -791,11 +839,11 @@ def pc_invite_accept(request, token):
             invite.accepted_at = timezone.now()
             invite.save()
             # Notify chair
-            send_mail(
+            send_chair_email(
+                invite.conference, invite.invited_by, 'pc_accepted',
                 f"PC Invitation Accepted for {invite.conference.name}",
                 f"{invite.name} ({invite.email}) has accepted your PC invitation for {invite.conference.name}.",
-                settings.DEFAULT_FROM_EMAIL,
-                [invite.invited_by.email]
+                summary=f"{invite.name} ({invite.email}) joined the PC",
             )
             return render(request, 'dashboard/pc_invite_responded.html', {'invite': invite, 'accepted': True})
         elif action == 'decline':
@@ -823,6 +871,7 @@ def pc_remove(request, conf_id, user_id):
     return redirect('dashboard:pc_list', conf_id=conf_id)
 
 @login_required
+@use_replica
 def conference_submissions(request, conf_id):
     """
     Display all paper submissions for a specific conference.
@@ -846,7 +895,7 @@ def conference_submissions(request, conf_id):
         })
     
     # Get all papers submitted to this conference
-    papers = Paper.objects.filter(conference=conference).select_related('author', 'track').order_by('-submitted_at')
+    papers = Paper.objects.filter(conference=conference).select_related('author', 'track', 'document_info').order_by('-submitted_at')
     
     # If PC member has a track assigned, filter papers by their track
     # If PC member has no track assigned, they can see all papers
@@ -1390,6 +1439,7 @@ def accepted_submissions_list(request, conf_id):
     return render(request, 'dashboard/accepted_submissions.html', context)
 
 @login_required
+@use_replica
 def export_accepted_submissions_csv(request, conf_id):
     """
     Export accepted submissions as CSV.
@@ -1504,6 +1554,7 @@ def reviews_list(request, conf_id):
     return render(request, 'dashboard/reviews_list.html', context)
 
 @login_required
+@use_replica
 def analytics_export(request, conf_id):
     """
     Handle analytics data export in multiple formats (Excel, CSV).
@@ -1526,6 +1577,7 @@ def analytics_export(request, conf_id):
         return export_analytics_csv(request, conf_id)
 
 @login_required
+@use_replica
 def export_analytics_csv(request, conf_id):
     """
     Export analytics data to CSV format.
@@ -1586,6 +1638,7 @@ def export_analytics_csv(request, conf_id):
     return response
 
 @login_required
+@use_replica
 def export_analytics_excel(request, conf_id):
     """
     Export analytics data to Excel format.
@@ -1698,8 +1751,6 @@ class PCSendEmailView(FormView):
         subject = request.POST.get('subject', '').strip()
         body = request.POST.get('body', '').strip()
         attachment = request.FILES.get('attachment')
-        errors = []
-        sent_count = 0
         # If not confirmed, show preview page
         if 'confirm_send' not in request.POST:
             return render(request, 'chair/pc/send_email_confirm.html', {
@@ -1709,6 +1760,7 @@ class PCSendEmailView(FormView):
                 'attachment': attachment,
                 'recipients': users,
                 'recipients_raw': recipients_raw,
+                'template_id': request.POST.get('template', ''),
             })
         # Actually send emails
         if not users:
@@ -1717,30 +1769,32 @@ class PCSendEmailView(FormView):
         if not subject or not body:
             messages.error(request, 'Subject and message are required.')
             return self.form_invalid(self.get_form_class()(request.POST, request.FILES, conference=self.conference))
-        for user in users:
-            personalized_body = body.replace('{*NAME*}', user.get_full_name() or user.username).replace('{{name}}', user.get_full_name() or user.username)
-            try:
-                email_msg = EmailMessage(
-                    subject=subject,
-                    body=personalized_body,
-                    from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', settings.EMAIL_HOST_USER),
-                    to=[user.email],
-                )
-                if attachment:
-                    email_msg.attach(attachment.name, attachment.read(), attachment.content_type)
-                email_msg.send(fail_silently=False)
-                sent_count += 1
-                # Log the email
-                PCEmailLog.objects.create(
-                    subject=subject,
-                    body=personalized_body,
-                    recipients=user.email,
-                    conference=self.conference,
-                    sender=request.user,
-                    attachment_name=attachment.name if attachment else '',
-                )
-            except Exception as e:
-                errors.append(f"Failed to send to {user.email}: {e}")
+        # An unedited template reuses its cached compiled plan; an edited one
+        # keeps the template's {name} placeholders
+        template_id = request.POST.get('template', '')
+        template = EmailTemplate.objects.filter(conference=self.conference, id=template_id).first() if template_id.isdigit() else None
+        if template and (template.subject.strip(), template.body.strip()) == (subject, body):
+            plan = compile_email_template(template)
+        else:
+            template, plan = None, compile_message(subject, body, legacy=template is not None)
+        sent, errors = send_mail_merge(
+            plan,
+            [(user.email, placeholder_context(user=user, conference=self.conference)) for user in users],
+            attachment=attachment,
+        )
+        PCEmailLog.objects.bulk_create([
+            PCEmailLog(
+                subject=sent_subject,
+                body=sent_body,
+                recipients=email,
+                conference=self.conference,
+                sender=request.user,
+                attachment_name=attachment.name if attachment else '',
+                template_used=template,
+            )
+            for email, sent_subject, sent_body in sent
+        ])
+        sent_count = len(sent)
         if sent_count:
             messages.success(request, f"Email sent to {sent_count} PC member(s)." + (f" Errors: {'; '.join(errors)}" if errors else ''))
         else:
@@ -1801,6 +1855,7 @@ def get_sample_recipient_data(request, conf_id):
     return JsonResponse(data)
 
 @login_required
+@use_replica
 def all_submissions(request, conf_id):
     conference = get_object_or_404(Conference, id=conf_id)
     user = request.user
@@ -2341,6 +2396,7 @@ Conference Chair/PC Member"""
     })
 
 @login_required
+@use_replica
 def by_pc_member(request, conf_id):
     conference = get_object_or_404(Conference, id=conf_id)
     
@@ -2418,6 +2474,7 @@ def by_pc_member(request, conf_id):
     })
 
 @login_required
+@use_replica
 def by_submission(request, conf_id):
     conference = get_object_or_404(Conference, id=conf_id)
     
@@ -2630,55 +2687,49 @@ def send_to_authors(request, conf_id):
             'author_email': paper.author.email,
             'paper_id': paper.paper_id,
             'detail_url': reverse('dashboard:view_paper_submission', args=[conference.id, paper.id]),
+            'paper': paper,
         })
     # Handle POST: send email to selected authors
     if request.method == 'POST':
-        from django.core.mail import EmailMessage
-        import logging
         subject = request.POST.get('subject', '')
         message = request.POST.get('message', '')
         send_all = request.POST.get('send_all_authors') == 'on'
         selected_paper_ids = request.POST.getlist('selected_papers')
-        # Get selected authors
-        selected_authors = []
-        if send_all:
-            selected_authors = [{'name': sub['author_name'], 'email': sub['author_email'], 'paper_id': sub['paper_id']} for sub in submissions]
-        else:
-            for sub in submissions:
-                if str(sub['id']) in selected_paper_ids:
-                    selected_authors.append({'name': sub['author_name'], 'email': sub['author_email'], 'paper_id': sub['paper_id']})
-        # Remove duplicates
-        seen_emails = set()
-        unique_authors = []
-        for a in selected_authors:
-            if a['email'] not in seen_emails:
-                unique_authors.append(a)
-                seen_emails.add(a['email'])
-        # Handle attachment
+        # One message per author, personalised with their first selected paper
+        unique_authors = {}
+        for sub in submissions:
+            if (send_all or str(sub['id']) in selected_paper_ids) and sub['author_email'] not in unique_authors:
+                unique_authors[sub['author_email']] = sub
         attachment = request.FILES.get('attachment')
-        # Send email to each author
-        for author in unique_authors:
-            personalized_message = message.replace('{*NAME*}', author['name']).replace('{*paperid*}', author['paper_id'])
-            email_obj = EmailMessage(
-                subject=subject,
-                body=personalized_message,
-                to=[author['email']],
-            )
-            if attachment:
-                email_obj.attach(attachment.name, attachment.read(), attachment.content_type)
-            email_obj.send(fail_silently=False)
-            print(f"[SEND_TO_AUTHOR] Sent email to: {author['email']} (subject: {subject})")
-            # Log the author notification email
-            PCEmailLog.objects.create(
-                subject=subject,
-                body=personalized_message,
-                recipients=author['email'],
+        plan = compile_message(subject, message)
+        sent, errors = send_mail_merge(
+            plan,
+            [
+                (email, placeholder_context(user=sub['paper'].author, paper=sub['paper'], conference=conference))
+                for email, sub in unique_authors.items()
+            ],
+            attachment=attachment,
+        )
+        logger.info(
+            'Sent %d author emails for conference %s (%d failed)', len(sent), conference.id, len(errors),
+            extra={'conference_id': conference.id, 'sent': len(sent), 'failed': len(errors)},
+        )
+        # Log the author notification emails
+        PCEmailLog.objects.bulk_create([
+            PCEmailLog(
+                subject=sent_subject,
+                body=sent_body,
+                recipients=email,
                 conference=conference,
                 sender=request.user,
                 attachment_name=attachment.name if attachment else '',
             )
+            for email, sent_subject, sent_body in sent
+        ])
+        if errors:
+            messages.error(request, '; '.join(errors))
         # Show popup and redirect
-        author_names = ', '.join([a['name'] for a in unique_authors]) or 'No authors selected'
+        author_names = ', '.join(sub['author_name'] for sub in unique_authors.values()) or 'No authors selected'
         return render(request, 'dashboard/send_to_authors.html', {
             'conf_id': conf_id,
             'conference': conference,
@@ -2707,13 +2758,23 @@ def missing_reviews(request, conf_id):
     user = request.user
     
     # Handle reminder form submission
-    if request.method == 'POST':
+    if request.method == 'POST' and 'send_all' in request.POST:
+        # One digest per reviewer for every review due a reminder
+        try:
+            emails, reviews = send_review_reminders(conference=conference, sent_by=user)
+            if emails:
+                messages.success(request, f'Sent {emails} reminder digest(s) covering {reviews} pending review(s).')
+            else:
+                messages.info(request, 'No reviews are due a reminder (deadline not near, not set, or reminded recently).')
+        except Exception as e:
+            messages.error(request, f'Error sending reminders: {str(e)}')
+    elif request.method == 'POST':
         review_id = request.POST.get('review_id')
         custom_message = request.POST.get('custom_message', '')
         
         if review_id:
             try:
-                review = Review.objects.get(id=review_id, paper__conference=conference)
+                review = Review.objects.select_related('paper', 'reviewer').get(id=review_id, paper__conference=conference)
                 
                 # Send reminder email
                 subject = f"Review Reminder: '{review.paper.title}'"
@@ -2730,6 +2791,7 @@ Best regards,
 Conference Chair/PC Member"""
                 
                 send_mail(subject, message, None, [review.reviewer.email])
+                ReviewReminder.objects.create(review=review, reviewer=review.reviewer, conference=conference, sent_by=user)
                 
                 messages.success(request, f'Reminder sent to {review.reviewer.get_full_name() or review.reviewer.username} for paper "{review.paper.title}"')
                 
@@ -2742,38 +2804,35 @@ Conference Chair/PC Member"""
     missing_reviews = Review.objects.filter(
         paper__conference=conference,
         decision__isnull=True
-    ).select_related('paper', 'paper__author', 'reviewer')
-    
-    # Calculate overdue and pending statistics
-    from datetime import datetime, timedelta
-    today = datetime.now().date()
+    ).select_related('paper', 'paper__author', 'reviewer').annotate(
+        last_reminded=Max('reminders__sent_at')
+    )
     
+    # Overdue is measured against the conference review deadline
+    deadline = conference.review_deadline
+    today = timezone.localdate()
     overdue_count = 0
     pending_count = 0
     affected_reviewers = set()
     affected_papers = set()
     
     for review in missing_reviews:
-        affected_reviewers.add(review.reviewer.id)
-        affected_papers.add(review.paper.id)
-        
-        # Calculate if overdue (assuming 30 days from assignment as default deadline)
-        if review.submitted_at:
-            deadline = review.submitted_at.date() + timedelta(days=30)
-            if today > deadline:
-                overdue_count += 1
+        affected_reviewers.add(review.reviewer_id)
+        affected_papers.add(review.paper_id)
+        review.deadline = deadline
+        review.days_overdue = 0
+        review.is_overdue = False
+        if deadline:
+            days_left = (timezone.localtime(deadline).date() - today).days
+            if days_left < 0:
                 review.is_overdue = True
-                review.days_overdue = (today - deadline).days
-            else:
-                pending_count += 1
-                review.is_overdue = False
-                review.days_overdue = 0
-                review.days_remaining = (deadline - today).days
-        else:
-            pending_count += 1
-            review.is_overdue = False
-            review.days_overdue = 0
-            review.deadline = None
+                review.days_overdue = -days_left
+                overdue_count += 1
+                continue
+            review.days_remaining = days_left
+            if days_left > 0:
+                review.days_overdue = -1
+        pending_count += 1
     
     nav_items = [
         "Submissions", "Reviews", "Status", "PC", "Events",
@@ -2862,6 +2921,14 @@ def email_placeholder(request, conf_id):
         "Email", "Administration", "Conference", "News", "papersetu"
     ]
     active_tab = "Email"
+    # Chair picks how event emails (submissions, reviews, PC responses) arrive
+    if request.method == 'POST' and request.user == conference.chair:
+        mode = request.POST.get('chair_email_digest')
+        if mode in dict(Conference.CHAIR_EMAIL_CHOICES):
+            conference.chair_email_digest = mode
+            conference.save(update_fields=['chair_email_digest'])
+            messages.success(request, f'Event emails: {conference.get_chair_email_digest_display()}.')
+        return redirect('dashboard:email_placeholder', conf_id=conference.id)
     review_dropdown_items = [
         {'label': 'All submissions', 'url': reverse('dashboard:all_submissions', args=[conference.id])},
         {'label': 'Assigned to me', 'url': reverse('dashboard:assigned_to_me', args=[conference.id])},
@@ -2881,6 +2948,8 @@ def email_placeholder(request, conf_id):
         'active_tab': active_tab,
         'review_dropdown_items': review_dropdown_items,
         'email_logs': email_logs,
+        'chair_email_choices': Conference.CHAIR_EMAIL_CHOICES,
+        'pending_digest_events': conference.chair_email_events.filter(sent_at__isnull=True).count(),
     })
 
 def news_placeholder(request, conf_id):
@@ -3359,6 +3428,7 @@ def delete_submissions(request, conf_id):
     })
 
 @login_required
+@use_replica
 def authors_list(request, conf_id):
     conference = Conference.objects.get(id=conf_id)
     if conference.chair != request.user:
@@ -3422,6 +3492,7 @@ def authors_list(request, conf_id):
     })
 
 @login_required
+@use_replica
 def authors_list_table(request, conf_id):
     conference = Conference.objects.get(id=conf_id)
     if conference.chair != request.user:
@@ -3554,23 +3625,26 @@ def delete_submissions_table(request, conf_id):
     return render(request, 'dashboard/partials/delete_submissions_table_body.html', {'author_list': author_list})
 
 @login_required
+@use_replica
 def download_submissions(request, conf_id):
     conference = Conference.objects.get(id=conf_id)
     papers = Paper.objects.filter(conference=conference)
-    # Create a zip in memory
-    zip_buffer = BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w') as zip_file:
+    archive_name = f"{slugify(conference.name)}_submissions.zip"
+    # Build the zip in a spooled temp file, reading papers through their
+    # storage so this works for local and object storage alike
+    archive = tempfile.SpooledTemporaryFile(max_size=20 * 1024 * 1024)
+    with zipfile.ZipFile(archive, 'w') as zip_file:
         for paper in papers:
-            if paper.file:
+            if paper.file and paper.file.storage.exists(paper.file.name):
                 filename = f"{slugify(paper.title)}_{paper.id}{os.path.splitext(paper.file.name)[-1]}"
-                file_path = paper.file.path
-                if os.path.exists(file_path):
-                    with open(file_path, 'rb') as f:
-                        zip_file.writestr(filename, f.read())
-    zip_buffer.seek(0)
-    response = HttpResponse(zip_buffer, content_type='application/zip')
-    response['Content-Disposition'] = f'attachment; filename="{slugify(conference.name)}_submissions.zip"'
-    return response
+                with paper.file.open('rb') as src, zip_file.open(filename, 'w') as dest:
+                    shutil.copyfileobj(src, dest, 1024 * 1024)
+    archive.seek(0)
+    if getattr(default_storage, 'supports_presigned_urls', False):
+        # Hand the archive to object storage and let the client fetch it from there
+        name = default_storage.save(f"exports/{conference.id}/{uuid.uuid4().hex}/{archive_name}", File(archive))
+        return redirect(default_storage.url(name, filename=archive_name))
+    return FileResponse(archive, as_attachment=True, filename=archive_name, content_type='application/zip')
 
 @login_required
 def view_paper_submission(request, conf_id, submission_id):
@@ -3725,8 +3799,8 @@ def manage_submission(request, conf_id, submission_id):
                 paper.status = 'rejected'
             paper.save()
             # Create notification for author
-            Notification.objects.create(
-                recipient=paper.author,
+            notify(
+                [paper.author],
                 notification_type='paper_decision',
                 title=f'Paper Decision - {decision.title()}',
                 message=f'Your paper "{paper.title}" has been {decision}ed for {conference.name}.',
@@ -3869,8 +3943,8 @@ def approve_recommendation(request, review_id):
             paper.status = 'accepted'
             paper.save()
             # Send notification to the subreviewer
-            Notification.objects.create(
-                recipient=review.reviewer,
+            notify(
+                [review.reviewer],
                 notification_type='paper_review',
                 title=f'Your Review Recommendation Approved',
                 message=f'Your {decision} recommendation for paper "{review.paper.title}" has been approved by the conference chair.',
@@ -3896,8 +3970,8 @@ def approve_recommendation(request, review_id):
             paper.status = 'pending'
             paper.save()
             # Send notification to the subreviewer
-            Notification.objects.create(
-                recipient=review.reviewer,
+            notify(
+                [review.reviewer],
                 notification_type='paper_review',
                 title=f'Your Review Recommendation Rejected',
                 message=f'Your reject recommendation for paper "{review.paper.title}" has been rejected by the conference chair. The final decision will be made separately.',
@@ -4219,43 +4293,49 @@ class AnalyticsFeatureView(AdminFeatureBaseView):
         }
         return render(request, self.template_name, context)
 
+def conference_review_statistics(conference):
+    """Reviewer workload figures for the statistics page, cached per conference version."""
+    def compute():
+        per_reviewer = (
+            Review.objects.filter(paper__conference=conference)
+            .values('reviewer', 'reviewer__username', 'reviewer__first_name', 'reviewer__last_name')
+            .annotate(assigned=Count('id'), completed=Count('id', filter=Q(decision__isnull=False)))
+            .order_by('reviewer')
+        )
+        reviewer_stats = []
+        total_reviews = 0
+        for row in per_reviewer:
+            total_reviews += row['assigned']
+            full_name = f"{row['reviewer__first_name']} {row['reviewer__last_name']}".strip()
+            reviewer_stats.append({
+                'name': full_name or row['reviewer__username'],
+                'total_assigned': row['assigned'],
+                'completed': row['completed'],
+                'completion_rate': round((row['completed'] / row['assigned']) * 100, 1) if row['assigned'] else 0,
+            })
+        paper_count = Paper.objects.filter(conference=conference).count()
+        return {
+            'total_reviewers': len(reviewer_stats),
+            'total_reviews': total_reviews,
+            'avg_reviews_per_paper': round(total_reviews / paper_count, 2) if paper_count else 0,
+            'reviewer_stats': reviewer_stats,
+        }
+    return cached_for_conference(conference.id, 'review_statistics', compute)
+
+@method_decorator(use_replica, name='get')
 class StatisticsFeatureView(AdminFeatureBaseView):
     feature_key = 'statistics'
     template_name = 'dashboard/admin_features/statistics.html'
     def get(self, request, conf_id):
-        from conference.models import Paper, Review
-        from django.contrib.auth import get_user_model
         conference = get_object_or_404(Conference, id=conf_id)
         user = request.user
         # Only chair or PC members can view
         user_roles = UserConferenceRole.objects.filter(user=user, conference=conference).values_list('role', flat=True)
         if conference.chair != user and 'pc_member' not in user_roles:
             return render(request, 'dashboard/forbidden.html', {'message': 'Only the chair or PC members can view statistics.'})
-        papers = Paper.objects.filter(conference=conference)
-        reviews = Review.objects.filter(paper__in=papers).select_related('reviewer')
-        reviewer_ids = reviews.values_list('reviewer', flat=True).distinct()
-        User = get_user_model()
-        reviewers = User.objects.filter(id__in=reviewer_ids)
-        reviewer_stats = []
-        for reviewer in reviewers:
-            assigned = reviews.filter(reviewer=reviewer).count()
-            completed = reviews.filter(reviewer=reviewer).exclude(decision__isnull=True).count()
-            completion_rate = round((completed / assigned) * 100, 1) if assigned else 0
-            reviewer_stats.append({
-                'name': reviewer.get_full_name() or reviewer.username,
-                'total_assigned': assigned,
-                'completed': completed,
-                'completion_rate': completion_rate,
-            })
-        total_reviewers = reviewers.count()
-        total_reviews = reviews.count()
-        avg_reviews_per_paper = round(total_reviews / papers.count(), 2) if papers.count() else 0
         context = {
             'conference': conference,
-            'total_reviewers': total_reviewers,
-            'total_reviews': total_reviews,
-            'avg_reviews_per_paper': avg_reviews_per_paper,
-            'reviewer_stats': reviewer_stats,
+            **conference_review_statistics(conference),
         }
         return render(request, self.template_name, context)
 
@@ -4428,6 +4508,7 @@ class ProceedingsFeatureView(AdminFeatureBaseView):
     template_name = 'dashboard/admin_features/proceedings.html'
 
 @login_required
+@use_replica
 def export_submissions_excel(request, conf_id):
     """
     Export all submissions for a conference as an Excel (.xlsx) file with selected columns.
@@ -4456,6 +4537,7 @@ def export_submissions_excel(request, conf_id):
     }
     # Prepare workbook
     papers = Paper.objects.filter(conference=conference).select_related('author').order_by('id')
+    from openpyxl import Workbook  # heavy; loaded on first export rather than at startup
     wb = Workbook()
     ws = wb.active
     ws.title = 'Submissions'
@@ -4496,6 +4578,7 @@ def export_submissions_excel_options(request, conf_id):
     })
 
 @login_required
+@use_replica
 def export_reviews(request, conf_id):
     conference = get_object_or_404(Conference, id=conf_id)
     user = request.user
@@ -4508,6 +4591,7 @@ def export_reviews(request, conf_id):
     export_format = request.GET.get('format', 'csv')
     columns = ['Paper Title', 'Paper ID', 'Reviewer', 'Decision', 'Recommendation', 'Comments', 'Rating', 'Confidence', 'Submitted At']
     if export_format == 'excel':
+        from openpyxl import Workbook  # heavy; loaded on first export rather than at startup
         wb = Workbook()
         ws = wb.active
         ws.title = 'Reviews'
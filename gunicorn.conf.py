@@ -1,7 +1,58 @@
 # Gunicorn configuration file
+#
+# GUNICORN_WORKER_CLASS selects the runtime profile:
+#   gthread (default)  the WSGI app in threaded workers. Each worker serves
+#                      GUNICORN_THREADS requests at once, so a slow export or
+#                      SMTP call holds one thread instead of a whole worker.
+#                      Pages do not open the notification stream; the
+#                      unread badge updates on page loads.
+#   uvicorn            the ASGI app in uvicorn workers, for live Server-Sent
+#                      Events notification streams.
+# GUNICORN_WORKERS defaults to one worker per available CPU (at least 2).
+import os
+
+PROFILES = {
+    'gthread': ('gthread', 'conference_mgmt.wsgi:application'),
+    'uvicorn': ('uvicorn.workers.UvicornWorker', 'conference_mgmt.asgi:application'),
+}
+
+
+def available_cpus():
+    """CPUs this container may use: the cgroup CPU quota if set, else the CPU affinity."""
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as fh:
+            quota, period = fh.read().split()
+        if quota != 'max':
+            return max(1, int(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+worker_class, wsgi_app = PROFILES[os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')]
 bind = "0.0.0.0:10000"
-workers = 2
+workers = int(os.environ.get('GUNICORN_WORKERS', max(2, available_cpus())))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))  # gthread only
 timeout = 120
+keepalive = 5
 max_requests = 1000
 max_requests_jitter = 100
-preload_app = True 
\ No newline at end of file
+preload_app = True
+
+
+def when_ready(server):
+    # With preload_app the application is already loaded in the master:
+    # warm it up once here so every forked worker starts warm.
+    if server.cfg.preload_app:
+        from conference_mgmt.warmup import warm_up_process
+        warm_up_process()
+
+
+def post_worker_init(worker):
+    from conference_mgmt.warmup import warm_up_process, warm_up_worker
+    if not worker.cfg.preload_app:
+        warm_up_process()
+    warm_up_worker()